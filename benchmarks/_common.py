@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from PyQt6.QtWidgets import QApplication
+
+SIZES = (100, 1000, 10000)
+WIDGET_TYPES = ("button", "field", "label", "checkbox", "combobox")
+
+
+_app = None
+
+
+def get_app():
+    global _app
+    if QApplication.instance() is None:
+        _app = QApplication(sys.argv[:1])
+    return QApplication.instance()
+
+
+def make_editor(**options):
+    from gui_editor import GUIEditor
+    get_app()
+    editor = GUIEditor(**options)
+    editor.resize(1600, 1200)
+    editor.show()
+    return editor
+
+
+def synthetic_properties(count, columns=40):
+    """Grid-like layout of mixed widget types, similar to a large form."""
+    items = []
+    for i in range(count):
+        row, col = divmod(i, columns)
+        items.append((WIDGET_TYPES[i % len(WIDGET_TYPES)], {
+            "x": 10 + col * 130 + (i % 7),
+            "y": 10 + row * 50 + (i % 3),
+            "width": 100 + (i % 5) * 10,
+            "height": 30 + (i % 2) * 10,
+            "text": f"Item {i}",
+            "color": ("lightblue", "lightgreen", "lightyellow")[i % 3],
+            "font_size": 12,
+            "name": f"item_{i}",
+        }))
+    return items
+
+
+def quiet():
+    """Swallow the editor's console chatter while building fixtures."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def populate(editor, count):
+    with quiet():
+        editor.clear_canvas()
+        for widget_type, properties in synthetic_properties(count):
+            editor.add_widget_to_canvas(widget_type, properties)
+    return editor.widgets
+
+
+def rss_bytes():
+    """Resident set size of this process (Linux), including Qt's C++ heap."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def time_per_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def report(title, rows):
+    print(title)
+    for label, seconds in rows:
+        print(f"  {label:<40} {seconds * 1000:10.3f} ms")
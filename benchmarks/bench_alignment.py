@@ -0,0 +1,48 @@
+"""Per-frame cost of alignment-guide computation at 100, 1k and 10k widgets.
+
+Compares a full scan over ``editor.widgets`` (the pre-index behaviour) with
+``calculate_alignment_guides`` backed by a drag-session ``SnapIndex``.
+"""
+from _common import SIZES, make_editor, populate, report, time_per_call
+
+
+def full_scan(editor, widget, x, y, width, height, threshold=5):
+    guides = []
+    for other in editor.widgets:
+        if other != widget and "layout_id" not in other.properties:
+            ox, oy, ow, oh = other.x(), other.y(), other.width(), other.height()
+            for value in (oy, oy + oh):
+                if abs(value - y) < threshold:
+                    guides.append(value)
+            for value in (ox, ox + ow):
+                if abs(value - x) < threshold:
+                    guides.append(value)
+            if abs(ox + ow / 2 - x - width / 2) < threshold:
+                guides.append(ox + ow / 2)
+            if abs(oy + oh / 2 - y - height / 2) < threshold:
+                guides.append(oy + oh / 2)
+    return guides
+
+
+def run():
+    editor = make_editor()
+    for size in SIZES:
+        widgets = populate(editor, size)
+        moving = widgets[len(widgets) // 2]
+        x, y, width, height = moving.x() + 3, moving.y() + 2, moving.width(), moving.height()
+        repeat = max(20, 20000 // size)
+
+        scan = time_per_call(lambda: full_scan(editor, moving, x, y, width, height), repeat)
+        build = time_per_call(lambda: editor.begin_snap_session([moving]), max(5, repeat // 10))
+        editor.begin_snap_session([moving])
+        frame = time_per_call(lambda: editor.calculate_alignment_guides(moving, x, y, width, height), repeat)
+        editor.end_snap_session()
+        report(f"{size} widgets", [
+            ("full scan per frame", scan),
+            ("snap index build (once per drag)", build),
+            ("indexed query per frame", frame),
+        ])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,47 @@
+"""Memory and frame time of the live-widget and lightweight element backends.
+
+Each backend runs in its own process so resident memory is not shared
+between them. Reported per size: build time, RSS growth per element, QObject
+count under the canvas and the cost of a full-canvas repaint.
+"""
+import subprocess
+import sys
+import time
+
+from _common import SIZES, get_app, make_editor, populate, report, rss_bytes, time_per_call
+
+BACKENDS = {"widgets": False, "lightweight": True}
+
+
+def measure(backend, size):
+    from PyQt6.QtCore import QObject
+    editor = make_editor(lightweight_elements=BACKENDS[backend])
+    app = get_app()
+    app.processEvents()
+    before = rss_bytes()
+    start = time.perf_counter()
+    populate(editor, size)
+    app.processEvents()
+    build = time.perf_counter() - start
+    per_element = (rss_bytes() - before) / size
+    objects = len(editor.canvas.findChildren(QObject))
+    frame = time_per_call(lambda: editor.canvas.repaint(), 10)
+    report(f"{backend}, {size} elements", [
+        ("build", build),
+        ("full canvas repaint", frame),
+    ])
+    print(f"  {'RSS per element':<40} {per_element / 1024:10.1f} KiB")
+    print(f"  {'QObjects under canvas':<40} {objects:10d}")
+
+
+def run():
+    for size in SIZES:
+        for backend in BACKENDS:
+            subprocess.run([sys.executable, __file__, backend, str(size)], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], int(sys.argv[2]))
+    else:
+        run()
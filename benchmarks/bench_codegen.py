@@ -0,0 +1,76 @@
+"""Generated code: statement-per-widget (build_code, with and without the
+codegen passes) vs data-driven (build_runtime_code).
+
+Each generated module is imported in a fresh interpreter with bytecode
+writing disabled, so import time includes compiling it. Construction time
+covers GeneratedUI() plus the first show, which is when lazy layout
+containers build their members.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from _common import SIZES
+from bench_document import make_document
+from utils import build_code, build_runtime_code
+
+GENERATORS = (
+    ("statements, unoptimized", lambda document: build_code(document, optimized=False)),
+    ("statements, optimized", build_code),
+    ("data-driven runtime", build_runtime_code),
+)
+
+PROBE = """
+import json, sys, time
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+start = time.perf_counter()
+import generated
+imported = time.perf_counter()
+window = generated.GeneratedUI()
+window.show()
+app.processEvents()
+built = time.perf_counter()
+print(json.dumps({"import": imported - start, "construct": built - imported}))
+"""
+
+
+def make_layout_document(count):
+    """Synthetic document where every tenth element sits in one of a few layouts."""
+    document = make_document(count)
+    for index, record in enumerate(document):
+        if index % 10 == 0:
+            record.layout_id = index % 4 + 1
+    for layout_id in range(1, 5):
+        document.add_element("container", {"layout": "vertical", "layout_id": layout_id})
+    return document
+
+
+def measure(source, directory, repeat=3):
+    """Best of ``repeat`` fresh interpreters."""
+    with open(os.path.join(directory, "generated.py"), "w") as f:
+        f.write(source)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONDONTWRITEBYTECODE="1", PYTHONPATH=directory)
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout.splitlines()[-1]))
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            document = make_layout_document(size)
+            print(f"{size} elements")
+            for label, generator in GENERATORS:
+                source = generator(document)
+                timings = measure(source, directory)
+                print(f"  {label:<24} {source.count(chr(10)) + 1:7d} lines {len(source) / 1024:8.1f} KiB"
+                      f"   import {timings['import'] * 1000:8.1f} ms   construct {timings['construct'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,35 @@
+"""Headless save and codegen throughput over the document model.
+
+No QApplication is created: the document is built directly from synthetic
+records, which is what save_json and generate_code read from.
+"""
+import json
+
+from _common import SIZES, report, synthetic_properties, time_per_call
+from document import Document
+from utils import build_code
+
+
+def make_document(count):
+    document = Document()
+    for widget_type, properties in synthetic_properties(count):
+        document.add_element(widget_type, properties)
+    return document
+
+
+def run():
+    for size in SIZES:
+        repeat = max(3, 3000 // size)
+        build = time_per_call(lambda: make_document(size), repeat)
+        document = make_document(size)
+        to_json = time_per_call(lambda: json.dumps(document.to_dict(), indent=4), repeat)
+        codegen = time_per_call(lambda: build_code(document), repeat)
+        report(f"{size} elements", [
+            ("build document", build),
+            ("serialize to JSON", to_json),
+            ("generate code", codegen),
+        ])
+
+
+if __name__ == "__main__":
+    run()
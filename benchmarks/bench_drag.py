@@ -0,0 +1,87 @@
+"""Drag pacing: input-to-frame latency under a 1 kHz pointer, and per-element memory after drags.
+
+Latency is measured per pointer event, from when the event is delivered
+to the first frame that applies it or a newer position. Events whose
+position is never applied count as lost. Memory is the resident-set
+growth from dragging every element once, per element.
+"""
+import time
+
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtTest import QTest
+
+from _common import get_app, make_editor, populate, quiet, report, rss_bytes
+from draggable_widget import DraggableWidget
+
+DRAGS = 20
+EVENTS_PER_DRAG = 200
+MEMORY_SIZE = 2000
+
+
+def drag(app, widget, steps, frames=None, events=None, pause=0.001):
+    """Press, move ``steps`` times towards the lower right (by global position) and release."""
+    origin = widget.mapToGlobal(QPoint(5, 5))
+    QTest.mousePress(widget, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier, QPoint(5, 5))
+    for i in range(1, steps + 1):
+        target = origin + QPoint(i, i // 2)
+        if events is not None:
+            events.append((time.perf_counter(), i))
+        QTest.mouseMove(widget, widget.mapFromGlobal(target))
+        deadline = time.perf_counter() + pause
+        while time.perf_counter() < deadline:
+            app.processEvents()
+    QTest.mouseRelease(widget, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier,
+                       widget.mapFromGlobal(origin + QPoint(steps, steps // 2)))
+    app.processEvents()
+    return origin
+
+
+def run():
+    app = get_app()
+    editor = make_editor()
+    widgets = populate(editor, 1000)
+    app.processEvents()
+
+    frames = []  # (time, step applied)
+    original = DraggableWidget.process_move
+
+    def process_move(self, *args):
+        if self.last_move_global_pos is not None and self.drag_start_global_pos is not None:
+            frames.append((time.perf_counter(), (self.last_move_global_pos - self.drag_start_global_pos).x()))
+        return original(self, *args)
+    DraggableWidget.process_move = process_move
+
+    latencies, lost, frame_count = [], 0, 0
+    with quiet():
+        for n in range(DRAGS):
+            events, frames[:] = [], []
+            drag(app, widgets[n * 37 % len(widgets)], EVENTS_PER_DRAG, events=events)
+            frame_count += len(frames)
+            for when, step in events:
+                applied = next((t for t, s in frames if s >= step and t >= when), None)
+                if applied is None:
+                    lost += 1
+                else:
+                    latencies.append(applied - when)
+    DraggableWidget.process_move = original
+    latencies.sort()
+    report(f"{DRAGS} drags of {EVENTS_PER_DRAG} pointer events at ~1 kHz", [
+        ("input-to-frame latency p50", latencies[len(latencies) // 2]),
+        ("input-to-frame latency p95", latencies[int(len(latencies) * 0.95)]),
+    ])
+    print(f"  frames per drag {frame_count / DRAGS:.1f}, pointer events never applied: {lost}")
+
+    widgets = populate(editor, MEMORY_SIZE)
+    app.processEvents()
+    before = rss_bytes()
+    with quiet():
+        for widget in widgets:
+            drag(app, widget, 2, pause=0)
+    grown = rss_bytes() - before
+    timers = sum(1 for widget in widgets for child in widget.children() if type(child).__name__ == "QTimer")
+    print(f"After dragging each of {MEMORY_SIZE} elements once: {grown / MEMORY_SIZE:.0f} bytes RSS growth "
+          f"per element, {timers} element-owned timers")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+"""Frame time while dragging selections of 1 to 1000 elements, moved directly or through a DragProxy.
+
+A frame is one scheduler frame (snapping plus moves) and the repaint it
+causes. Press and release include building the proxy and committing the
+final positions.
+"""
+import time
+
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtTest import QTest
+
+from _common import get_app, make_editor, populate, quiet
+import drag_scheduler
+
+SELECTIONS = (1, 10, 50, 100, 200, 300, 400, 500, 1000)
+FRAMES = 30
+
+
+def drag_selection(app, editor, widgets, count):
+    """Select ``count`` elements, drag them FRAMES frames; returns (press, mean frame, release) seconds."""
+    editor.select_widget(None)
+    for widget in widgets[1:count]:
+        editor.selected_widgets.append(widget)
+        editor.update_widget_stylesheet(widget, True)
+    app.processEvents()
+    pressed = widgets[0]
+    scheduler = editor.canvas.drag_scheduler
+    modifier = Qt.KeyboardModifier.ControlModifier  # Adds the pressed element to the selection
+    start = time.perf_counter()
+    QTest.mousePress(pressed, Qt.MouseButton.LeftButton, modifier, QPoint(5, 5))
+    app.processEvents()
+    press = time.perf_counter() - start
+    origin = pressed.mapToGlobal(QPoint(5, 5))
+    frames = 0.0
+    for i in range(1, FRAMES + 1):
+        QTest.mouseMove(pressed, pressed.mapFromGlobal(origin + QPoint(i * 7, i * 3)))
+        start = time.perf_counter()
+        scheduler.frame()
+        app.processEvents()
+        frames += time.perf_counter() - start
+    start = time.perf_counter()
+    QTest.mouseRelease(pressed, Qt.MouseButton.LeftButton, modifier, pressed.mapFromGlobal(origin))
+    app.processEvents()
+    release = time.perf_counter() - start
+    return press, frames / FRAMES, release
+
+
+def run():
+    app = get_app()
+    editor = make_editor()
+    widgets = populate(editor, 1000)
+    app.processEvents()
+    default_threshold = drag_scheduler.PROXY_THRESHOLD
+    print(f"{'selected':>8} {'mode':>7} {'press ms':>10} {'frame ms':>10} {'release ms':>11}")
+    with quiet():
+        rows = []
+        for count in SELECTIONS:
+            for mode, threshold in (("direct", 10 ** 9), ("proxy", 1)):
+                drag_scheduler.PROXY_THRESHOLD = threshold
+                press, frame, release = drag_selection(app, editor, widgets, count)
+                rows.append(f"{count:>8} {mode:>7} {press * 1000:10.2f} {frame * 1000:10.2f} {release * 1000:11.2f}")
+    drag_scheduler.PROXY_THRESHOLD = default_threshold
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    run()
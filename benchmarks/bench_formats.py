@@ -0,0 +1,52 @@
+"""JSON vs binary (.guib) project files: size on disk, save time and load time.
+
+"open + first widget" shows the lazy path: opening a binary project only
+reads its section directory, while JSON has to be parsed before anything
+can be used. Every size is checked to round-trip losslessly.
+"""
+import json
+import os
+import tempfile
+
+from _common import SIZES, report, time_per_call
+from bench_document import make_document
+from binary_format import BinaryProject, read_binary, write_binary
+from utils import write_json
+
+
+def first_widget(file_name):
+    with BinaryProject(file_name) as project:
+        return next(project.iter_widgets())
+
+
+def read_json_file(file_name):
+    with open(file_name) as f:
+        return json.load(f)
+
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = os.path.join(directory, "project.json")
+        binary_file = os.path.join(directory, "project.guib")
+        for size in SIZES:
+            document = make_document(size)
+            for index, record in enumerate(document):
+                if index % 10 < 3:
+                    record.group_id = index // 10 + 1
+            data = document.to_dict()
+            repeat = max(3, 3000 // size)
+            save_json = time_per_call(lambda: write_json(document, json_file), repeat)
+            save_binary = time_per_call(lambda: write_binary(document.to_dict(), binary_file), repeat)
+            assert read_binary(binary_file) == data == read_json_file(json_file)
+            report(f"{size} elements (JSON {os.path.getsize(json_file) / 1024:.1f} KiB, "
+                   f"binary {os.path.getsize(binary_file) / 1024:.1f} KiB)", [
+                ("save JSON", save_json),
+                ("save binary", save_binary),
+                ("load JSON", time_per_call(lambda: read_json_file(json_file), repeat)),
+                ("load binary", time_per_call(lambda: read_binary(binary_file), repeat)),
+                ("open + first widget, binary", time_per_call(lambda: first_widget(binary_file), repeat)),
+            ])
+
+
+if __name__ == "__main__":
+    run()
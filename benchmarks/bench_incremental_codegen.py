@@ -0,0 +1,39 @@
+"""Regenerating code after a single-element edit: full build_code vs IncrementalGenerator."""
+import time
+
+from _common import report, time_per_call
+from bench_codegen import make_layout_document
+from codegen import IncrementalGenerator
+from utils import build_code
+
+SIZE = 5000
+
+
+def run():
+    document = make_layout_document(SIZE)
+    records = list(document)
+    generator = IncrementalGenerator()
+    start = time.perf_counter()
+    generator.build(document)
+    first = time.perf_counter() - start
+    edits = iter(range(10 ** 9))
+
+    def edit_and_regenerate():
+        record = records[next(edits) * 7 % SIZE]
+        record.text += "!"
+        return generator.build(document)
+
+    full = time_per_call(lambda: build_code(document), 5)
+    incremental = time_per_call(edit_and_regenerate, 20)
+    emitted, reused = generator.emitted, generator.reused
+    assert edit_and_regenerate() == build_code(document)
+    report(f"{SIZE} elements, one text edit per regeneration "
+           f"({emitted} fragment emitted, {reused} reused per run)", [
+        ("full build_code", full),
+        ("incremental, first build", first),
+        ("incremental, after one edit", incremental),
+    ])
+
+
+if __name__ == "__main__":
+    run()
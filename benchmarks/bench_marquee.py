@@ -0,0 +1,61 @@
+"""Marquee selection of about 500 elements, against Ctrl+clicking the same elements one by one.
+
+A band move is one grid-index query plus the overlay repaint it causes;
+the release applies the selection highlight and refreshes the properties
+dock once.
+"""
+import time
+
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtTest import QTest
+
+from _common import get_app, make_editor, populate, quiet, report
+
+SIZES = (1000, 10000)
+MOVES = 30
+CORNER = QPoint(5300, 660)  # Spans 13 rows of the synthetic 40-column form
+
+
+def run():
+    app = get_app()
+    editor = make_editor()
+    canvas = editor.canvas
+    left = Qt.MouseButton.LeftButton
+    for size in SIZES:
+        widgets = populate(editor, size)
+        app.processEvents()
+        with quiet():
+            editor.select_widget(None)
+            app.processEvents()
+            start = time.perf_counter()
+            QTest.mousePress(canvas, left, Qt.KeyboardModifier.NoModifier, QPoint(2, 2))
+            press = time.perf_counter() - start
+            moves = 0.0
+            for i in range(1, MOVES + 1):
+                start = time.perf_counter()
+                QTest.mouseMove(canvas, QPoint(CORNER.x() * i // MOVES, CORNER.y() * i // MOVES))
+                app.processEvents()
+                moves += time.perf_counter() - start
+            start = time.perf_counter()
+            QTest.mouseRelease(canvas, left, Qt.KeyboardModifier.NoModifier, CORNER)
+            app.processEvents()
+            release = time.perf_counter() - start
+            selected = list(editor.selected_widgets)
+
+            editor.select_widget(None)
+            app.processEvents()
+            start = time.perf_counter()
+            for widget in selected:
+                QTest.mouseClick(widget, left, Qt.KeyboardModifier.ControlModifier, QPoint(2, 2))
+                app.processEvents()
+            clicks = time.perf_counter() - start
+        report(f"{size} elements, {len(selected)} selected", [
+            ("marquee press", press),
+            ("marquee move (mean)", moves / MOVES),
+            ("marquee release", release),
+            (f"{len(selected)} Ctrl+clicks", clicks),
+        ])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,45 @@
+"""Selection-change latency: select_widget plus the event-loop work it queues.
+
+Alternates between single selection of different widget types, a
+multi-selection and an empty selection, which is the mix a user clicking
+around the canvas produces.
+"""
+import time
+
+from _common import get_app, make_editor, populate, quiet, report
+
+SIZE = 1000
+
+
+def run():
+    app = get_app()
+    editor = make_editor()
+    widgets = populate(editor, SIZE)
+    app.processEvents()
+
+    def click(i):
+        if i % 5 == 4:
+            editor.selected_widgets = []
+            editor.select_widget(None)
+        elif i % 5 == 3:
+            for widget in widgets[i:i + 3]:
+                editor.selected_widgets.append(widget)
+            editor.update_properties()
+        else:
+            editor.select_widget(widgets[i * 37 % SIZE])
+        app.processEvents()
+
+    timings = {"single": [], "multiple": [], "none": []}
+    with quiet():
+        for i in range(200):
+            start = time.perf_counter()
+            click(i)
+            kind = "none" if i % 5 == 4 else "multiple" if i % 5 == 3 else "single"
+            timings[kind].append(time.perf_counter() - start)
+    report(f"{SIZE} widgets, mean latency per selection change", [
+        (f"{kind} selection", sum(values) / len(values)) for kind, values in timings.items()
+    ])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,58 @@
+"""Styling cost: theme switches, selection toggles and single color edits.
+
+"theme (blocking)" is how long apply_theme plus the first event-loop turn
+keeps the editor busy; "theme (until all restyled)" also drains the work
+left for later turns.
+"""
+import time
+
+from PyQt6.QtWidgets import QInputDialog
+
+from _common import get_app, make_editor, populate, quiet, report
+
+SIZE = 5000
+
+
+def drain(app, editor):
+    queue = getattr(editor, "style_queue", None)
+    while queue is not None and queue.pending:
+        app.processEvents()
+
+
+def run():
+    app = get_app()
+    editor = make_editor()
+    widgets = populate(editor, SIZE)
+    app.processEvents()
+    themes = list(editor.themes)
+    rows = []
+    with quiet():
+        blocking, total = [], []
+        for i in range(4):
+            QInputDialog.getItem = staticmethod(lambda *args, theme=themes[i % 2]: (theme, True))
+            start = time.perf_counter()
+            editor.apply_theme()
+            app.processEvents()
+            blocking.append(time.perf_counter() - start)
+            drain(app, editor)
+            total.append(time.perf_counter() - start)
+        rows.append(("theme (blocking)", sum(blocking) / len(blocking)))
+        rows.append(("theme (until all restyled)", sum(total) / len(total)))
+
+        start = time.perf_counter()
+        for i in range(200):
+            editor.select_widget(widgets[i * 37 % SIZE])
+            app.processEvents()
+        rows.append(("select one widget", (time.perf_counter() - start) / 200))
+
+        widget = widgets[0]
+        start = time.perf_counter()
+        for i in range(200):
+            editor.update_widget_property(widget, "color", ("red", "green")[i % 2])
+            app.processEvents()
+        rows.append(("change one widget's color", (time.perf_counter() - start) / 200))
+    report(f"{SIZE} widgets", rows)
+
+
+if __name__ == "__main__":
+    run()
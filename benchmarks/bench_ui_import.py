@@ -0,0 +1,85 @@
+"""Qt Designer .ui import: the original ET.parse importer vs the iterparse one.
+
+Peak Python heap during the parse is measured with tracemalloc, so it covers
+the element tree the old importer keeps alive but not Qt.
+"""
+import os
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from _common import SIZES, WIDGET_TYPES, report, time_per_call
+from ui_import import UiImporter
+
+QT_CLASSES = {"button": "QPushButton", "field": "QLineEdit", "label": "QLabel",
+              "checkbox": "QCheckBox", "combobox": "QComboBox"}
+
+
+def legacy_load_ui(file_name):
+    """The importer this replaces, minus the file dialog."""
+    root = ET.parse(file_name).getroot()
+    ui_data = []
+    for widget in root.findall(".//widget"):
+        widget_type = widget.get("class").lower().replace("q", "")
+        properties = {
+            "name": widget.get("name", ""),
+            "x": int(widget.find("geometry/x").text) if widget.find("geometry/x") is not None else 100,
+            "y": int(widget.find("geometry/y").text) if widget.find("geometry/y") is not None else 100,
+            "width": int(widget.find("geometry/width").text) if widget.find("geometry/width") is not None else 100,
+            "height": int(widget.find("geometry/height").text) if widget.find("geometry/height") is not None else 40,
+            "text": widget.find("property/text").text if widget.find("property/text") is not None else "",
+            "color": widget.find("property/stylesheet").text.split("background-color: ")[1].split(";")[0] if widget.find("property/stylesheet") is not None and "background-color" in widget.find("property/stylesheet").text else "white",
+            "font_size": int(widget.find("property/font/size").text) if widget.find("property/font/size") is not None else 12,
+            "custom_properties": {}
+        }
+        ui_data.append((widget_type, properties))
+    return ui_data
+
+
+def write_ui(file_name, count, columns=40):
+    """A main window with ``count`` absolutely positioned widgets split across group boxes."""
+    with open(file_name, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<ui version="4.0">\n <class>MainWindow</class>\n'
+                ' <widget class="QMainWindow" name="MainWindow">\n  <widget class="QWidget" name="centralwidget">\n')
+        for start in range(0, count, 100):
+            f.write(f'   <widget class="QGroupBox" name="box_{start}">\n'
+                    f'    <property name="geometry"><rect><x>0</x><y>{start // 100 * 10}</y>'
+                    f'<width>5200</width><height>10000</height></rect></property>\n')
+            for i in range(start, min(count, start + 100)):
+                row, col = divmod(i, columns)
+                f.write(f'    <widget class="{QT_CLASSES[WIDGET_TYPES[i % len(WIDGET_TYPES)]]}" name="item_{i}">\n'
+                        f'     <property name="geometry"><rect><x>{10 + col * 130}</x><y>{10 + row * 50}</y>'
+                        f'<width>100</width><height>30</height></rect></property>\n'
+                        f'     <property name="text"><string>Item {i}</string></property>\n'
+                        f'     <property name="styleSheet"><string>background-color: lightblue;</string></property>\n'
+                        f'     <property name="font"><font><pointsize>12</pointsize></font></property>\n'
+                        '    </widget>\n')
+            f.write('   </widget>\n')
+        f.write('  </widget>\n </widget>\n</ui>\n')
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "form.ui")
+        for size in SIZES:
+            write_ui(file_name, size)
+            repeat = max(3, 1000 // size)
+            legacy = lambda: legacy_load_ui(file_name)
+            streaming = lambda: UiImporter().parse(file_name)
+            report(f"{size} widgets ({os.path.getsize(file_name) / 1024:.0f} KiB .ui, peak heap "
+                   f"{peak_memory(legacy) / 1024:.0f} KiB legacy vs {peak_memory(streaming) / 1024:.0f} KiB iterparse)", [
+                ("legacy ET.parse + find", time_per_call(legacy, repeat)),
+                ("iterparse", time_per_call(streaming, repeat)),
+            ])
+
+
+if __name__ == "__main__":
+    run()
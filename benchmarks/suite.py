@@ -0,0 +1,199 @@
+"""Offscreen benchmark suite over synthetic 100/1k/10k element forms, with a JSON report.
+
+    python benchmarks/suite.py -o report.json
+    python benchmarks/suite.py --baseline report.json        # exit status 1 on regressions
+    python benchmarks/suite.py --report new.json --baseline old.json   # compare two stored reports
+
+Every case drives the editor through its real entry points; file dialogs
+are answered with a temporary file and the theme dialog with the next
+theme. A case's result is the median of its runs. Compared with a
+baseline, a case regresses when its median grew by more than
+``--threshold`` and by more than the noise floor.
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from PyQt6.QtCore import QPoint, PYQT_VERSION_STR, QT_VERSION_STR
+from PyQt6.QtWidgets import QFileDialog, QInputDialog
+
+from _common import SIZES, get_app, make_editor, populate, quiet
+from bench_ui_import import write_ui
+
+NOISE_FLOOR_MS = 0.05
+# Case -> runs at 100 elements; larger forms get proportionally fewer, but at least MIN_RUNS
+RUNS = {"alignment": 500, "drag_frame": 200, "select": 100, "save_json": 20, "load_json": 10, "load_ui": 10,
+        "generate_code": 20, "undo_redo": 10, "apply_theme": 10}
+MIN_RUNS = 3
+
+
+@contextlib.contextmanager
+def dialogs(open_file=None, save_file=None, save_filter="", item=None):
+    """Answer the editor's file and item dialogs without showing them."""
+    saved = QFileDialog.getOpenFileName, QFileDialog.getSaveFileName, QInputDialog.getItem
+    QFileDialog.getOpenFileName = staticmethod(lambda *args, **kwargs: (open_file, ""))
+    QFileDialog.getSaveFileName = staticmethod(lambda *args, **kwargs: (save_file, save_filter))
+    QInputDialog.getItem = staticmethod(lambda *args, **kwargs: (item(), True))
+    try:
+        yield
+    finally:
+        QFileDialog.getOpenFileName, QFileDialog.getSaveFileName, QInputDialog.getItem = saved
+
+
+def settle(app, editor):
+    """Run the event loop until queued restyles and background loads are done."""
+    app.processEvents()
+    while editor.style_queue.pending or editor.loader is not None:
+        app.processEvents()
+
+
+def measure(func, runs, setup=None):
+    times = []
+    for i in range(runs):
+        if setup is not None:
+            setup(i)
+        start = time.perf_counter()
+        func(i)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_case(name, app, editor, size, directory):
+    widgets = editor.widgets
+    runs = max(MIN_RUNS, RUNS[name] * 100 // size)
+    themes = itertools.cycle(editor.themes)
+    next_theme = lambda: next(themes)
+    json_file = os.path.join(directory, f"form_{size}.json")
+    ui_file = os.path.join(directory, f"form_{size}.ui")
+    code_file = os.path.join(directory, f"form_{size}.py")
+
+    if name == "alignment":
+        widget = widgets[size // 2]
+        editor.begin_snap_session([widget])
+        times = measure(lambda i: editor.calculate_alignment_guides(widget, 10 + i % 400, 10 + i % 300, 100, 30), runs)
+        editor.end_snap_session()
+    elif name == "drag_frame":
+        widget = widgets[size // 2]
+        editor.select_widget(widget)
+        widget.is_dragging = True
+        widget.drag_start_global_pos = QPoint(0, 0)
+        widget.drag_start_widget_pos = widget.pos()
+        editor.begin_snap_session(widget.moving_widgets(editor))
+
+        def frame(i):
+            widget.last_move_global_pos = QPoint(i % 40, i % 25)
+            widget.process_move(editor)
+            app.processEvents()
+        times = measure(frame, runs)
+        widget.is_dragging = False
+        editor.end_snap_session()
+        editor.canvas.update_alignment_guides([])
+    elif name == "select":
+        def select(i):
+            editor.select_widget(widgets[i * 37 % size])
+            app.processEvents()
+        times = measure(select, runs)
+    elif name == "save_json":
+        with dialogs(save_file=json_file, save_filter="JSON Files (*.json)"):
+            times = measure(lambda i: editor.save_json(), runs)
+    elif name == "load_json":
+        with dialogs(save_file=json_file, save_filter="JSON Files (*.json)"):
+            editor.save_json()
+        with dialogs(open_file=json_file):
+            times = measure(lambda i: (editor.load_json(), settle(app, editor)), runs)
+    elif name == "load_ui":
+        write_ui(ui_file, size)
+        with dialogs(open_file=ui_file):
+            times = measure(lambda i: (editor.load_ui(), settle(app, editor)), runs)
+    elif name == "generate_code":
+        with dialogs(save_file=code_file, save_filter="Python Files (*.py)"):
+            times = measure(lambda i: editor.generate_code(), runs)
+    elif name == "undo_redo":
+        with dialogs(item=next_theme):
+            editor.apply_theme()
+        settle(app, editor)
+        times = measure(lambda i: (editor.undo(), settle(app, editor), editor.redo(), settle(app, editor)), runs)
+    elif name == "apply_theme":
+        with dialogs(item=next_theme):
+            times = measure(lambda i: (editor.apply_theme(), settle(app, editor)), runs)
+    return times
+
+
+def run_suite(sizes, cases):
+    app = get_app()
+    editor = make_editor()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for name in cases:
+                populate(editor, size)  # Loads and undo leave the canvas in another state
+                editor.reset_history()
+                settle(app, editor)
+                with quiet():
+                    times = run_case(name, app, editor, size, directory)
+                median = statistics.median(times)
+                results[f"{name}/{size}"] = {"case": name, "size": size, "runs": len(times),
+                                             "median_ms": median * 1000, "min_ms": min(times) * 1000}
+                print(f"  {name:<16} {size:>6}  {median * 1000:10.3f} ms  (min {min(times) * 1000:.3f}, "
+                      f"{len(times)} runs)", file=sys.stderr)
+    return {
+        "meta": {"python": platform.python_version(), "qt": QT_VERSION_STR, "pyqt": PYQT_VERSION_STR,
+                 "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print a comparison table; returns the keys that regressed."""
+    regressions = []
+    print(f"{'case':<24} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"{key:<24} {'-':>12} {result['median_ms']:12.3f}      new")
+            continue
+        old, new = base["median_ms"], result["median_ms"]
+        change = (new - old) / old if old else 0.0
+        regressed = change > threshold and new - old > NOISE_FLOOR_MS
+        if regressed:
+            regressions.append(key)
+        print(f"{key:<24} {old:12.3f} {new:12.3f} {change:+8.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the editor benchmark suite offscreen.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--cases", nargs="+", choices=list(RUNS), default=list(RUNS))
+    parser.add_argument("-o", "--output", help="write the JSON report here")
+    parser.add_argument("--report", help="compare this stored report instead of running the suite")
+    parser.add_argument("--baseline", help="report to compare against; regressions make the exit status 1")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before a case regresses")
+    args = parser.parse_args(argv)
+    if args.report:
+        with open(args.report) as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args.sizes, args.cases)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""Compact binary project format (.guib).
+
+Layout, all integers little-endian::
+
+    header     magic "GUIB", version u16, section count u16
+    directory  per section: tag (4 bytes), offset u64, length u64
+    sections   STRS  string table: count u32, (count + 1) u32 end offsets, UTF-8 data
+               WDGT  fixed-width widget records (RECORD below)
+               GRPS  groups:  u8 encoding, then compact records or JSON text
+               LAYT  layouts: u8 encoding, then compact records or JSON text
+               META  JSON text of any other top-level keys (optional)
+
+Repeated text (types, colors, labels, extra-property blobs) is stored once in
+the string table and referenced by index. A widget field that is missing or
+does not fit its fixed-width slot is left out of the presence mask and kept in
+the record's JSON "extra" string instead, so any project that can be written
+as JSON round-trips exactly.
+
+BinaryProject reads files through a memory map and only decodes the
+directory when opened; strings, widgets, groups and layouts are decoded on
+first access.
+"""
+import json
+import mmap
+import struct
+
+MAGIC = b"GUIB"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+DIRECTORY_ENTRY = struct.Struct("<4sQQ")
+# id, presence mask, x, y, width, height, type, text, color, name, font_size, group_id, layout_id, extra
+RECORD = struct.Struct("<IHxxiiiiIIIIiiiI")
+NO_STRING = 0xFFFFFFFF
+
+INT_FIELDS = ("x", "y", "width", "height", "font_size", "group_id", "layout_id")
+STRING_FIELDS = ("type", "text", "color", "name")
+FIELD_BITS = {name: 1 << i for i, name in enumerate(("id",) + INT_FIELDS + STRING_FIELDS)}
+COMMON_MASK = sum(FIELD_BITS[name] for name in ("type", "x", "y", "width", "height", "text", "color", "font_size"))
+
+COMPACT, JSON_TEXT = 0, 1
+
+
+def fits_int(value):
+    return type(value) is int and -2**31 <= value < 2**31
+
+
+class StringTable:
+    def __init__(self):
+        self.index = {}
+        self.strings = []
+
+    def add(self, text):
+        position = self.index.get(text)
+        if position is None:
+            position = self.index[text] = len(self.strings)
+            self.strings.append(text)
+        return position
+
+    def encode(self):
+        data = [s.encode("utf-8") for s in self.strings]
+        ends, total = [], 0
+        for item in data:
+            total += len(item)
+            ends.append(total)
+        return struct.pack(f"<I{len(ends) + 1}I", len(data), 0, *ends) + b"".join(data)
+
+
+def encode_widget(item, strings):
+    item = dict(item)
+    mask = 0
+    values = {}
+    element_id = item.pop("id", None)
+    if fits_int(element_id) and element_id >= 0:
+        mask |= FIELD_BITS["id"]
+    else:
+        if element_id is not None or "id" in item:
+            item["id"] = element_id
+        element_id = 0
+    for name in INT_FIELDS:
+        if name in item and fits_int(item[name]):
+            values[name] = item.pop(name)
+            mask |= FIELD_BITS[name]
+        else:
+            values[name] = 0
+    for name in STRING_FIELDS:
+        if name in item and isinstance(item[name], str):
+            values[name] = strings.add(item.pop(name))
+            mask |= FIELD_BITS[name]
+        else:
+            values[name] = NO_STRING
+    extra = strings.add(json.dumps(item, separators=(",", ":"))) if item else NO_STRING
+    return RECORD.pack(element_id, mask, values["x"], values["y"], values["width"], values["height"],
+                       values["type"], values["text"], values["color"], values["name"],
+                       values["font_size"], values["group_id"], values["layout_id"], extra)
+
+
+def encode_membership(entries, typed):
+    """Compact encoding when every entry is {"id": int, ["type": str,] "widgets": [int]}."""
+    keys = {"id", "type", "widgets"} if typed else {"id", "widgets"}
+    compact = all(
+        isinstance(e, dict) and set(e) == keys and fits_int(e["id"]) and isinstance(e["widgets"], list)
+        and all(type(w) is int and 0 <= w < 2**32 for w in e["widgets"])
+        and (not typed or isinstance(e["type"], str))
+        for e in entries
+    )
+    if not compact:
+        return bytes([JSON_TEXT]) + json.dumps(entries, separators=(",", ":")).encode("utf-8")
+    parts = [bytes([COMPACT]), struct.pack("<I", len(entries))]
+    for entry in entries:
+        if typed:
+            type_bytes = entry["type"].encode("utf-8")
+            parts.append(struct.pack("<iH", entry["id"], len(type_bytes)) + type_bytes)
+        else:
+            parts.append(struct.pack("<i", entry["id"]))
+        parts.append(struct.pack(f"<I{len(entry['widgets'])}I", len(entry["widgets"]), *entry["widgets"]))
+    return b"".join(parts)
+
+
+def encode_project(data):
+    """Encode a project dict (the JSON project structure) to bytes."""
+    strings = StringTable()
+    widgets = b"".join(encode_widget(item, strings) for item in data.get("widgets", []))
+    sections = [
+        (b"WDGT", widgets),
+        (b"GRPS", encode_membership(data.get("groups", []), typed=False)),
+        (b"LAYT", encode_membership(data.get("layouts", []), typed=True)),
+    ]
+    meta = {k: v for k, v in data.items() if k not in ("widgets", "groups", "layouts")}
+    if meta:
+        sections.append((b"META", json.dumps(meta, separators=(",", ":")).encode("utf-8")))
+    sections.insert(0, (b"STRS", strings.encode()))
+    offset = HEADER.size + DIRECTORY_ENTRY.size * len(sections)
+    directory = []
+    for tag, payload in sections:
+        directory.append(DIRECTORY_ENTRY.pack(tag, offset, len(payload)))
+        offset += len(payload)
+    return HEADER.pack(MAGIC, VERSION, len(sections)) + b"".join(directory) + b"".join(p for _, p in sections)
+
+
+def write_binary(data, file_name):
+    with open(file_name, "wb") as f:
+        f.write(encode_project(data))
+
+
+def is_binary_project(file_name):
+    with open(file_name, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class BinaryProject:
+    """Lazily decoded view of a .guib file backed by a memory map."""
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        with open(file_name, "rb") as f:
+            self.size = f.seek(0, 2)
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self.view = memoryview(self.map)
+        self.sections = {}
+        try:
+            self.read_directory()
+        except ValueError:
+            self.close()
+            raise
+        self.string_cache = {}
+        self.extra_cache = {}
+        self.string_count = None
+        self.bytes_read = 0
+
+    def read_directory(self):
+        """Decode the header and directory, checking every section lies within the file."""
+        file_name = self.file_name
+        if self.size < HEADER.size:
+            raise ValueError(f"{file_name} is not a binary project")
+        magic, version, count = HEADER.unpack_from(self.view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{file_name} is not a binary project")
+        if version > VERSION:
+            raise ValueError(f"{file_name} uses binary project version {version}, newer than {VERSION}")
+        if HEADER.size + count * DIRECTORY_ENTRY.size > self.size:
+            raise ValueError(f"{file_name} is truncated: its section directory is incomplete")
+        for i in range(count):
+            tag, offset, length = DIRECTORY_ENTRY.unpack_from(self.view, HEADER.size + i * DIRECTORY_ENTRY.size)
+            try:
+                tag = tag.decode("ascii")
+            except UnicodeDecodeError:
+                raise ValueError(f"{file_name} is corrupt: invalid section tag {tag!r}") from None
+            if offset + length > self.size:
+                raise ValueError(f"{file_name} is truncated: section {tag} ends at byte {offset + length} "
+                                 f"of {self.size}")
+            self.sections[tag] = (offset, length)
+        if self.sections.get("WDGT", (0, 0))[1] % RECORD.size:
+            raise ValueError(f"{file_name} is corrupt: widget section is not a whole number of records")
+        table = self.section("STRS")
+        if len(table) < 4 or 4 * (struct.unpack_from("<I", table, 0)[0] + 2) > len(table):
+            raise ValueError(f"{file_name} is corrupt: string table is incomplete")
+
+    def close(self):
+        self.view.release()
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def section(self, tag):
+        offset, length = self.sections.get(tag, (0, 0))
+        return self.view[offset:offset + length]
+
+    def string(self, index):
+        if index == NO_STRING:
+            return None
+        text = self.string_cache.get(index)
+        if text is None:
+            table = self.section("STRS")
+            if self.string_count is None:
+                self.string_count = struct.unpack_from("<I", table, 0)[0]
+            data_start = 4 + 4 * (self.string_count + 1)
+            if index >= self.string_count:
+                raise ValueError(f"{self.file_name} is corrupt: string {index} of {self.string_count}")
+            start, end = struct.unpack_from("<II", table, 4 + 4 * index)
+            text = self.string_cache[index] = str(table[data_start + start:data_start + end], "utf-8")
+        return text
+
+    def widget_count(self):
+        return self.sections.get("WDGT", (0, 0))[1] // RECORD.size
+
+    def iter_widgets(self):
+        offset = self.sections.get("WDGT", (0, 0))[0]
+        for values in RECORD.iter_unpack(self.section("WDGT")):
+            offset += RECORD.size
+            self.bytes_read = offset
+            yield self.decode_widget(values)
+
+    def decode_widget(self, values):
+        (element_id, mask, x, y, width, height, type_index, text_index, color_index, name_index,
+         font_size, group_id, layout_id, extra_index) = values
+        string = self.string
+        if mask & COMMON_MASK == COMMON_MASK:
+            item = {"type": string(type_index), "x": x, "y": y, "width": width, "height": height,
+                    "text": string(text_index), "color": string(color_index), "font_size": font_size}
+        else:
+            fields = {"type": type_index, "x": x, "y": y, "width": width, "height": height,
+                      "text": text_index, "color": color_index, "font_size": font_size}
+            item = {name: (string(value) if name in STRING_FIELDS else value)
+                    for name, value in fields.items() if mask & FIELD_BITS[name]}
+        if extra_index != NO_STRING:
+            item.update(self.extra(extra_index))
+        if mask & FIELD_BITS["group_id"]:
+            item["group_id"] = group_id
+        if mask & FIELD_BITS["layout_id"]:
+            item["layout_id"] = layout_id
+        if mask & FIELD_BITS["name"]:
+            item["name"] = string(name_index)
+        if mask & FIELD_BITS["id"]:
+            item["id"] = element_id
+        return item
+
+    def extra(self, index):
+        """Decoded extra-property blob; shared blobs are parsed once and copied."""
+        value = self.extra_cache.get(index)
+        if value is None:
+            value = self.extra_cache[index] = json.loads(self.string(index))
+        return {k: (dict(v) if isinstance(v, dict) else list(v) if isinstance(v, list) else v)
+                for k, v in value.items()}
+
+    def membership(self, tag, typed):
+        try:
+            return self.decode_membership(tag, typed)
+        except struct.error:
+            raise ValueError(f"{self.file_name} is corrupt: {tag} section is incomplete") from None
+
+    def decode_membership(self, tag, typed):
+        data = self.section(tag)
+        if not len(data):
+            return []
+        if data[0] == JSON_TEXT:
+            return json.loads(str(data[1:], "utf-8"))
+        count = struct.unpack_from("<I", data, 1)[0]
+        offset, entries = 5, []
+        for _ in range(count):
+            entry = {}
+            if typed:
+                entry["id"], type_length = struct.unpack_from("<iH", data, offset)
+                offset += 6
+                entry["type"] = str(data[offset:offset + type_length], "utf-8")
+                offset += type_length
+            else:
+                entry["id"] = struct.unpack_from("<i", data, offset)[0]
+                offset += 4
+            length = struct.unpack_from("<I", data, offset)[0]
+            entry["widgets"] = list(struct.unpack_from(f"<{length}I", data, offset + 4))
+            offset += 4 + 4 * length
+            entries.append(entry)
+        return entries
+
+    def groups(self):
+        return self.membership("GRPS", typed=False)
+
+    def layouts(self):
+        return self.membership("LAYT", typed=True)
+
+    def meta(self):
+        data = self.section("META")
+        return json.loads(str(data, "utf-8")) if len(data) else {}
+
+    def __iter__(self):
+        """Yield ("widget", item) per widget, then the other sections, like JsonProjectStream."""
+        for item in self.iter_widgets():
+            yield "widget", item
+        yield "groups", self.groups()
+        yield "layouts", self.layouts()
+        for key, value in self.meta().items():
+            yield key, value
+        self.bytes_read = self.size
+
+    def to_dict(self):
+        data = {"widgets": list(self.iter_widgets()), "groups": self.groups(), "layouts": self.layouts()}
+        data.update(self.meta())
+        return data
+
+
+def read_binary(file_name):
+    with BinaryProject(file_name) as project:
+        return project.to_dict()
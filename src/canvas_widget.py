@@ -1,6 +1,11 @@
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QPen, QColor
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPainter, QPen, QColor, QPixmap, QBrush, QRegion, QFont
+from PyQt6.QtCore import Qt, QRect, QTimer
+from math import lcm
+from styles import CANVAS_STYLE_SHEET
+import metrics
+from drag_scheduler import DragScheduler
+from marquee import MarqueeSelection
 
 class CanvasWidget(QWidget):
     def __init__(self, parent=None):
@@ -8,43 +13,157 @@ class CanvasWidget(QWidget):
         self.grid_enabled = True
         self.grid_size = 10
         self.alignment_guides = []  # List of (x1, y1, x2, y2) for alignment lines
-        self.setStyleSheet("background-color: #f0f0f0;")
+        self.grid_brush = None
+        self.grid_brush_key = None  # (grid_size, device_pixel_ratio) the cached tile was rendered for
+        self.setStyleSheet(CANVAS_STYLE_SHEET)
         self.setMouseTracking(True)
+        self.metrics_overlay = None  # Created the first time the HUD is shown
+        self.drag_scheduler = DragScheduler(self)  # Shared by all elements; one drag runs at a time
+        self.marquee = None  # MarqueeSelection while a band is dragged on the empty canvas
 
+    @metrics.timed("canvas.paint")
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setClipRegion(event.region())  # Optimize repaints
         
         # Draw grid
         if self.grid_enabled:
-            pen = QPen(QColor(200, 200, 200), 1, Qt.PenStyle.DotLine)
-            painter.setPen(pen)
-            for x in range(0, self.width(), self.grid_size):
-                painter.drawLine(x, 0, x, self.height())
-            for y in range(0, self.height(), self.grid_size):
-                painter.drawLine(0, y, self.width(), y)
+            painter.fillRect(event.rect(), self.get_grid_brush())
 
         # Draw alignment guides
         pen = QPen(QColor(255, 0, 0), 1, Qt.PenStyle.DashLine)
         painter.setPen(pen)
         for guide in self.alignment_guides:
-            x1, y1, x2, y2 = map(int, guide)
+            x1, y1, x2, y2 = guide
             painter.drawLine(x1, y1, x2, y2)
-            
-            # --- THIS IS THE FIX ---
-            # The text now shows the correct X or Y coordinate of the line
-            if x1 == x2:  # Vertical guide
-                painter.drawText(x1 + 5, 20, f"x: {x1}")
-            else:  # Horizontal guide
-                painter.drawText(20, y1 - 5, f"y: {y1}")
+            painter.drawText(*self.guide_label(guide))
 
         painter.end()
 
+    def mousePressEvent(self, event):
+        editor = self.drag_scheduler.find_editor()
+        if event.button() == Qt.MouseButton.LeftButton and editor is not None and not editor.preview_mode:
+            self.marquee = MarqueeSelection(self, editor, event.position().toPoint())
+            event.accept()
+        else:
+            super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.marquee is not None:
+            self.marquee.move(event.position().toPoint(), event.modifiers())
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self.marquee is not None and event.button() == Qt.MouseButton.LeftButton:
+            marquee, self.marquee = self.marquee, None
+            marquee.finish(event.position().toPoint(), event.modifiers())
+            event.accept()
+        else:
+            super().mouseReleaseEvent(event)
+
+    def get_grid_brush(self):
+        key = (self.grid_size, self.devicePixelRatioF())
+        if self.grid_brush_key != key:
+            self.grid_brush = QBrush(self.render_grid_tile(*key))
+            self.grid_brush_key = key
+        return self.grid_brush
+
+    def render_grid_tile(self, grid_size, ratio):
+        # The tile spans whole grid cells and whole periods of the dot pattern,
+        # so repeating it from the canvas origin reproduces the full-canvas grid.
+        tile = lcm(grid_size, 3)
+        tile *= -(-64 // tile)
+        pixmap = QPixmap(round(tile * ratio), round(tile * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        pen = QPen(QColor(200, 200, 200), 1, Qt.PenStyle.DotLine)
+        painter.setPen(pen)
+        for offset in range(0, tile, grid_size):
+            painter.drawLine(offset, 0, offset, tile)
+            painter.drawLine(0, offset, tile, offset)
+        painter.end()
+        return pixmap
+
     def update_grid(self, grid_enabled, grid_size):
         self.grid_enabled = grid_enabled
         self.grid_size = grid_size
+        self.grid_brush = None
+        self.grid_brush_key = None
         self.update()
 
+    def guide_label(self, guide):
+        # The text shows the X or Y coordinate of the line
+        x1, y1, x2, y2 = guide
+        if x1 == x2:  # Vertical guide
+            return x1 + 5, 20, f"x: {x1}"
+        return 20, y1 - 5, f"y: {y1}"  # Horizontal guide
+
+    def guide_region(self, guide):
+        """Area a guide and its coordinate label cover when painted: the line's strip plus the label's box."""
+        x1, y1, x2, y2 = guide
+        line = QRect(min(x1, x2) - 1, min(y1, y2) - 1, abs(x2 - x1) + 3, abs(y2 - y1) + 3)
+        x, y, text = self.guide_label(guide)
+        label = self.fontMetrics().boundingRect(text).translated(x, y).adjusted(-2, -2, 2, 2)
+        return QRegion(line) + QRegion(label)
+
     def update_alignment_guides(self, guides):
+        guides = [tuple(map(int, guide)) for guide in guides]
+        old, new = set(self.alignment_guides), set(guides)
         self.alignment_guides = guides
-        self.update()
\ No newline at end of file
+        if old == new:
+            return
+        dirty = QRegion()
+        for guide in old ^ new:
+            dirty += self.guide_region(guide)
+        self.update(dirty)
+
+    def set_metrics_overlay(self, visible):
+        if self.metrics_overlay is None:
+            if not visible:
+                return
+            self.metrics_overlay = MetricsOverlay(self)
+        self.metrics_overlay.set_active(visible)
+
+
+class MetricsOverlay(QWidget):
+    """HUD listing the instrumented timers and counters, kept above the canvas elements."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setFont(QFont("monospace", 9))
+        self.lines = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+
+    def set_active(self, active):
+        self.setVisible(active)
+        if active:
+            self.refresh()
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        lines = ["timer                    p50     p95     p99 ms      calls"]
+        for name, stats in snapshot["timers"].items():
+            lines.append(f"{name:<22} {stats['p50_ms']:7.2f} {stats['p95_ms']:7.2f} {stats['p99_ms']:7.2f} {stats['count']:10d}")
+        lines.extend(f"{name:<22} {value:34d}" for name, value in snapshot["counters"].items())
+        self.lines = lines
+        metrics_box = self.fontMetrics()
+        self.setGeometry(8, 8, max(metrics_box.horizontalAdvance(line) for line in lines) + 16,
+                         metrics_box.lineSpacing() * len(lines) + 12)
+        self.raise_()  # Elements added since the last refresh are stacked above it
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 170))
+        painter.setPen(QColor(255, 255, 255))
+        spacing = self.fontMetrics().lineSpacing()
+        for i, line in enumerate(self.lines):
+            painter.drawText(8, 6 + self.fontMetrics().ascent() + i * spacing, line)
+        painter.end()
@@ -0,0 +1,293 @@
+"""Statement-per-widget Python code generation through a small IR.
+
+``lower`` turns a Document into a ModuleIR, the passes in ``PASSES``
+rewrite it, and ``emit`` prints it. Without the passes every widget gets
+its own setStyleSheet call and combobox items are listed inline.
+"""
+import keyword
+import re
+from collections import Counter
+
+from document import grid_cells
+from ui_import import TYPE_CLASSES, LAYOUT_CLASSES
+
+STYLE_PROPERTY = "genStyle"  # Dynamic property that selects a shared style rule
+
+
+class WidgetNode:
+    __slots__ = ("key", "label", "name", "cls", "widget_type", "text", "geometry", "style", "items", "comments",
+                 "cell", "shared_style", "style_class", "items_constant")
+
+    def __init__(self, key, label, cls, widget_type, text, geometry, style, items, comments):
+        self.key = key  # Everything the node was lowered from, for fragment caching
+        self.label = label  # Requested name; ``name`` is the identifier assigned to it
+        self.name = None
+        self.cls = cls
+        self.widget_type = widget_type
+        self.text = text
+        self.geometry = geometry  # (x, y, width, height), or None inside a layout
+        self.style = style  # ((declaration, value), ...)
+        self.items = items  # Combobox items
+        self.comments = comments
+        self.cell = None  # (row, column) in a grid layout, set by ``lower``
+        # Set by the passes; the defaults emit an inline stylesheet and inline items
+        self.shared_style = False
+        self.style_class = None  # Index into ModuleIR.style_classes
+        self.items_constant = None
+
+
+class ModuleIR:
+    def __init__(self):
+        self.layouts = []  # (layout id, layout class, [WidgetNode])
+        self.widgets = []  # Absolutely positioned WidgetNodes
+        self.constants = {}  # Constant name -> tuple of combobox items
+        self.base_style = {}  # Declarations shared by every styled widget
+        self.style_classes = []  # Per-class declarations that differ from base_style
+
+    def nodes(self):
+        for _, _, members in self.layouts:
+            yield from members
+        yield from self.widgets
+
+
+def identifier(name, used):
+    """A unique Python identifier derived from an element name."""
+    if name not in used and name.isidentifier() and not keyword.iskeyword(name):
+        used.add(name)
+        return name
+    name = re.sub(r"\W", "_", name) or "widget"
+    if name[0].isdigit() or keyword.iskeyword(name):
+        name = f"w_{name}"
+    candidate, i = name, 2
+    while candidate in used:
+        candidate = f"{name}_{i}"
+        i += 1
+    used.add(candidate)
+    return candidate
+
+
+def record_key(record, positioned):
+    custom = tuple((k, repr(v)) for k, v in record.custom_properties.items()) if record.custom_properties else ()
+    return (record.id, record.type, record.name, record.text, record.color, record.font_size, custom,
+            (record.x, record.y, record.width, record.height) if positioned else None)
+
+
+def lower_record(record, positioned, key=None):
+    style = []
+    if record.color:
+        style.append(("background-color", record.color))
+    if record.font_size:
+        style.append(("font-size", f"{record.font_size}px"))
+    items = tuple(record.text.split(",")) if record.type == "combobox" and record.text else ()
+    return WidgetNode(
+        key or record_key(record, positioned), record.name or f"{record.type}_{record.id}",
+        TYPE_CLASSES.get(record.type, "QWidget"), record.type, record.text,
+        (record.x, record.y, record.width, record.height) if positioned else None,
+        tuple(style), items, [f"Custom property: {k} = {v}" for k, v in record.custom_properties.items()])
+
+
+def lower(document, lower_record=lower_record):
+    module = ModuleIR()
+    for layout in document.layouts():
+        cells = grid_cells(layout["widgets"]) if layout["type"] == "grid" else {}
+        members = []
+        for record in layout["widgets"]:
+            node = lower_record(record, False)
+            node.cell = cells.get(record.id)  # Depends on the other members, so never cached
+            members.append(node)
+        module.layouts.append((layout["id"], LAYOUT_CLASSES.get(layout["type"], "QVBoxLayout"), members))
+    for record in document:
+        if record.layout_id is None:
+            module.widgets.append(lower_record(record, True))
+    used = {"central_widget", "layout"}
+    for node in module.nodes():
+        node.name = identifier(node.label, used)
+    return module
+
+
+def dedupe_styles(module):
+    """Move inline styles into one window stylesheet.
+
+    A declaration every styled widget has goes into a base rule with its
+    most common value. Widgets that differ from the base share one rule per
+    distinct difference, selected by a dynamic property. Widgets matching
+    the base need no per-widget call at all.
+    """
+    nodes = list(module.nodes())
+    # Identical styles are handled once per (is container, style) group
+    groups = Counter((node.widget_type == "container", node.style) for node in nodes)
+    if not any(style for _, style in groups):
+        for node in nodes:
+            node.shared_style, node.style_class = False, None
+        return
+    # The base rule is keyed on widget classes, so it must suit every non-container widget
+    covered = [(dict(style), count) for (container, style), count in groups.items() if not container]
+    shared = set.intersection(*(set(style) for style, _ in covered)) if covered else set()
+    module.base_style = {}
+    for key in sorted(shared):
+        values = Counter()
+        for style, count in covered:
+            values[style[key]] += count
+        module.base_style[key] = values.most_common(1)[0][0]
+    classes, group_classes = {}, {}
+    for container, style in groups:
+        base = module.base_style if not container else {}
+        difference = tuple((k, v) for k, v in style if base.get(k) != v)
+        group_classes[container, style] = classes.setdefault(difference, len(classes)) if difference else None
+    for node in nodes:
+        node.style_class = group_classes[node.widget_type == "container", node.style]
+        node.shared_style = True
+    module.style_classes = [dict(difference) for difference in classes]
+
+
+def share_item_lists(module):
+    """Replace combobox item lists used more than once with module-level tuple constants."""
+    counts = Counter(node.items for node in module.nodes() if node.items)
+    names = {}
+    for items, count in counts.items():
+        if count > 1:
+            names[items] = f"ITEMS_{len(names)}"
+            module.constants[names[items]] = items
+    for node in module.nodes():
+        node.items_constant = names.get(node.items)
+
+
+PASSES = (dedupe_styles, share_item_lists)
+
+
+def optimize(module):
+    for run_pass in PASSES:
+        run_pass(module)
+    return module
+
+
+def declarations(style):
+    items = style.items() if isinstance(style, dict) else style
+    return "; ".join(f"{key}: {value}" for key, value in items) + ";"
+
+
+def widget_lines(node, parent):
+    code = [f"        {node.name} = {node.cls}({parent})"]
+    if node.widget_type == "combobox":
+        if node.items_constant:
+            code.append(f"        {node.name}.addItems({node.items_constant})")
+        elif node.items:
+            code.append(f"        {node.name}.addItems({list(node.items)!r})")
+    elif node.widget_type == "textedit":
+        if node.text:
+            code.append(f"        {node.name}.setPlainText({node.text!r})")
+    elif node.widget_type != "container" and node.text:
+        code.append(f"        {node.name}.setText({node.text!r})")
+    if node.geometry is not None:
+        code.append(f"        {node.name}.setGeometry({', '.join(map(str, node.geometry))})")
+    if node.style_class is not None:
+        code.append(f"        {node.name}.setProperty('{STYLE_PROPERTY}', {node.style_class})")
+    if node.style and not node.shared_style:
+        code.append(f"        {node.name}.setStyleSheet({declarations(node.style)!r})")
+    code.extend(f"        # {comment}" for comment in node.comments)
+    return code
+
+
+def fragment(node, layout_id=None):
+    """Source for one widget, including its addWidget call when it is in a layout."""
+    code = widget_lines(node, "central_widget")
+    if node.cell is not None:
+        code.append(f"        layout_{layout_id}.addWidget({node.name}, {node.cell[0]}, {node.cell[1]})")
+    elif layout_id is not None:
+        code.append(f"        layout_{layout_id}.addWidget({node.name})")
+    return "\n".join(code)
+
+
+def emit(module, fragment=fragment):
+    classes = sorted({node.cls for node in module.nodes()} | {"QWidget", "QVBoxLayout"}
+                     | {cls for _, cls, _ in module.layouts})
+    code = [f"from PyQt6.QtWidgets import QApplication, QMainWindow, {', '.join(classes)}", ""]
+    for name, items in module.constants.items():
+        code.append(f"{name} = {items!r}")
+    rules = []
+    if module.base_style:
+        editor_classes = sorted({node.cls for node in module.nodes() if node.widget_type != "container"})
+        rules.append(f"{', '.join(editor_classes)} {{ {declarations(module.base_style)} }}")
+    for index, style in enumerate(module.style_classes):
+        rules.append(f"*[{STYLE_PROPERTY}=\"{index}\"] {{ {declarations(style)} }}")
+    if rules:
+        code.append("STYLE_SHEET = '''")
+        code.extend(rules)
+        code.append("'''")
+    code.extend([
+        "",
+        "class GeneratedUI(QMainWindow):",
+        "    def __init__(self):",
+        "        super().__init__()",
+        "        self.setWindowTitle('Generated UI')",
+        "        self.setGeometry(100, 100, 800, 600)",
+    ])
+    if rules:
+        code.append("        self.setStyleSheet(STYLE_SHEET)")
+    code.extend([
+        "        central_widget = QWidget()",
+        "        self.setCentralWidget(central_widget)",
+        "        layout = QVBoxLayout(central_widget)",
+        "",
+    ])
+    for layout_id, layout_class, members in module.layouts:
+        code.append(f"        layout_{layout_id} = {layout_class}()")
+        code.extend(fragment(node, layout_id) for node in members)
+        code.append(f"        container_{layout_id} = QWidget(central_widget)")
+        code.append(f"        container_{layout_id}.setLayout(layout_{layout_id})")
+        code.append(f"        layout.addWidget(container_{layout_id})")
+    code.extend(fragment(node) for node in module.widgets)
+    code.extend([
+        "",
+        "if __name__ == '__main__':",
+        "    app = QApplication([])",
+        "    window = GeneratedUI()",
+        "    window.show()",
+        "    app.exec()",
+    ])
+    return "\n".join(code)
+
+
+class IncrementalGenerator:
+    """Regenerates optimized code for a changing document, reusing unchanged fragments.
+
+    Lowered nodes are cached per element and reused while the element's
+    content key is unchanged. Emitted fragments are cached on everything
+    that goes into them: the content key, the assigned identifier, the
+    layout, and the style class and item constant chosen by the passes.
+    The passes still see the whole module, so the output always equals
+    ``utils.build_code(document)``.
+    """
+
+    def __init__(self):
+        self.nodes = {}  # Element id -> WidgetNode
+        self.fragments = {}  # Element id -> (fragment key, source)
+        self.reused = 0
+        self.emitted = 0
+
+    def lower_record(self, record, positioned):
+        key = record_key(record, positioned)
+        node = self.nodes.get(record.id)
+        if node is None or node.key != key:
+            node = self.nodes[record.id] = lower_record(record, positioned, key)
+        return node
+
+    def fragment(self, node, layout_id=None):
+        element_id = node.key[0]
+        key = (node.key, node.name, layout_id, node.cell, node.shared_style, node.style_class, node.items_constant)
+        cached = self.fragments.get(element_id)
+        if cached is not None and cached[0] == key:
+            self.reused += 1
+            return cached[1]
+        self.emitted += 1
+        source = fragment(node, layout_id)
+        self.fragments[element_id] = (key, source)
+        return source
+
+    def build(self, document):
+        self.reused = self.emitted = 0
+        module = optimize(lower(document, self.lower_record))
+        for stale in self.nodes.keys() - document.elements.keys():
+            del self.nodes[stale]
+            self.fragments.pop(stale, None)
+        return emit(module, self.fragment)
@@ -0,0 +1,182 @@
+"""Headless batch conversion of projects, e.g.
+
+    python convert.py layouts/ --to py -o generated/ --jobs 8
+
+Converts JSON (or .guib) projects to Python code or .ui files, and .ui files
+to JSON, for single files or whole directory trees. Inputs whose content
+hash matches the last run are skipped. With --watch the inputs are then
+polled and rewritten as they change, regenerating Python incrementally.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+CONVERTER_VERSION = 1
+CACHE_FILE = ".convert-cache.json"
+# Target format -> (input extensions, output extension)
+TARGETS = {
+    "py": ((".json", ".guib"), ".py"),
+    "json": ((".ui",), ".json"),
+    "ui": ((".json", ".guib"), ".ui"),
+}
+
+
+def convert_file(source, destination, target, generator=None):
+    """Convert one file; runs in a worker process. Returns (seconds, error message or None).
+
+    ``generator`` is an IncrementalGenerator reused across calls for the same
+    file in watch mode.
+    """
+    from document import Document
+    from utils import read_json, build_code, build_ui
+    from ui_import import UiImporter
+    start = time.perf_counter()
+    try:
+        if target == "json":
+            output = json.dumps(Document.from_dict(UiImporter().parse(source)).to_dict(), indent=4)
+        else:
+            document = Document.from_dict(read_json(source))
+            if target == "ui":
+                output = build_ui(document)
+            else:
+                output = generator.build(document) if generator is not None else build_code(document)
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        temporary = destination + ".tmp"
+        try:
+            with open(temporary, "w") as f:
+                f.write(output)
+            os.replace(temporary, destination)  # Readers never see a half-written file
+        except BaseException:
+            try:
+                os.unlink(temporary)  # Don't leave a partial file in the output tree
+            except OSError:
+                pass
+            raise
+    except Exception as e:
+        return time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start, None
+
+
+def file_hash(file_name, target):
+    digest = hashlib.sha256(f"{CONVERTER_VERSION}:{target}:".encode())
+    with open(file_name, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_inputs(source, target):
+    """Yield (input path, path relative to the source root) for every convertible file."""
+    extensions = TARGETS[target][0]
+    if os.path.isfile(source):
+        yield source, os.path.basename(source)
+        return
+    for directory, subdirectories, files in os.walk(source):
+        subdirectories.sort()
+        for name in sorted(files):
+            if name.lower().endswith(extensions) and name != CACHE_FILE:
+                path = os.path.join(directory, name)
+                yield path, os.path.relpath(path, source)
+
+
+def load_cache(output_dir):
+    try:
+        with open(os.path.join(output_dir, CACHE_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(output_dir, cache):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, CACHE_FILE), "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+
+
+def run(source, target, output_dir=None, jobs=None, force=False):
+    """Convert everything under ``source``; returns the number of failed files."""
+    if output_dir is None:
+        output_dir = source if os.path.isdir(source) else os.path.dirname(source) or "."
+    cache = {} if force else load_cache(output_dir)
+    pending, skipped = [], 0
+    for path, relative in find_inputs(source, target):
+        destination = os.path.join(output_dir, os.path.splitext(relative)[0] + TARGETS[target][1])
+        key = f"{relative}:{target}"
+        digest = file_hash(path, target)
+        if cache.get(key) == digest and os.path.exists(destination):
+            skipped += 1
+            continue
+        pending.append((path, relative, destination, key, digest))
+    start = time.perf_counter()
+    failed = converted = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(convert_file, path, destination, target) for path, _, destination, _, _ in pending]
+            for (path, relative, destination, key, digest), future in zip(pending, futures):
+                seconds, error = future.result()
+                if error is None:
+                    converted += 1
+                    cache[key] = digest
+                    print(f"{relative} -> {os.path.relpath(destination, output_dir)} ({seconds * 1000:.1f} ms)")
+                else:
+                    failed += 1
+                    cache.pop(key, None)
+                    print(f"{relative}: FAILED ({error})", file=sys.stderr)
+    save_cache(output_dir, cache)
+    print(f"Converted {converted}, skipped {skipped} unchanged, failed {failed} "
+          f"in {time.perf_counter() - start:.2f} s")
+    return failed
+
+
+def watch(source, target, output_dir=None, interval=0.5):
+    """Poll the inputs and reconvert each one in-process whenever it changes, until interrupted."""
+    from codegen import IncrementalGenerator
+    if output_dir is None:
+        output_dir = source if os.path.isdir(source) else os.path.dirname(source) or "."
+    mtimes = {path: os.stat(path).st_mtime_ns for path, _ in find_inputs(source, target)}
+    generators = {}
+    print(f"Watching {len(mtimes)} files under {source}")
+    try:
+        while True:
+            time.sleep(interval)
+            for path, relative in find_inputs(source, target):
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue  # Removed or being replaced
+                if mtimes.get(path) == mtime:
+                    continue
+                mtimes[path] = mtime
+                destination = os.path.join(output_dir, os.path.splitext(relative)[0] + TARGETS[target][1])
+                generator = generators.setdefault(path, IncrementalGenerator()) if target == "py" else None
+                seconds, error = convert_file(path, destination, target, generator)
+                if error is None:
+                    print(f"{relative} changed -> {os.path.relpath(destination, output_dir)} ({seconds * 1000:.1f} ms)")
+                else:
+                    print(f"{relative}: FAILED ({error})", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert GUI editor projects without opening the editor.")
+    parser.add_argument("source", help="input file or directory tree")
+    parser.add_argument("--to", dest="target", choices=sorted(TARGETS), required=True,
+                        help="py: project -> Python code, json: .ui -> project, ui: project -> .ui")
+    parser.add_argument("-o", "--output", help="output directory (default: next to the inputs)")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="convert even if the input is unchanged")
+    parser.add_argument("--watch", action="store_true", help="keep running and reconvert inputs when they change")
+    args = parser.parse_args(argv)
+    failed = run(args.source, args.target, args.output, args.jobs, args.force)
+    if args.watch:
+        watch(args.source, args.target, args.output)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
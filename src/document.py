@@ -0,0 +1,176 @@
+from collections.abc import MutableMapping
+
+
+class ElementRecord:
+    """Compact, Qt-free state of one canvas element.
+
+    Geometry, text and style live here; DraggableWidget is only a view that
+    mirrors a record on the canvas. Keys other than the fixed fields (theme
+    values, a container's "layout" type, ...) are kept in ``extra``.
+    """
+
+    __slots__ = ("id", "type", "x", "y", "width", "height", "text", "name", "color",
+                 "font_size", "custom_properties", "group_id", "layout_id", "extra")
+
+    FIELDS = ("type", "x", "y", "width", "height", "text", "color", "font_size",
+              "custom_properties", "group_id", "layout_id", "name")
+    OPTIONAL = frozenset(("name", "group_id", "layout_id"))  # None means absent
+
+    def __init__(self, element_id, element_type, x=100, y=100, width=100, height=40, text="",
+                 name=None, color="", font_size=12, custom_properties=None, group_id=None,
+                 layout_id=None, extra=None):
+        self.id = element_id
+        self.type = element_type
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.text = text
+        self.name = name
+        self.color = color
+        self.font_size = font_size
+        self.custom_properties = custom_properties if custom_properties is not None else {}
+        self.group_id = group_id
+        self.layout_id = layout_id
+        self.extra = extra if extra is not None else {}
+
+    @classmethod
+    def from_properties(cls, element_id, element_type, properties):
+        record = cls(element_id, element_type)
+        for key, value in properties.items():
+            if key not in ("type", "id"):
+                record.set(key, value)
+        return record
+
+    def set(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def to_properties(self):
+        props = {key: getattr(self, key) for key in self.FIELDS}
+        props.update(self.extra)
+        return {k: v for k, v in props.items() if v is not None}
+
+
+class RecordProperties(MutableMapping):
+    """Dict-style view of an ElementRecord, used as ``DraggableWidget.properties``."""
+
+    __slots__ = ("record",)
+
+    def __init__(self, record):
+        self.record = record
+
+    def __getitem__(self, key):
+        record = self.record
+        if key in ElementRecord.FIELDS:
+            value = getattr(record, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return record.extra[key]
+
+    def __setitem__(self, key, value):
+        self.record.set(key, value)
+
+    def __delitem__(self, key):
+        if key in ElementRecord.OPTIONAL:
+            if getattr(self.record, key) is None:
+                raise KeyError(key)
+            setattr(self.record, key, None)
+        elif key in ElementRecord.FIELDS:
+            raise KeyError(f"{key} is a required element field")
+        else:
+            del self.record.extra[key]
+
+    def __contains__(self, key):
+        if key in ElementRecord.FIELDS:
+            return getattr(self.record, key) is not None
+        return key in self.record.extra
+
+    def __iter__(self):
+        return iter(self.record.to_properties())
+
+    def __len__(self):
+        return len(self.record.to_properties())
+
+
+def grid_cells(records):
+    """(row, column) of each grid layout member by element id, from the members' distinct y and x positions."""
+    rows = {y: i for i, y in enumerate(sorted({record.y for record in records}))}
+    columns = {x: i for i, x in enumerate(sorted({record.x for record in records}))}
+    return {record.id: (rows[record.y], columns[record.x]) for record in records}
+
+
+class Document:
+    """Ordered collection of element records plus their group and layout membership.
+
+    Membership is stored on the records themselves (``group_id`` and
+    ``layout_id``); a layout's container record carries the layout type in
+    ``extra["layout"]``. ``to_dict``/``from_dict`` convert to and from the
+    JSON project format, where groups and layouts reference element ids.
+    """
+
+    def __init__(self):
+        self.elements = {}  # id -> ElementRecord, in canvas order
+        self.next_id = 1
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements.values())
+
+    def get(self, element_id):
+        return self.elements.get(element_id)
+
+    def add_element(self, element_type, properties, element_id=None):
+        if element_id is None:
+            element_id = self.next_id
+        record = ElementRecord.from_properties(element_id, element_type, properties)
+        self.next_id = max(self.next_id, element_id + 1)
+        self.elements[record.id] = record
+        return record
+
+    def remove(self, element_id):
+        return self.elements.pop(element_id, None)
+
+    def clear(self):
+        self.elements.clear()
+
+    def groups(self):
+        groups = {}
+        for record in self.elements.values():
+            if record.group_id is not None:
+                groups.setdefault(record.group_id, []).append(record.id)
+        return [{"id": group_id, "widgets": members} for group_id, members in groups.items()]
+
+    def layouts(self):
+        types, members = {}, {}
+        for record in self.elements.values():
+            if record.layout_id is None:
+                continue
+            if record.type == "container":
+                types[record.layout_id] = record.extra.get("layout", "vertical")
+            else:
+                members.setdefault(record.layout_id, []).append(record)
+        return [{"id": layout_id, "type": types.get(layout_id, "vertical"), "widgets": records}
+                for layout_id, records in members.items()]
+
+    def to_dict(self):
+        return {
+            "widgets": [dict(record.to_properties(), id=record.id) for record in self.elements.values()],
+            "groups": self.groups(),
+            "layouts": [{"id": layout["id"], "type": layout["type"], "widgets": [r.id for r in layout["widgets"]]}
+                        for layout in self.layouts()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        document = cls()
+        for item in data.get("widgets", []):
+            record = ElementRecord.from_properties(item.get("id", document.next_id), item["type"], item)
+            document.elements[record.id] = record
+            document.next_id = max(document.next_id, record.id + 1)
+        return document
@@ -1,16 +1,24 @@
-from PyQt6.QtWidgets import QWidget, QPushButton, QLineEdit, QLabel, QCheckBox, QComboBox, QApplication, QTextEdit
-from PyQt6.QtCore import Qt, QPoint, QTimer, QSize
-from PyQt6.QtGui import QCursor
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPainter
+from element_renderer import create_inner_widget, set_inner_text, initial_text, get_renderer
+from document import ElementRecord, RecordProperties
+from styles import SELECTED_PROPERTY, element_style, repolish
+from logs import get_logger
+import metrics
+
+log = get_logger("canvas")
 
 class DraggableWidget(QWidget):
-    def __init__(self, widget_type="button", parent=None, text="", properties=None):
+    def __init__(self, widget_type="button", parent=None, text="", properties=None, lightweight=False, record=None):
         super().__init__(parent)
         self.widget_type = widget_type
         self.is_dragging = False
         self.is_resizing = False
         self.grid_size = 10
-        self.properties = properties or {}
-        self.custom_properties = self.properties.get("custom_properties", {})
+        # The record is the source of truth; properties is a dict-style view of it
+        self.record = record or ElementRecord.from_properties(None, widget_type, properties or {})
+        self.properties = RecordProperties(self.record)
         self.preview_mode = False
 
         # --- Attributes for global coordinate dragging ---
@@ -24,46 +32,115 @@ class DraggableWidget(QWidget):
         self.setAcceptDrops(True)
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
-        self.is_processing_move = False
-
-        if widget_type == "button":
-            self.widget = QPushButton(text or "Button", self)
-        elif widget_type == "field":
-            self.widget = QLineEdit(self)
-            self.widget.setPlaceholderText("Text Field")
-            if text:
-                self.widget.setText(text)
-        elif widget_type == "textedit":
-            self.widget = QTextEdit(self)
-            self.widget.setPlaceholderText("Multi-line text...")
-            if text:
-                self.widget.setText(text)
-        elif widget_type == "label":
-            self.widget = QLabel(text or "Label", self)
-        elif widget_type == "checkbox":
-            self.widget = QCheckBox(text or "CheckBox", self)
-        elif widget_type == "combobox":
-            self.widget = QComboBox(self)
-            self.widget.addItems(["Option 1", "Option 2"] if not text else text.split(","))
-        elif widget_type == "container":
-            self.widget = QWidget(self)
-            self.widget.setStyleSheet("border: 1px dashed gray;")
-
-        color = self.properties.get("color", "")
-        font_size = self.properties.get("font_size", 12)
-        style = f"background-color: {color}; font-size: {font_size}px;" if color else f"font-size: {font_size}px;"
-        self.widget.setStyleSheet(style)
-
-        self.widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-        self.widget.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.widget.setGeometry(0, 0, self.width(), self.height())
+
+        # Lightweight elements paint a cached pixmap and only own a live child
+        # widget while selected, hovered or in preview mode.
+        self.lightweight = lightweight and widget_type != "container"
+        self.pinned = False
+        self.selected = False
+        self.record.text = initial_text(widget_type, text)
+
+        self.style_sheet = element_style(self.record.color, self.record.font_size)
+
+        self.widget = None
+        if not self.lightweight:
+            self.make_live()
         self.setMinimumSize(50, 30)
-        self.setStyleSheet("")
 
-        self.move_timer = QTimer(self)
-        self.move_timer.setSingleShot(True)
-        self.move_timer.setInterval(16)  # ~60 FPS
-        self.move_timer.timeout.connect(self.process_move)
+        self.drag = None  # The canvas's DragScheduler while this element is dragged or resized
+
+    def make_live(self):
+        if self.widget is not None:
+            return
+        self.widget = create_inner_widget(self.widget_type, self.record.text, self)
+        self.widget.setStyleSheet(self.style_sheet)
+        self.widget.setProperty(SELECTED_PROPERTY, self.selected)
+        self.widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, not self.preview_mode)
+        self.widget.setFocusPolicy(Qt.FocusPolicy.StrongFocus if self.preview_mode else Qt.FocusPolicy.NoFocus)
+        self.widget.setGeometry(0, 0, self.width(), self.height())
+        self.widget.show()
+
+    def make_lightweight(self):
+        if self.widget is None or not self.lightweight:
+            return
+        self.widget.deleteLater()
+        self.widget = None
+        self.update()
+
+    def pin(self, pinned):
+        """Keep a lightweight element live while it is selected."""
+        self.pinned = pinned
+        if pinned:
+            self.make_live()
+        elif not self.underMouse() and not self.preview_mode and not self.is_dragging and not self.is_resizing:
+            self.make_lightweight()
+
+    def set_preview_mode(self, preview_mode):
+        self.preview_mode = preview_mode
+        if preview_mode:
+            self.make_live()
+        if self.widget is not None:
+            self.widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, not preview_mode)
+            self.widget.setFocusPolicy(Qt.FocusPolicy.StrongFocus if preview_mode else Qt.FocusPolicy.NoFocus)
+        self.setMouseTracking(not preview_mode)
+        if not preview_mode:
+            self.pin(self.pinned)
+
+    @property
+    def custom_properties(self):
+        return self.record.custom_properties
+
+    def get_text(self):
+        return self.record.text
+
+    def set_text(self, text):
+        self.record.text = text
+        if self.widget is not None:
+            set_inner_text(self.widget, self.widget_type, text)
+        else:
+            self.update()
+
+    def set_selected(self, selected):
+        self.selected = selected
+        self.pin(selected)
+        if self.widget is not None and self.widget.property(SELECTED_PROPERTY) != selected:
+            self.widget.setProperty(SELECTED_PROPERTY, selected)
+            repolish(self.widget)
+
+    def set_style(self, style):
+        """Record the element's stylesheet; returns True if the live child still has to be restyled."""
+        self.style_sheet = style
+        if self.widget is None:
+            self.update()
+            return False
+        return self.widget.styleSheet() != style
+
+    def flush_style(self):
+        if self.widget is not None and self.widget.styleSheet() != self.style_sheet:
+            self.widget.setStyleSheet(self.style_sheet)
+
+    def apply_style(self, style):
+        if self.set_style(style):
+            self.widget.setStyleSheet(style)
+
+    def paintEvent(self, event):
+        if self.widget is None:
+            painter = QPainter(self)
+            painter.drawPixmap(0, 0, get_renderer().pixmap(
+                self.widget_type, self.record.text, self.style_sheet,
+                self.width(), self.height(), self.devicePixelRatioF()
+            ))
+            painter.end()
+
+    def enterEvent(self, event):
+        if self.lightweight and not self.preview_mode:
+            self.make_live()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        if self.lightweight and not self.pinned and not self.preview_mode and not self.is_dragging and not self.is_resizing:
+            self.make_lightweight()
+        super().leaveEvent(event)
 
     def get_gui_editor_parent(self):
         parent = self.parentWidget()
@@ -71,6 +148,12 @@ class DraggableWidget(QWidget):
             parent = parent.parentWidget()
         return parent
 
+    def find_drag_scheduler(self):
+        parent = self.parentWidget()
+        while parent is not None and not hasattr(parent, "drag_scheduler"):
+            parent = parent.parentWidget()
+        return parent.drag_scheduler if parent is not None else None
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and not self.preview_mode:
             self.drag_start_global_pos = event.globalPosition().toPoint()
@@ -90,102 +173,116 @@ class DraggableWidget(QWidget):
 
             self.grabMouse()
             self.raise_()
-            parent = self.get_gui_editor_parent()
+            self.drag = self.find_drag_scheduler()
+            parent = self.drag.begin(self) if self.drag is not None else self.get_gui_editor_parent()
             if parent:
                 parent.handle_widget_selection(self, event)
+                moving = self.moving_widgets(parent) if self.is_dragging else [self]
+                parent.begin_snap_session(moving)
+                if self.is_dragging and self.drag is not None:
+                    self.drag.begin_proxy(self, moving)
             event.accept()
 
     def mouseMoveEvent(self, event):
         if (self.is_dragging or self.is_resizing) and not self.preview_mode:
-            if not self.move_timer.isActive() and not self.is_processing_move:
-                self.last_move_global_pos = event.globalPosition().toPoint()
-                self.move_timer.start()
+            metrics.count("drag.mouse_events")
+            if self.drag is not None:
+                self.drag.pointer_moved(event.globalPosition().toPoint())
             event.accept()
 
-    def process_move(self):
-        try:
-            self.is_processing_move = True
-            if self.last_move_global_pos is None:
-                return
+    @metrics.timed("drag.process_move")
+    def process_move(self, parent=None):
+        """Apply last_move_global_pos to the drag or resize in progress; ``parent`` is the editor."""
+        metrics.tick("drag.frame_interval")
+        if self.last_move_global_pos is None:
+            return
+        
+        current_global_pos = self.last_move_global_pos
+        parent = parent or self.get_gui_editor_parent()
+        if not parent or not self.isVisible():
+            return
+
+        if self.is_dragging and self.drag_start_widget_pos is not None:
+            delta = current_global_pos - self.drag_start_global_pos
+            new_pos = self.drag_start_widget_pos + delta
             
-            current_global_pos = self.last_move_global_pos
-            parent = self.get_gui_editor_parent()
-            if not parent or not self.isVisible():
-                return
-
-            if self.is_dragging and self.drag_start_widget_pos is not None:
-                delta = current_global_pos - self.drag_start_global_pos
-                new_pos = self.drag_start_widget_pos + delta
-                
-                snap_x, snap_y = new_pos.x(), new_pos.y()
-                if parent.grid_enabled and self.grid_size > 1:
-                    snap_x = round(snap_x / self.grid_size) * self.grid_size
-                    snap_y = round(snap_y / self.grid_size) * self.grid_size
-
-                guides = []
-                try:
-                    guides, snap_x, snap_y, _, _ = parent.calculate_alignment_guides(
-                        self, snap_x, snap_y, self.width(), self.height()
-                    )
-                except Exception as e:
-                    print(f"Error calculating alignment guides: {e}")
-                
-                parent.canvas.update_alignment_guides(guides)
-
-                final_delta_x = snap_x - self.x()
-                final_delta_y = snap_y - self.y()
-
-                if self in parent.selected_widgets or "group_id" in self.properties:
-                    moved_widgets = parent.selected_widgets
-                    if "group_id" in self.properties:
-                        group = next((g for g in parent.groups if g["id"] == self.properties["group_id"]), None)
-                        if group: moved_widgets = group["widgets"]
-                    
-                    for widget in moved_widgets:
-                        if "layout_id" not in widget.properties:
-                            widget.move(int(widget.x() + final_delta_x), int(widget.y() + final_delta_y))
-                else:
-                    self.move(int(snap_x), int(snap_y))
-
-            elif self.is_resizing and self.drag_start_size is not None:
-                delta = current_global_pos - self.drag_start_global_pos
-                new_width = self.drag_start_size.width() + delta.x()
-                new_height = self.drag_start_size.height() + delta.y()
-
-                new_width = max(self.minimumWidth(), new_width)
-                new_height = max(self.minimumHeight(), new_height)
-
-                if parent.grid_enabled and self.grid_size > 1:
-                    new_width = round(new_width / self.grid_size) * self.grid_size
-                    new_height = round(new_height / self.grid_size) * self.grid_size
-                
-                guides = []
-                try:
-                    guides, _, _, new_width, new_height = parent.calculate_alignment_guides(
-                        self, self.x(), self.y(), new_width, new_height, is_resizing=True
-                    )
-                except Exception as e:
-                    print(f"Error calculating alignment guides for resize: {e}")
-                
-                parent.canvas.update_alignment_guides(guides)
-
-                self.resize(int(new_width), int(new_height))
-
-        finally:
-            self.is_processing_move = False
+            snap_x, snap_y = new_pos.x(), new_pos.y()
+            if parent.grid_enabled and self.grid_size > 1:
+                snap_x = round(snap_x / self.grid_size) * self.grid_size
+                snap_y = round(snap_y / self.grid_size) * self.grid_size
+
+            guides = []
+            try:
+                guides, snap_x, snap_y, _, _ = parent.calculate_alignment_guides(
+                    self, snap_x, snap_y, self.width(), self.height()
+                )
+            except Exception:
+                log.exception("Error calculating alignment guides")
+            
+            parent.canvas.update_alignment_guides(guides)
+
+            final_delta_x = snap_x - self.x()
+            final_delta_y = snap_y - self.y()
+
+            proxy = self.drag.proxy if self.drag is not None else None
+            if proxy is not None:
+                self.place(snap_x, snap_y)
+                proxy.set_offset(self.x() - self.drag_start_widget_pos.x(), self.y() - self.drag_start_widget_pos.y())
+            elif self in parent.selected_widgets or "group_id" in self.properties:
+                for widget in self.moving_widgets(parent):
+                    if "layout_id" not in widget.properties:
+                        widget.place(widget.x() + final_delta_x, widget.y() + final_delta_y)
+            else:
+                self.place(snap_x, snap_y)
+
+        elif self.is_resizing and self.drag_start_size is not None:
+            delta = current_global_pos - self.drag_start_global_pos
+            new_width = self.drag_start_size.width() + delta.x()
+            new_height = self.drag_start_size.height() + delta.y()
+
+            new_width = max(self.minimumWidth(), new_width)
+            new_height = max(self.minimumHeight(), new_height)
+
+            if parent.grid_enabled and self.grid_size > 1:
+                new_width = round(new_width / self.grid_size) * self.grid_size
+                new_height = round(new_height / self.grid_size) * self.grid_size
+            
+            guides = []
+            try:
+                guides, _, _, new_width, new_height = parent.calculate_alignment_guides(
+                    self, self.x(), self.y(), new_width, new_height, is_resizing=True
+                )
+            except Exception:
+                log.exception("Error calculating alignment guides for resize")
+            
+            parent.canvas.update_alignment_guides(guides)
+
+            self.set_size(new_width, new_height)
+
+    def moving_widgets(self, parent):
+        if self not in parent.selected_widgets and "group_id" not in self.properties:
+            return [self]
+        if "group_id" in self.properties:
+            return parent.membership.group_members(self.record.group_id) or parent.selected_widgets
+        return parent.selected_widgets
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and not self.preview_mode:
+            drag, self.drag = self.drag, None
+            if drag is not None:
+                drag.finish()  # The final position is applied even if its frame hasn't come yet
             self.is_dragging = False
             self.is_resizing = False
             self.unsetCursor()
             self.releaseMouse()
-            
-            parent = self.get_gui_editor_parent()
+            metrics.end_ticks("drag.frame_interval")
+
+            parent = drag.editor if drag is not None else self.get_gui_editor_parent()
             if parent:
+                parent.end_snap_session()
                 parent.canvas.update_alignment_guides([])
                 parent.update_properties()
-                parent.add_to_history({"action": "modify", "widgets": [w.get_properties() for w in parent.selected_widgets]})
+                parent.add_to_history("modify", self.moving_widgets(parent))
             event.accept()
 
     def show_context_menu(self, pos):
@@ -194,32 +291,31 @@ class DraggableWidget(QWidget):
             if parent:
                 parent.show_widget_context_menu(self, self.mapToGlobal(pos))
 
+    def place(self, x, y):
+        """Move the element and write its position to the record right away.
+
+        Qt defers move and resize events while a widget is hidden, so the
+        events below are only a backstop for moves made elsewhere.
+        """
+        self.move(int(x), int(y))
+        self.record.x, self.record.y = self.x(), self.y()
+
+    def set_size(self, width, height):
+        """Resize the element and write its (clamped) size to the record right away."""
+        self.resize(int(width), int(height))
+        self.record.width, self.record.height = self.width(), self.height()
+
+    def moveEvent(self, event):
+        self.record.x = event.pos().x()
+        self.record.y = event.pos().y()
+        super().moveEvent(event)
+
     def resizeEvent(self, event):
-        self.widget.resize(self.size())
+        self.record.width = event.size().width()
+        self.record.height = event.size().height()
+        if self.widget is not None:
+            self.widget.resize(self.size())
         super().resizeEvent(event)
 
     def get_properties(self):
-        # Determine the correct way to get text based on widget type
-        text_value = ""
-        if self.widget_type in ["button", "field", "label", "checkbox"]:
-            text_value = self.widget.text()
-        elif self.widget_type == "textedit":
-            text_value = self.widget.toPlainText()
-        elif self.widget_type == "combobox":
-            text_value = ",".join([self.widget.itemText(i) for i in range(self.widget.count())])
-
-        props = {
-            "type": self.widget_type,
-            "x": self.x(),
-            "y": self.y(),
-            "width": self.width(),
-            "height": self.height(),
-            "text": text_value,
-            "color": self.properties.get("color", ""),
-            "font_size": self.properties.get("font_size", 12),
-            "custom_properties": self.custom_properties,
-            "group_id": self.properties.get("group_id"),
-            "layout_id": self.properties.get("layout_id")
-        }
-        props.update(self.properties)
-        return {k: v for k, v in props.items() if v is not None}
\ No newline at end of file
+        return self.record.to_properties()
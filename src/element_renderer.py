@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from PyQt6.QtWidgets import QWidget, QPushButton, QLineEdit, QLabel, QCheckBox, QComboBox, QTextEdit
+
+
+DEFAULT_TEXT = {"button": "Button", "label": "Label", "checkbox": "CheckBox", "combobox": "Option 1,Option 2"}
+
+
+def initial_text(widget_type, text=""):
+    return text or DEFAULT_TEXT.get(widget_type, "")
+
+
+def create_inner_widget(widget_type, text="", parent=None):
+    text = initial_text(widget_type, text)
+    if widget_type == "button":
+        widget = QPushButton(text, parent)
+    elif widget_type == "field":
+        widget = QLineEdit(parent)
+        widget.setPlaceholderText("Text Field")
+        widget.setText(text)
+    elif widget_type == "textedit":
+        widget = QTextEdit(parent)
+        widget.setPlaceholderText("Multi-line text...")
+        widget.setText(text)
+    elif widget_type == "label":
+        widget = QLabel(text, parent)
+    elif widget_type == "checkbox":
+        widget = QCheckBox(text, parent)
+    elif widget_type == "combobox":
+        widget = QComboBox(parent)
+        widget.addItems(text.split(","))
+    elif widget_type == "container":
+        widget = QWidget(parent)
+        widget.setStyleSheet("border: 1px dashed gray;")
+    return widget
+
+
+def set_inner_text(widget, widget_type, text):
+    if widget_type == "combobox":
+        widget.clear()
+        widget.addItems(text.split(",") if text else ["Option 1"])
+    elif widget_type != "container":
+        widget.setText(text)
+
+
+class ElementRenderer:
+    """Paints canvas elements from one hidden prototype widget per type.
+
+    Lightweight elements have no child widget of their own; they ask the
+    renderer for a pixmap keyed by everything that affects their look and
+    draw it. Pixmaps are kept in an LRU cache so identical elements share one
+    image and repaints of unchanged elements never touch a widget.
+    """
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.prototypes = {}
+        self.cache = OrderedDict()
+
+    def pixmap(self, widget_type, text, style, width, height, ratio):
+        key = (widget_type, text, style, width, height, ratio)
+        pixmap = self.cache.get(key)
+        if pixmap is not None:
+            self.cache.move_to_end(key)
+            return pixmap
+        prototype = self.prototypes.get(widget_type)
+        if prototype is None:
+            prototype = create_inner_widget(widget_type)
+            self.prototypes[widget_type] = prototype
+        set_inner_text(prototype, widget_type, text)
+        prototype.setStyleSheet(style)
+        prototype.resize(width, height)
+        pixmap = prototype.grab()
+        self.cache[key] = pixmap
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return pixmap
+
+    def clear(self):
+        self.cache.clear()
+
+
+renderer = None
+
+
+def get_renderer():
+    global renderer
+    if renderer is None:
+        renderer = ElementRenderer()
+    return renderer
@@ -1,29 +1,48 @@
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QDockWidget, QFormLayout, QSpinBox, 
-    QLabel, QToolBar, QFileDialog, QInputDialog, QStatusBar, QMenu, 
-    QLineEdit, QCheckBox, QPushButton, QComboBox, QColorDialog
+    QMainWindow, QWidget, QVBoxLayout, QDockWidget,
+    QToolBar, QFileDialog, QInputDialog, QStatusBar, QMenu,
+    QComboBox, QColorDialog
 )
 from PyQt6.QtGui import QAction, QColor
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+from contextlib import contextmanager
 from canvas_widget import CanvasWidget
 from draggable_widget import DraggableWidget
-from utils import save_json, load_json, load_ui, generate_code
+from snap_index import SnapIndex
+from membership import MembershipIndex
+from document import Document
+from history import History
+from project_loader import ProjectLoader
+from codegen import IncrementalGenerator
+from properties_panel import PropertiesPanel
+from styles import StyleQueue, element_style
+from logs import get_logger
+import metrics
+from utils import save_json, select_json_file, load_ui, generate_code
+
+log = get_logger("editor")
+selection_log = get_logger("selection")
+history_log = get_logger("history")
 
 class GUIEditor(QMainWindow):
-    def __init__(self):
+    def __init__(self, lightweight_elements=False):
         super().__init__()
         self.setWindowTitle("Advanced GUI Editor")
         self.setGeometry(100, 100, 800, 600)
-        self.history = []
-        self.history_index = -1
+        self.history = History()
+        self.transaction = None  # (key, widgets, status message) of the open property-edit burst
+        self.transaction_timer = QTimer(self)
+        self.transaction_timer.setSingleShot(True)
+        self.transaction_timer.setInterval(int(self.history.merge_window * 1000))
+        self.transaction_timer.timeout.connect(self.commit_transaction)
         self.grid_enabled = True
         self.grid_size = 10
-        self.property_widgets = {}
         self.clipboard = None
         self.selected_widgets = []
-        self.groups = []  # List of {"id": int, "widgets": [DraggableWidget]}
-        self.layouts = []  # List of {"id": int, "type": str, "widgets": [DraggableWidget]}
+        self.membership = MembershipIndex()  # Groups, layouts and their members, by id and by element
         self.preview_mode = False
+        self.lightweight_elements = lightweight_elements  # Paint idle elements from cached pixmaps
+        self.snap_index = None  # Active only while a widget is being dragged or resized
         self.themes = {
             "Dark": {"background-color": "#333", "color": "#fff", "font-size": "14px"},
             "Light": {"background-color": "#fff", "color": "#000", "font-size": "12px"}
@@ -42,6 +61,7 @@ class GUIEditor(QMainWindow):
         # Canvas
         self.canvas = CanvasWidget(self.central_widget)
         self.central_layout.addWidget(self.canvas)
+        self.style_queue = StyleQueue(self.canvas)  # Restyles elements changed inside a batch
 
         # Toolbar
         self.toolbar = QToolBar("Tools")
@@ -66,6 +86,9 @@ class GUIEditor(QMainWindow):
         self.apply_h_layout_action = QAction("Apply Horizontal Layout", self)
         self.preview_action = QAction("Toggle Preview", self)
         self.apply_theme_action = QAction("Apply Theme", self)
+        self.metrics_action = QAction("Performance HUD", self)
+        self.metrics_action.setCheckable(True)
+        self.export_metrics_action = QAction("Export Metrics", self)
         
         self.toolbar.addAction(self.add_button_action)
         self.toolbar.addAction(self.add_field_action)
@@ -91,6 +114,9 @@ class GUIEditor(QMainWindow):
         self.toolbar.addAction(self.load_json_action)
         self.toolbar.addAction(self.load_ui_action)
         self.toolbar.addAction(self.generate_code_action)
+        self.toolbar.addSeparator()
+        self.toolbar.addAction(self.metrics_action)
+        self.toolbar.addAction(self.export_metrics_action)
 
         # Connect toolbar actions
         self.add_button_action.triggered.connect(lambda: self.add_widget("button"))
@@ -113,17 +139,27 @@ class GUIEditor(QMainWindow):
         self.load_ui_action.triggered.connect(self.load_ui)
         self.generate_code_action.triggered.connect(self.generate_code)
         self.apply_theme_action.triggered.connect(self.apply_theme)
+        self.metrics_action.toggled.connect(self.show_metrics)
+        self.export_metrics_action.triggered.connect(self.export_metrics)
 
-        # Widgets list
+        # Widgets list; each widget is a view over its record in self.document
+        self.document = Document()
         self.widgets = []
+        self.widgets_by_id = {}  # Element id -> DraggableWidget
+        self.loader = None  # ProjectLoader of a load in progress
+        self.code_generator = IncrementalGenerator()  # Reuses unchanged fragments across Generate Code
+        self.batch_depth = 0
+        self.replaying = False
+        self.batch_widgets = {}  # Element id -> widget touched inside the open batch
+        self.batch_removed = set()
+        self.properties_dirty = False
         self.add_initial_widgets()
 
         # Properties dock
         self.properties_dock = QDockWidget("Properties", self)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.properties_dock)
-        self.properties_widget = QWidget()
-        self.properties_layout = QFormLayout(self.properties_widget)
-        self.properties_dock.setWidget(self.properties_widget)
+        self.properties_panel = PropertiesPanel(self)
+        self.properties_dock.setWidget(self.properties_panel)
 
         self.update_properties()
 
@@ -153,46 +189,99 @@ class GUIEditor(QMainWindow):
             }
             widget = self.add_widget_to_canvas(widget_type, properties)
             self.select_widget(widget, clear_others=True)
-            self.add_to_history({"action": "add", "widgets": [widget.get_properties()]})
-            print(f"Added {widget_type} with color {color_hex}, font size {font_size}")
-
-    def add_widget_to_canvas(self, widget_type, properties):
-        widget = DraggableWidget(widget_type, self.canvas, properties.get("text", ""), properties)
+            self.add_to_history("add", [widget])
+            log.info("Added %s with color %s, font size %s", widget_type, color_hex, font_size)
+
+    def add_widget_to_canvas(self, widget_type, properties, element_id=None):
+        if element_id in self.widgets_by_id:
+            element_id = None  # Duplicate id in the source data; allocate a fresh one
+        record = self.document.add_element(widget_type, properties, element_id)
+        widget = DraggableWidget(widget_type, self.canvas, properties.get("text", ""), lightweight=self.lightweight_elements, record=record)
         widget.grid_size = self.grid_size if self.grid_enabled else 1
-        widget.preview_mode = self.preview_mode
-        widget.move(properties.get("x", 100), properties.get("y", 100))
-        widget.resize(properties.get("width", 100), properties.get("height", 40))
+        if self.preview_mode:
+            widget.set_preview_mode(True)
+        widget.move(record.x, record.y)
+        widget.resize(record.width, record.height)
         widget.show()
-        self.widgets.append(widget)
+        self.register_widget(widget)
+        if not self.batch_depth:
+            # Inside a batch, untracked elements are recorded as created when it ends
+            self.history.track(record.id, record.to_properties())
         return widget
 
     def delete_widget(self, widget=None):
         targets = [widget] if widget else self.selected_widgets.copy()
         if targets:
-            action = {"action": "delete", "widgets": [w.get_properties() for w in targets]}
-            for target in targets:
-                self.widgets.remove(target)
-                for group in self.groups:
-                    if target in group["widgets"]:
-                        group["widgets"].remove(target)
-                for layout in self.layouts:
-                    if target in layout["widgets"]:
-                        layout["widgets"].remove(target)
-                target.deleteLater()
-                if target in self.selected_widgets:
-                    self.selected_widgets.remove(target)
-            self.groups = [g for g in self.groups if g["widgets"]]  # Remove empty groups
-            self.layouts = [l for l in self.layouts if l["widgets"]]  # Remove empty layouts
-            self.update_properties()
-            self.add_to_history(action)
-            print(f"Deleted {len(targets)} widget(s)")
+            with self.batch_update("delete"):
+                for target in targets:
+                    self.remove_widget_from_canvas(target)
+                self.add_to_history("delete", targets)
+            log.info("Deleted %d widget(s)", len(targets))
             self.status_bar.showMessage(f"Deleted {len(targets)} widget(s)")
 
+    def register_widget(self, widget):
+        self.widgets.append(widget)
+        self.widgets_by_id[widget.record.id] = widget
+        self.membership.add(widget)
+
+    def remove_widget_from_canvas(self, target):
+        del self.widgets_by_id[target.record.id]
+        self.membership.remove(target)
+        if self.snap_index is not None:
+            self.snap_index.remove(target)
+        self.document.remove(target.record.id)
+        self.style_queue.discard(target)
+        self.canvas.drag_scheduler.forget(target)
+        target.deleteLater()
+        if self.batch_depth:
+            self.batch_removed.add(target)  # List cleanup happens once when the batch ends
+            return
+        self.widgets.remove(target)
+        if target in self.selected_widgets:
+            self.selected_widgets.remove(target)
+
+    @contextmanager
+    def batch_update(self, action=None):
+        """Group many canvas mutations into one step.
+
+        While a batch is open, property-panel refreshes are deferred, restyles
+        are queued, removals skip per-widget list scans, and every
+        add_to_history call is folded into a single entry recorded under
+        ``action`` when the outermost batch ends. With action=None no entry is
+        recorded and the caller is expected to reset the history. Repaints
+        need no suspending: a batch runs within one event-loop turn, and
+        toggling setUpdatesEnabled visits every element on the canvas.
+        """
+        if self.batch_depth == 0:
+            self.commit_transaction()
+            self.batch_widgets = {}
+            self.batch_removed = set()
+            self.properties_dirty = False
+        self.batch_depth += 1
+        try:
+            yield
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                self.end_batch(action)
+
+    def end_batch(self, action):
+        removed, self.batch_removed = self.batch_removed, set()
+        if removed:
+            self.widgets = [w for w in self.widgets if w not in removed]
+            self.selected_widgets = [w for w in self.selected_widgets if w not in removed]
+        widgets, self.batch_widgets = self.batch_widgets, {}
+        if action and widgets:
+            self.add_to_history(action, widgets.values())
+        if self.properties_dirty:
+            self.properties_dirty = False
+            self.update_properties()
+
     def cut_widget(self, widget):
         if widget:
             self.clipboard = widget.get_properties()
             self.delete_widget(widget)
-            print(f"Cut {widget.widget_type}")
+            log.info("Cut %s", widget.widget_type)
             self.status_bar.showMessage(f"Cut {widget.widget_type}")
 
     def paste_widget(self):
@@ -200,99 +289,107 @@ class GUIEditor(QMainWindow):
             properties = self.clipboard.copy()
             properties["x"] = properties.get("x", 100) + 20
             properties["y"] = properties.get("y", 100) + 20
-            widget = self.add_widget_to_canvas(properties["type"], properties)
-            self.select_widget(widget, clear_others=True)
-            self.add_to_history({"action": "add", "widgets": [widget.get_properties()]})
-            print(f"Pasted {widget.widget_type}")
+            with self.batch_update("add"):
+                widget = self.add_widget_to_canvas(properties["type"], properties)
+                self.select_widget(widget, clear_others=True)
+                self.add_to_history("add", [widget])
+            log.info("Pasted %s", widget.widget_type)
             self.status_bar.showMessage(f"Pasted {widget.widget_type}")
 
     def group_widgets(self):
         if len(self.selected_widgets) > 1:
-            group_id = len(self.groups) + 1
-            group = {"id": group_id, "widgets": self.selected_widgets.copy()}
-            self.groups.append(group)
+            group_id = self.membership.new_group_id()
             for widget in self.selected_widgets:
                 widget.properties["group_id"] = group_id
-            self.add_to_history({"action": "group", "group": group})
+                self.membership.update(widget)
+            self.add_to_history("group", self.selected_widgets)
             self.status_bar.showMessage(f"Grouped {len(self.selected_widgets)} widgets")
-            print(f"Grouped {len(self.selected_widgets)} widgets")
+            log.info("Grouped %d widgets", len(self.selected_widgets))
 
     def ungroup_widgets(self):
         if self.selected_widgets:
             group_ids = set(widget.properties.get("group_id") for widget in self.selected_widgets if "group_id" in widget.properties)
             for group_id in group_ids:
-                group = next((g for g in self.groups if g["id"] == group_id), None)
-                if group:
-                    self.groups.remove(group)
-                    for widget in group["widgets"]:
+                members = self.membership.dissolve_group(group_id)
+                if members:
+                    for widget in members:
                         widget.properties.pop("group_id", None)
-                    self.add_to_history({"action": "ungroup", "group_id": group_id})
+                    self.add_to_history("ungroup", members)
             self.status_bar.showMessage(f"Ungrouped widgets")
-            print(f"Ungrouped widgets")
+            log.info("Ungrouped widgets")
 
     def apply_vertical_layout(self):
         if len(self.selected_widgets) > 1:
-            layout_id = len(self.layouts) + 1
-            container = DraggableWidget("container", self.canvas, properties={"layout": "vertical", "layout_id": layout_id})
-            container.resize(200, 50 * len(self.selected_widgets))
-            self.widgets.append(container)
+            layout_id = self.membership.new_layout_id()
+            record = self.document.add_element("container", {"layout": "vertical", "layout_id": layout_id, "width": 200, "height": 50 * len(self.selected_widgets)})
+            container = DraggableWidget("container", self.canvas, record=record)
+            container.resize(record.width, record.height)
+            container.show()
+            self.register_widget(container)
             for widget in self.selected_widgets:
                 widget.properties["layout_id"] = layout_id
+                self.membership.update(widget)
                 widget.setParent(container)
-            self.layouts.append({"id": layout_id, "type": "vertical", "widgets": self.selected_widgets.copy()})
-            self.add_to_history({"action": "layout", "layout": self.layouts[-1]})
+                widget.show()
+            self.add_to_history("layout", [container] + self.selected_widgets)
             self.status_bar.showMessage("Applied vertical layout")
-            print("Applied vertical layout")
+            log.info("Applied vertical layout")
 
     def apply_horizontal_layout(self):
         if len(self.selected_widgets) > 1:
-            layout_id = len(self.layouts) + 1
-            container = DraggableWidget("container", self.canvas, properties={"layout": "horizontal", "layout_id": layout_id})
-            container.resize(50 * len(self.selected_widgets), 200)
-            self.widgets.append(container)
+            layout_id = self.membership.new_layout_id()
+            record = self.document.add_element("container", {"layout": "horizontal", "layout_id": layout_id, "width": 50 * len(self.selected_widgets), "height": 200})
+            container = DraggableWidget("container", self.canvas, record=record)
+            container.resize(record.width, record.height)
+            container.show()
+            self.register_widget(container)
             for widget in self.selected_widgets:
                 widget.properties["layout_id"] = layout_id
+                self.membership.update(widget)
                 widget.setParent(container)
-            self.layouts.append({"id": layout_id, "type": "horizontal", "widgets": self.selected_widgets.copy()})
-            self.add_to_history({"action": "layout", "layout": self.layouts[-1]})
+                widget.show()
+            self.add_to_history("layout", [container] + self.selected_widgets)
             self.status_bar.showMessage("Applied horizontal layout")
-            print("Applied horizontal layout")
+            log.info("Applied horizontal layout")
 
     def toggle_preview(self):
         self.preview_mode = not self.preview_mode
         for widget in self.widgets:
-            widget.preview_mode = self.preview_mode
-            widget.widget.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, not self.preview_mode)
-            widget.widget.setFocusPolicy(Qt.FocusPolicy.StrongFocus if self.preview_mode else Qt.FocusPolicy.NoFocus)
-            widget.setMouseTracking(not self.preview_mode)
+            widget.set_preview_mode(self.preview_mode)
         self.toolbar.setEnabled(not self.preview_mode)
         self.properties_dock.setEnabled(not self.preview_mode)
         self.status_bar.showMessage("Preview Mode" if self.preview_mode else "Edit Mode")
-        print(f"Toggled to {'Preview' if self.preview_mode else 'Edit'} Mode")
+        log.info("Toggled to %s Mode", "Preview" if self.preview_mode else "Edit")
 
     def apply_theme(self):
         theme, ok = QInputDialog.getItem(self, "Select Theme", "Choose a theme:", self.themes.keys(), 0, False)
         if ok:
-            for widget in self.selected_widgets or self.widgets:
-                widget.properties.update(self.themes[theme])
-                self.update_widget_stylesheet(widget, widget in self.selected_widgets)
-            self.add_to_history({"action": "modify", "widgets": [w.get_properties() for w in self.selected_widgets or self.widgets]})
+            targets = self.selected_widgets or self.widgets
+            selected = set(self.selected_widgets)
+            with self.batch_update("modify"):
+                for widget in targets:
+                    widget.properties.update(self.themes[theme])
+                    self.update_widget_stylesheet(widget, widget in selected)  # Queued until the batch ends
+                self.add_to_history("modify", targets)
             self.status_bar.showMessage(f"Applied {theme} theme")
-            print(f"Applied {theme} theme")
+            log.info("Applied %s theme", theme)
 
     def update_widget_stylesheet(self, widget, is_selected):
-        color = widget.properties.get("color", "")
-        font_size = widget.properties.get("font_size", 12)
-        style = f"background-color: {color}; font-size: {font_size}px;" if color else f"font-size: {font_size}px;"
-        if is_selected:
-            style += " border: 2px solid blue;"
-        widget.widget.setStyleSheet(style)
-        widget.setStyleSheet("")
-        print(f"Updated stylesheet for {widget.widget_type}, selected: {is_selected}, style: {style}")
+        """Show the selection through a dynamic property and restyle the element if its colors changed.
+
+        Inside a batch or an undo/redo the restyle is left to the style queue.
+        """
+        widget.set_selected(is_selected)
+        style = element_style(widget.record.color, widget.record.font_size or 12)
+        if self.batch_depth or self.replaying:
+            if widget.set_style(style):
+                self.style_queue.add(widget)
+        else:
+            widget.apply_style(style)
 
     def edit_widget(self, widget):
         if widget:
-            text, ok1 = QInputDialog.getText(self, f"Edit {widget.widget_type.capitalize()}", "Enter text:", text=widget.widget.text() if widget.widget_type != "combobox" else ",".join([widget.widget.itemText(i) for i in range(widget.widget.count())]))
+            text, ok1 = QInputDialog.getText(self, f"Edit {widget.widget_type.capitalize()}", "Enter text:", text=widget.get_text())
             name, ok2 = QInputDialog.getText(self, f"Edit {widget.widget_type.capitalize()}", "Enter name:", text=widget.properties.get("name", ""))
             color = QColorDialog.getColor(title=f"Select Color for {widget.widget_type.capitalize()}")
             color_hex = color.name() if color.isValid() else widget.properties.get("color", "")
@@ -307,7 +404,7 @@ class GUIEditor(QMainWindow):
                 if color.isValid():
                     self.update_widget_property(widget, "color", color_hex)
                 self.update_widget_stylesheet(widget, widget in self.selected_widgets)
-                print(f"Edited {widget.widget_type}, selected: {widget in self.selected_widgets}")
+                log.info("Edited %s, selected: %s", widget.widget_type, widget in self.selected_widgets)
                 self.status_bar.showMessage(f"Edited {widget.widget_type}")
 
     def edit_custom_properties(self, widget):
@@ -315,9 +412,9 @@ class GUIEditor(QMainWindow):
         value, ok2 = QInputDialog.getText(self, "Custom Property", "Enter property value:")
         if ok1 and ok2:
             widget.custom_properties[key] = value
-            self.add_to_history({"action": "modify", "widgets": [widget.get_properties()]})
+            self.add_to_history("modify", [widget])
             self.status_bar.showMessage(f"Added custom property {key}: {value}")
-            print(f"Added custom property {key}: {value}")
+            log.info("Added custom property %s: %s", key, value)
 
     def show_widget_context_menu(self, widget, global_pos):
         menu = QMenu(self)
@@ -347,36 +444,43 @@ class GUIEditor(QMainWindow):
         menu.exec(global_pos)
 
     def save_json(self):
-        save_json(self.widgets, self.groups, self.layouts, self)
+        save_json(self.document, self)
 
     def load_json(self):
-        data = load_json(self)
-        if data:
-            self.clear_canvas()
-            for item in data["widgets"]:
-                self.add_widget_to_canvas(item["type"], item)
-            self.groups = data.get("groups", [])
-            self.layouts = data.get("layouts", [])
-            self.add_to_history({"action": "load_json", "data": data})
-            self.status_bar.showMessage("Loaded JSON layout")
-            print("Loaded JSON layout")
+        file_name = select_json_file(self)
+        if file_name:
+            self.load_json_file(file_name)
+
+    def load_json_file(self, file_name):
+        """Start loading a project in the background; returns the ProjectLoader."""
+        if self.loader is not None:
+            self.loader.cancel()
+        loader = self.loader = ProjectLoader(self, file_name)
+        loader.finished.connect(self.on_load_finished)
+        loader.start()  # A file that can't be opened finishes the load right away
+        return loader
+
+    def on_load_finished(self, completed):
+        self.loader = None
 
     def load_ui(self):
-        ui_data = load_ui(self)
-        if ui_data:
+        project = load_ui(self)
+        if project:
             self.clear_canvas()
-            for widget_type, properties in ui_data:
-                self.add_widget_to_canvas(widget_type, properties)
-            self.add_to_history({"action": "load_ui", "layout": ui_data})
+            with self.batch_update():
+                for item in project["widgets"]:
+                    self.add_widget_to_canvas(item["type"], item, item["id"])
+            self.resolve_membership(project)
+            self.reset_history()
 
     def generate_code(self):
-        generate_code(self.widgets, self.layouts, self)
+        generate_code(self.document, self, self.code_generator)
 
     def clear_canvas(self):
-        for widget in self.widgets[:]:
-            self.delete_widget(widget)
-        self.groups.clear()
-        self.layouts.clear()
+        with self.batch_update("delete"):
+            for widget in self.widgets[:]:
+                self.remove_widget_from_canvas(widget)
+            self.add_to_history("delete", self.widgets)
 
     def select_widget(self, widget, event=None, clear_others=True):
         if self.preview_mode:
@@ -389,7 +493,34 @@ class GUIEditor(QMainWindow):
             self.selected_widgets.append(widget)
             self.update_widget_stylesheet(widget, True)
         self.update_properties()
-        print(f"Selected {len(self.selected_widgets)} widget(s)")
+        selection_log.debug("Selected %d widget(s)", len(self.selected_widgets))
+
+    def select_widgets(self, widgets, mode="replace"):
+        """Replace the selection with ``widgets``, add them to it, or toggle them ("replace", "add", "toggle").
+
+        Only elements whose selected state flips are restyled, and the
+        properties dock is refreshed once.
+        """
+        if self.preview_mode:
+            return
+        current = set(self.selected_widgets)
+        if mode == "add":
+            chosen = current | set(widgets)
+        elif mode == "toggle":
+            chosen = current ^ set(widgets)
+        else:
+            chosen = set(widgets)
+        with self.batch_update():
+            for widget in current ^ chosen:
+                self.update_widget_stylesheet(widget, widget in chosen)
+            # Keep the existing selection order (layouts are built in it); new elements follow in canvas order
+            new = chosen - current
+            self.selected_widgets = [w for w in self.selected_widgets if w in chosen]
+            if new:
+                self.selected_widgets.extend(w for w in self.widgets if w in new)
+            self.update_properties()
+        self.status_bar.showMessage(f"Selected {len(self.selected_widgets)} widget(s)")
+        selection_log.debug("Selected %d widget(s)", len(self.selected_widgets))
 
     def handle_widget_selection(self, widget, event):
         if self.preview_mode:
@@ -404,157 +535,185 @@ class GUIEditor(QMainWindow):
                 self.update_widget_stylesheet(widget, True)
         else:
             self.select_widget(widget)
-        print(f"Handled selection, {len(self.selected_widgets)} widgets selected")
+        selection_log.debug("Handled selection, %d widgets selected", len(self.selected_widgets))
+
+    def begin_snap_session(self, moving_widgets):
+        # Index every stationary widget once per drag; frames then only query it
+        self.snap_index = SnapIndex.build(self.widgets, exclude=moving_widgets)
 
+    def end_snap_session(self):
+        self.snap_index = None
+
+    @metrics.timed("alignment.guides")
     def calculate_alignment_guides(self, widget, x, y, width, height, is_resizing=False):
+        index = self.snap_index
+        if index is None:  # No drag session: a linear scan beats indexing every widget for one query
+            index = SnapIndex.around(self.widgets, widget, x, y, width, height)
+        canvas_width, canvas_height = self.canvas.width(), self.canvas.height()
         guides = []
         snap_x, snap_y = x, y
         snap_width, snap_height = width, height
-        threshold = 5
-        for other in self.widgets:
-            if other != widget and "layout_id" not in other.properties:
-                # Horizontal alignment
-                if abs(other.y() - y) < threshold:
-                    guides.append((0, other.y(), self.canvas.width(), other.y()))
-                    snap_y = other.y()
-                if abs(other.y() + other.height() - y) < threshold:
-                    guides.append((0, other.y() + other.height(), self.canvas.width(), other.y() + other.height()))
-                    snap_y = other.y() + other.height()
-                # Vertical alignment
-                if abs(other.x() - x) < threshold:
-                    guides.append((other.x(), 0, other.x(), self.canvas.height()))
-                    snap_x = other.x()
-                if abs(other.x() + other.width() - x) < threshold:
-                    guides.append((other.x() + other.width(), 0, other.x() + other.width(), self.canvas.height()))
-                    snap_x = other.x() + other.width()
-                # Center alignment
-                if abs(other.x() + other.width() / 2 - x - width / 2) < threshold:
-                    center_x = other.x() + other.width() / 2
-                    guides.append((center_x, 0, center_x, self.canvas.height()))
-                    snap_x = center_x - width / 2
-                if abs(other.y() + other.height() / 2 - y - height / 2) < threshold:
-                    center_y = other.y() + other.height() / 2
-                    guides.append((0, center_y, self.canvas.width(), center_y))
-                    snap_y = center_y - height / 2
-                if is_resizing:
-                    if abs(other.x() + other.width() - x - width) < threshold:
-                        guides.append((other.x() + other.width(), 0, other.x() + other.width(), self.canvas.height()))
-                        snap_width = other.x() + other.width() - x
-                    if abs(other.y() + other.height() - y - height) < threshold:
-                        guides.append((0, other.y() + other.height(), self.canvas.width(), other.y() + other.height()))
-                        snap_height = other.y() + other.height() - y
+
+        def vertical(value):
+            guides.append((value, 0, value, canvas_height))
+
+        def horizontal(value):
+            guides.append((0, value, canvas_width, value))
+
+        # Horizontal alignment
+        y_edges = index.query("top", y) + index.query("bottom", y)
+        for value in y_edges:
+            horizontal(value)
+        if y_edges:
+            snap_y = min(y_edges, key=lambda v: abs(v - y))
+        # Vertical alignment
+        x_edges = index.query("left", x) + index.query("right", x)
+        for value in x_edges:
+            vertical(value)
+        if x_edges:
+            snap_x = min(x_edges, key=lambda v: abs(v - x))
+        # Center alignment
+        centers_x = index.query("center_x", x + width / 2)
+        for value in centers_x:
+            vertical(value)
+        if centers_x:
+            snap_x = centers_x[0] - width / 2
+        centers_y = index.query("center_y", y + height / 2)
+        for value in centers_y:
+            horizontal(value)
+        if centers_y:
+            snap_y = centers_y[0] - height / 2
+        if is_resizing:
+            rights = index.query("right", x + width)
+            for value in rights:
+                vertical(value)
+            if rights:
+                snap_width = rights[0] - x
+            bottoms = index.query("bottom", y + height)
+            for value in bottoms:
+                horizontal(value)
+            if bottoms:
+                snap_height = bottoms[0] - y
         return guides, snap_x, snap_y, snap_width, snap_height
 
     def bring_to_front(self, widget):
         widget.raise_()
-        self.add_to_history({"action": "modify", "widgets": [widget.get_properties()]})
-        print(f"Brought {widget.widget_type} to front")
+        self.add_to_history("modify", [widget])
+        log.info("Brought %s to front", widget.widget_type)
         self.status_bar.showMessage(f"Brought {widget.widget_type} to front")
 
     def send_to_back(self, widget):
         widget.lower()
-        self.add_to_history({"action": "modify", "widgets": [widget.get_properties()]})
-        print(f"Sent {widget.widget_type} to back")
+        self.add_to_history("modify", [widget])
+        log.info("Sent %s to back", widget.widget_type)
         self.status_bar.showMessage(f"Sent {widget.widget_type} to back")
 
-    def add_to_history(self, action):
-        self.history = self.history[:self.history_index + 1]
-        self.history.append(action)
-        self.history_index += 1
-        print(f"History updated: {action['action']}")
+    @metrics.timed("history.push")
+    def add_to_history(self, action, widgets, merge_key=None):
+        if self.batch_depth:
+            self.batch_widgets.update((w.record.id, w) for w in widgets)
+            return
+        self.commit_transaction()
+        # Deleted widgets are recorded as gone; everything else as its current properties
+        states = [(w.record.id, w.record.to_properties() if self.document.get(w.record.id) is w.record else None) for w in widgets]
+        entry = self.history.record(action, states, created=(action == "add"), merge_key=merge_key)
+        if entry:
+            metrics.count("history.entries")
+            history_log.debug("History updated: %s (%d steps, %d bytes)", action, len(self.history), self.history.bytes_used)
+
+    def reset_history(self):
+        self.transaction = None
+        self.transaction_timer.stop()
+        self.history.reset((w.record.id, w.record.to_properties()) for w in self.widgets)
 
     def undo(self):
-        if self.history_index >= 0:
-            action = self.history[self.history_index]
-            self.history_index -= 1
-            if action["action"] == "add":
-                for props in action["widgets"]:
-                    for widget in self.widgets[:]:
-                        if widget.get_properties() == props:
-                            self.delete_widget(widget)
-            elif action["action"] == "delete":
-                for props in action["widgets"]:
-                    self.add_widget_to_canvas(props["type"], props)
-            elif action["action"] == "modify":
-                for widget in self.widgets:
-                    for props in action["widgets"]:
-                        if widget.get_properties()["name"] == props["name"]:
-                            self.restore_widget_properties(widget, props)
-            elif action["action"] == "group":
-                group_id = action["group"]["id"]
-                self.groups = [g for g in self.groups if g["id"] != group_id]
-                for widget in action["group"]["widgets"]:
-                    widget.properties.pop("group_id", None)
-            elif action["action"] == "ungroup":
-                self.groups.append({"id": action["group_id"], "widgets": [w for w in self.widgets if w.properties.get("group_id") == action["group_id"]]})
-                for widget in self.widgets:
-                    if widget.properties.get("group_id") == action["group_id"]:
-                        widget.properties["group_id"] = action["group_id"]
-            elif action["action"] == "layout":
-                layout_id = action["layout"]["id"]
-                self.layouts = [l for l in self.layouts if l["id"] != layout_id]
-                for widget in self.widgets:
-                    if widget.properties.get("layout_id") == layout_id:
-                        widget.setParent(self.canvas)
-                        widget.properties.pop("layout_id", None)
-            elif action["action"] == "load_json":
-                self.clear_canvas()
-                for item in action["data"].get("widgets", []):
-                    self.add_widget_to_canvas(item["type"], item)
-                self.groups = action["data"].get("groups", [])
-                self.layouts = action["data"].get("layouts", [])
+        self.commit_transaction()
+        entry = self.history.undo()
+        if entry:
+            self.replaying = True  # Restyles go through the style queue, as in a batch
+            try:
+                for element_id, backward, forward in reversed(entry.changes):
+                    self.apply_element_state(element_id, backward)
+            finally:
+                self.replaying = False
             self.update_properties()
-            self.status_bar.showMessage(f"Undo {action['action']}")
-            print(f"Undo {action['action']}")
+            self.status_bar.showMessage(f"Undo {entry.action}")
+            history_log.info("Undo %s", entry.action)
 
     def redo(self):
-        if self.history_index < len(self.history) - 1:
-            self.history_index += 1
-            action = self.history[self.history_index]
-            if action["action"] == "add":
-                for props in action["widgets"]:
-                    self.add_widget_to_canvas(props["type"], props)
-            elif action["action"] == "delete":
-                for props in action["widgets"]:
-                    for widget in self.widgets[:]:
-                        if widget.get_properties() == props:
-                            self.delete_widget(widget)
-            elif action["action"] == "modify":
-                for widget in self.widgets:
-                    for props in action["widgets"]:
-                        if widget.get_properties()["name"] == props["name"]:
-                            self.restore_widget_properties(widget, props)
-            elif action["action"] == "group":
-                self.groups.append(action["group"])
-                for widget in action["group"]["widgets"]:
-                    widget.properties["group_id"] = action["group"]["id"]
-            elif action["action"] == "ungroup":
-                group_id = action["group_id"]
-                self.groups = [g for g in self.groups if g["id"] != group_id]
-                for widget in self.widgets:
-                    if widget.properties.get("group_id") == group_id:
-                        widget.properties.pop("group_id", None)
-            elif action["action"] == "layout":
-                self.apply_layout(action["layout"])
+        self.commit_transaction()
+        entry = self.history.redo()
+        if entry:
+            self.replaying = True  # Restyles go through the style queue, as in a batch
+            try:
+                for element_id, backward, forward in entry.changes:
+                    self.apply_element_state(element_id, forward)
+            finally:
+                self.replaying = False
             self.update_properties()
-            self.status_bar.showMessage(f"Redo {action['action']}")
-            print(f"Redo {action['action']}")
+            self.status_bar.showMessage(f"Redo {entry.action}")
+            history_log.info("Redo %s", entry.action)
+
+    def apply_element_state(self, element_id, props):
+        """Bring one element to a history state: absent (None), recreated, or patched."""
+        widget = self.widgets_by_id.get(element_id)
+        if props is None:
+            if widget:
+                self.remove_widget_from_canvas(widget)
+        elif widget is None:
+            widget = self.add_widget_to_canvas(props["type"], props, element_id)
+            if "layout_id" in props:
+                self.attach_to_layout(widget)
+        else:
+            self.restore_widget_properties(widget, props)
 
     def restore_widget_properties(self, widget, props):
-        widget.move(props["x"], props["y"])
-        widget.resize(props["width"], props["height"])
-        widget.properties.update({"color": props["color"], "font_size": props["font_size"], "name": props["name"], "custom_properties": props.get("custom_properties", {})})
-        self.update_widget_property(widget, "text", props["text"])
+        for key, value in props.items():
+            if key == "type":
+                continue
+            if value is None:
+                widget.properties.pop(key, None)
+            else:
+                widget.properties[key] = dict(value) if isinstance(value, dict) else value
+        widget.place(widget.record.x, widget.record.y)
+        widget.set_size(widget.record.width, widget.record.height)
+        if "text" in props:
+            widget.set_text(widget.record.text)
+        if "group_id" in props or "layout_id" in props:
+            self.membership.update(widget)
+        if "layout_id" in props:
+            self.attach_to_layout(widget)
         self.update_widget_stylesheet(widget, widget in self.selected_widgets)
+        if self.snap_index is not None:
+            self.snap_index.update(widget)
 
-    def apply_layout(self, layout):
-        container = DraggableWidget("container", self.canvas, properties={"layout": layout["type"], "layout_id": layout["id"]})
-        container.resize(200 if layout["type"] == "vertical" else 50 * len(layout["widgets"]), 50 * len(layout["widgets"]) if layout["type"] == "vertical" else 200)
-        self.widgets.append(container)
-        for widget in layout["widgets"]:
-            widget.properties["layout_id"] = layout["id"]
-            widget.setParent(container)
-        self.layouts.append(layout)
+    def attach_to_layout(self, widget):
+        """Parent a widget to its layout's container, or back onto the canvas."""
+        layout_id = widget.record.layout_id
+        if widget.widget_type == "container":
+            return
+        container = self.membership.containers.get(layout_id)
+        if container is not None:
+            if widget.parentWidget() is not container:
+                widget.setParent(container)  # Reparenting hides a widget
+            container.show()
+            widget.show()
+        elif widget.parentWidget() is not self.canvas:
+            widget.setParent(self.canvas)
+            widget.show()
+
+    def resolve_membership(self, data):
+        """Apply the id-based groups/layouts of a loaded project and parent layout members."""
+        for key, section in (("group_id", "groups"), ("layout_id", "layouts")):
+            for entry in data.get(section, []):
+                for element_id in entry.get("widgets", []):
+                    widget = self.widgets_by_id.get(element_id) if isinstance(element_id, int) else None
+                    if widget is not None:
+                        widget.properties[key] = entry["id"]
+        self.membership.rebuild(self.widgets)
+        for widget in self.widgets:
+            if widget.record.layout_id is not None:
+                self.attach_to_layout(widget)
 
     def toggle_grid(self):
         self.grid_enabled = not self.grid_enabled
@@ -563,7 +722,22 @@ class GUIEditor(QMainWindow):
             widget.grid_size = self.grid_size if self.grid_enabled else 1
         self.update_properties()
         self.status_bar.showMessage(f"Grid {'Enabled' if self.grid_enabled else 'Disabled'}")
-        print(f"Grid {'enabled' if self.grid_enabled else 'disabled'}")
+        log.info("Grid %s", "enabled" if self.grid_enabled else "disabled")
+
+    def show_metrics(self, visible):
+        """Start or stop collecting hot-path timings and show them on the canvas."""
+        metrics.enable(visible)
+        self.canvas.set_metrics_overlay(visible)
+        if self.metrics_action.isChecked() != visible:
+            self.metrics_action.setChecked(visible)
+        self.status_bar.showMessage("Performance HUD on" if visible else "Performance HUD off")
+
+    def export_metrics(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Metrics", "metrics.json", "JSON Files (*.json)")
+        if file_name:
+            metrics.export_json(file_name)
+            log.info("Exported metrics to %s", file_name)
+            self.status_bar.showMessage(f"Exported metrics to {file_name}")
 
     def update_grid_size(self, size):
         self.grid_size = size
@@ -571,216 +745,94 @@ class GUIEditor(QMainWindow):
         for widget in self.widgets:
             widget.grid_size = self.grid_size if self.grid_enabled else 1
         self.status_bar.showMessage(f"Grid size set to {size}")
-        print(f"Grid size set to {size}")
+        log.debug("Grid size set to %d", size)
 
+    @metrics.timed("properties.update")
     def update_properties(self):
-        for i in reversed(range(self.properties_layout.count())):
-            self.properties_layout.itemAt(i).widget().deleteLater()
-        self.property_widgets.clear()
-        if self.preview_mode:
-            self.properties_layout.addRow(QLabel("Properties disabled in Preview Mode"))
+        if self.batch_depth:
+            self.properties_dirty = True
             return
-        if len(self.selected_widgets) == 1:
-            widget = self.selected_widgets[0]
-            x_spin = QSpinBox()
-            x_spin.setRange(-1000, 1000)
-            x_spin.setValue(widget.x())
-            x_spin.valueChanged.connect(lambda value: self.update_widget_property(widget, "x", value))
-            self.properties_layout.addRow("X Position:", x_spin)
-            self.property_widgets["x_spin"] = x_spin
-
-            y_spin = QSpinBox()
-            y_spin.setRange(-1000, 1000)
-            y_spin.setValue(widget.y())
-            y_spin.valueChanged.connect(lambda value: self.update_widget_property(widget, "y", value))
-            self.properties_layout.addRow("Y Position:", y_spin)
-            self.property_widgets["y_spin"] = y_spin
-
-            width_spin = QSpinBox()
-            width_spin.setRange(50, 1000)
-            width_spin.setValue(widget.width())
-            width_spin.valueChanged.connect(lambda value: self.update_widget_property(widget, "width", value))
-            self.properties_layout.addRow("Width:", width_spin)
-            self.property_widgets["width_spin"] = width_spin
-
-            height_spin = QSpinBox()
-            height_spin.setRange(30, 1000)
-            height_spin.setValue(widget.height())
-            height_spin.valueChanged.connect(lambda value: self.update_widget_property(widget, "height", value))
-            self.properties_layout.addRow("Height:", height_spin)
-            self.property_widgets["height_spin"] = height_spin
-
-            type_label = QLabel(widget.widget_type.capitalize())
-            self.properties_layout.addRow("Type:", type_label)
-            self.property_widgets["type_label"] = type_label
-
-            text_input = QLineEdit(widget.widget.text() if widget.widget_type != "combobox" else ",".join([widget.widget.itemText(i) for i in range(widget.widget.count())]))
-            text_input.textChanged.connect(lambda text: self.update_widget_property(widget, "text", text))
-            self.properties_layout.addRow("Text:", text_input)
-            self.property_widgets["text_input"] = text_input
-
-            name_input = QLineEdit(widget.properties.get("name", ""))
-            name_input.textChanged.connect(lambda text: self.update_widget_property(widget, "name", text))
-            self.properties_layout.addRow("Name:", name_input)
-            self.property_widgets["name_input"] = name_input
-
-            font_size_spin = QSpinBox()
-            font_size_spin.setRange(8, 72)
-            font_size_spin.setValue(widget.properties.get("font_size", 12))
-            font_size_spin.valueChanged.connect(lambda value: self.update_widget_property(widget, "font_size", value))
-            self.properties_layout.addRow("Font Size:", font_size_spin)
-            self.property_widgets["font_size_spin"] = font_size_spin
-
-            color_button = QPushButton("Select Color")
-            color_button.clicked.connect(lambda: self.select_color_for_widget(widget))
-            self.properties_layout.addRow("Background Color:", color_button)
-            self.property_widgets["color_button"] = color_button
-
-            custom_props_button = QPushButton("Edit Custom Properties")
-            custom_props_button.clicked.connect(lambda: self.edit_custom_properties(widget))
-            self.properties_layout.addRow("Custom Properties:", custom_props_button)
-            self.property_widgets["custom_props_button"] = custom_props_button
-        elif self.selected_widgets:
-            common_x = self.selected_widgets[0].x() if all(w.x() == self.selected_widgets[0].x() for w in self.selected_widgets) else None
-            x_spin = QSpinBox()
-            x_spin.setRange(-1000, 1000)
-            if common_x is not None:
-                x_spin.setValue(common_x)
-            else:
-                x_spin.setEnabled(False)
-                x_spin.setPlaceholderText("Multiple values")
-            x_spin.valueChanged.connect(lambda value: self.update_multiple_widgets_property("x", value))
-            self.properties_layout.addRow("X Position:", x_spin)
-            self.property_widgets["x_spin"] = x_spin
-
-            common_y = self.selected_widgets[0].y() if all(w.y() == self.selected_widgets[0].y() for w in self.selected_widgets) else None
-            y_spin = QSpinBox()
-            y_spin.setRange(-1000, 1000)
-            if common_y is not None:
-                y_spin.setValue(common_y)
-            else:
-                y_spin.setEnabled(False)
-                y_spin.setPlaceholderText("Multiple values")
-            y_spin.valueChanged.connect(lambda value: self.update_multiple_widgets_property("y", value))
-            self.properties_layout.addRow("Y Position:", y_spin)
-            self.property_widgets["y_spin"] = y_spin
-
-            common_width = self.selected_widgets[0].width() if all(w.width() == self.selected_widgets[0].width() for w in self.selected_widgets) else None
-            width_spin = QSpinBox()
-            width_spin.setRange(50, 1000)
-            if common_width is not None:
-                width_spin.setValue(common_width)
-            else:
-                width_spin.setEnabled(False)
-                width_spin.setPlaceholderText("Multiple values")
-            width_spin.valueChanged.connect(lambda value: self.update_multiple_widgets_property("width", value))
-            self.properties_layout.addRow("Width:", width_spin)
-            self.property_widgets["width_spin"] = width_spin
-
-            common_height = self.selected_widgets[0].height() if all(w.height() == self.selected_widgets[0].height() for w in self.selected_widgets) else None
-            height_spin = QSpinBox()
-            height_spin.setRange(30, 1000)
-            if common_height is not None:
-                height_spin.setValue(common_height)
-            else:
-                height_spin.setEnabled(False)
-                height_spin.setPlaceholderText("Multiple values")
-            height_spin.valueChanged.connect(lambda value: self.update_multiple_widgets_property("height", value))
-            self.properties_layout.addRow("Height:", height_spin)
-            self.property_widgets["height_spin"] = height_spin
-
-            common_font_size = self.selected_widgets[0].properties.get("font_size", 12) if all(w.properties.get("font_size", 12) == self.selected_widgets[0].properties.get("font_size", 12) for w in self.selected_widgets) else None
-            font_size_spin = QSpinBox()
-            font_size_spin.setRange(8, 72)
-            if common_font_size is not None:
-                font_size_spin.setValue(common_font_size)
-            else:
-                font_size_spin.setEnabled(False)
-                font_size_spin.setPlaceholderText("Multiple values")
-            font_size_spin.valueChanged.connect(lambda value: self.update_multiple_widgets_property("font_size", value))
-            self.properties_layout.addRow("Font Size:", font_size_spin)
-            self.property_widgets["font_size_spin"] = font_size_spin
-
-            common_color = self.selected_widgets[0].properties.get("color", "") if all(w.properties.get("color", "") == self.selected_widgets[0].properties.get("color", "") for w in self.selected_widgets) else None
-            color_button = QPushButton("Select Color")
-            if common_color is None:
-                color_button.setEnabled(False)
-                color_button.setText("Multiple colors")
-            color_button.clicked.connect(self.select_color_for_multiple_widgets)
-            self.properties_layout.addRow("Background Color:", color_button)
-            self.property_widgets["color_button"] = color_button
-        else:
-            grid_size_spin = QSpinBox()
-            grid_size_spin.setRange(1, 50)
-            grid_size_spin.setValue(self.grid_size)
-            grid_size_spin.valueChanged.connect(self.update_grid_size)
-            self.properties_layout.addRow("Grid Size:", grid_size_spin)
-            self.property_widgets["grid_size_spin"] = grid_size_spin
-
-            grid_enabled_check = QCheckBox("Grid Enabled")
-            grid_enabled_check.setChecked(self.grid_enabled)
-            grid_enabled_check.stateChanged.connect(self.toggle_grid)
-            self.properties_layout.addRow(grid_enabled_check)
-            self.property_widgets["grid_enabled_check"] = grid_enabled_check
+        self.properties_panel.refresh()
 
     def select_color_for_widget(self, widget):
         color = QColorDialog.getColor(title=f"Select Color for {widget.widget_type.capitalize()}")
         if color.isValid():
             self.update_widget_property(widget, "color", color.name())
-            print(f"Color selected for {widget.widget_type}: {color.name()}")
+            log.info("Color selected for %s: %s", widget.widget_type, color.name())
 
     def select_color_for_multiple_widgets(self):
         color = QColorDialog.getColor(title="Select Color for Selected Widgets")
         if color.isValid():
             self.update_multiple_widgets_property("color", color.name())
-            print(f"Color selected for {len(self.selected_widgets)} widgets: {color.name()}")
+            log.info("Color selected for %d widgets: %s", len(self.selected_widgets), color.name())
 
     def update_widget_property(self, widget, property_name, value):
-        if widget and widget in self.widgets:
-            print(f"Updating {widget.widget_type} {property_name} to {value}, selected: {widget in self.selected_widgets}")
-            if property_name == "x":
-                widget.move(value, widget.y())
-                print(f"Updated {widget.widget_type} x to {value}")
-                self.status_bar.showMessage(f"Updated {widget.widget_type} X position to {value}")
-            elif property_name == "y":
-                widget.move(widget.x(), value)
-                print(f"Updated {widget.widget_type} y to {value}")
-                self.status_bar.showMessage(f"Updated {widget.widget_type} Y position to {value}")
-            elif property_name == "width":
-                widget.resize(value, widget.height())
-                widget.widget.resize(value, widget.height())
-                print(f"Updated {widget.widget_type} width to {value}")
-                self.status_bar.showMessage(f"Updated {widget.widget_type} width to {value}")
-            elif property_name == "height":
-                widget.resize(widget.width(), value)
-                widget.widget.resize(widget.width(), value)
-                print(f"Updated {widget.widget_type} height to {value}")
-                self.status_bar.showMessage(f"Updated {widget.widget_type} height to {value}")
-            elif property_name == "text":
-                if widget.widget_type != "combobox":
-                    widget.widget.setText(value)
-                else:
-                    widget.widget.clear()
-                    widget.widget.addItems(value.split(",") if value else ["Option 1"])
-                print(f"Updated {widget.widget_type} text to {value}")
-                self.status_bar.showMessage(f"Updated {widget.widget_type} text")
-            elif property_name == "name":
-                widget.properties["name"] = value
-                print(f"Updated {widget.widget_type} name to {value}")
-                self.status_bar.showMessage(f"Updated {widget.widget_type} name to {value}")
-            elif property_name == "color":
-                widget.properties["color"] = value
-                self.update_widget_stylesheet(widget, widget in self.selected_widgets)
-                print(f"Updated {widget.widget_type} color to {value}")
-                self.status_bar.showMessage(f"Updated {widget.widget_type} color to {value}")
-            elif property_name == "font_size":
-                widget.properties["font_size"] = value
-                self.update_widget_stylesheet(widget, widget in self.selected_widgets)
-                print(f"Updated {widget.widget_type} font size to {value}")
-                self.status_bar.showMessage(f"Updated {widget.widget_type} font size to {value}")
-            self.add_to_history({"action": "modify", "widgets": [widget.get_properties()]})
+        if widget and self.widgets_by_id.get(widget.record.id) is widget:
+            message = self.apply_widget_property(widget, property_name, value)
+            self.begin_transaction((widget.record.id, property_name), [widget], message)
+
+    def apply_widget_property(self, widget, property_name, value):
+        """Change one property on the canvas and return the status message describing it."""
+        if property_name == "x":
+            widget.place(value, widget.y())
+            message = f"Updated {widget.widget_type} X position to {value}"
+        elif property_name == "y":
+            widget.place(widget.x(), value)
+            message = f"Updated {widget.widget_type} Y position to {value}"
+        elif property_name == "width":
+            widget.set_size(value, widget.height())
+            message = f"Updated {widget.widget_type} width to {value}"
+        elif property_name == "height":
+            widget.set_size(widget.width(), value)
+            message = f"Updated {widget.widget_type} height to {value}"
+        elif property_name == "text":
+            widget.set_text(value)
+            message = f"Updated {widget.widget_type} text"
+        elif property_name == "name":
+            widget.properties["name"] = value
+            message = f"Updated {widget.widget_type} name to {value}"
+        elif property_name == "color":
+            widget.properties["color"] = value
+            self.update_widget_stylesheet(widget, widget in self.selected_widgets)
+            message = f"Updated {widget.widget_type} color to {value}"
+        elif property_name == "font_size":
+            widget.properties["font_size"] = value
+            self.update_widget_stylesheet(widget, widget in self.selected_widgets)
+            message = f"Updated {widget.widget_type} font size to {value}"
+        else:
+            message = f"Updated {widget.widget_type} {property_name} to {value}"
+        if self.snap_index is not None and property_name in ("x", "y", "width", "height"):
+            self.snap_index.update(widget)
+        return message
 
     def update_multiple_widgets_property(self, property_name, value):
-        for widget in self.selected_widgets:
-            self.update_widget_property(widget, property_name, value)
-        self.update_properties()
\ No newline at end of file
+        targets = [w for w in self.selected_widgets if self.widgets_by_id.get(w.record.id) is w]
+        for widget in targets:
+            self.apply_widget_property(widget, property_name, value)
+        if targets:
+            key = (tuple(w.record.id for w in targets), property_name)
+            self.begin_transaction(key, targets, f"Updated {property_name} of {len(targets)} widgets to {value}")
+        self.update_properties()
+
+    def begin_transaction(self, key, widgets, message):
+        """Collect a burst of edits to the same element(s) and property into one history entry.
+
+        Edits with the same key keep extending the open transaction; it is
+        committed once no further edit arrives within the merge window, when an
+        edit with another key starts, or before any other history operation.
+        """
+        if self.transaction is not None and self.transaction[0] != key:
+            self.commit_transaction()
+        self.transaction = (key, widgets, message)
+        self.transaction_timer.start()
+
+    def commit_transaction(self):
+        if self.transaction is None:
+            return
+        key, widgets, message = self.transaction
+        self.transaction = None
+        self.transaction_timer.stop()
+        widgets = [w for w in widgets if self.widgets_by_id.get(w.record.id) is w]
+        self.add_to_history("modify", widgets, merge_key=key)
+        self.status_bar.showMessage(message)
+        log.info(message)
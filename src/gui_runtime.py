@@ -0,0 +1,78 @@
+"""Runtime for data-driven generated code; its source is embedded in every generated module."""
+from PyQt6.QtCore import QEvent
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QLineEdit,
+                             QTextEdit, QLabel, QCheckBox, QComboBox)
+
+WIDGET_CLASSES = {"button": QPushButton, "field": QLineEdit, "textedit": QTextEdit, "label": QLabel,
+                  "checkbox": QCheckBox, "combobox": QComboBox, "container": QWidget}
+LAYOUT_CLASSES = {"vertical": QVBoxLayout, "horizontal": QHBoxLayout, "grid": QGridLayout}
+
+
+def create_widget(row, types, styles, parent):
+    """Build one widget from a (type, name, x, y, width, height, text, style) row."""
+    widget_type = types[row[0]]
+    text = row[6]
+    widget = WIDGET_CLASSES[widget_type](parent)
+    widget.setObjectName(row[1])
+    if text:
+        if widget_type == "combobox":
+            widget.addItems(text.split(","))
+        elif widget_type != "container":
+            widget.setText(text)
+    if row[7] >= 0:
+        widget.setStyleSheet(styles[row[7]])  # Shared str objects, one per distinct style
+    return widget
+
+
+class LazyContainer(QWidget):
+    """Layout container that builds its members the first time it is shown.
+
+    Members are created on the Polish event that precedes the first show,
+    while the container is still hidden, so they are shown along with it
+    instead of one at a time.
+    """
+
+    def __init__(self, layout_type, rows, data, widgets, parent):
+        super().__init__(parent)
+        self.layout_type = layout_type
+        self.rows = rows
+        self.data = data
+        self.widgets = widgets
+
+    def event(self, event):
+        if event.type() == QEvent.Type.Polish and self.rows is not None:
+            self.populate()
+        return super().event(event)
+
+    def populate(self):
+        rows, self.rows = self.rows, None
+        types, styles, widgets = self.data["types"], self.data["styles"], self.widgets
+        layout = LAYOUT_CLASSES.get(self.layout_type, QVBoxLayout)(self)
+        for row in rows:
+            widget = widgets[row[1]] = create_widget(row, types, styles, self)
+            if self.layout_type == "grid":
+                layout.addWidget(widget, row[9], row[10])  # Grid members carry their row and column
+            else:
+                layout.addWidget(widget)
+
+
+def build_ui(central_widget, data):
+    """Build the UI described by ``data`` onto ``central_widget``; returns {object name: widget}.
+
+    Rows with a layout index are deferred to that layout's LazyContainer,
+    which is only created once it has a member.
+    """
+    types, styles, layouts = data["types"], data["styles"], data["layouts"]
+    widgets = {}
+    members = {}
+    for row in data["widgets"]:
+        if len(row) > 8:
+            members.setdefault(row[8], []).append(row)
+        else:
+            widget = widgets[row[1]] = create_widget(row, types, styles, central_widget)
+            widget.setGeometry(row[2], row[3], row[4], row[5])
+    if members:
+        column = QVBoxLayout(central_widget)
+        for index, rows in members.items():
+            column.addWidget(LazyContainer(layouts[index], rows, data, widgets, central_widget))
+    return widgets
@@ -0,0 +1,199 @@
+import sys
+import time
+
+
+def copy_properties(props):
+    """Copy a property dict deeply enough that later in-place edits don't leak in."""
+    return {k: (dict(v) if isinstance(v, dict) else v) for k, v in props.items()}
+
+
+def estimate_size(obj):
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(estimate_size(item) for item in obj)
+    return size
+
+
+def diff_properties(before, after):
+    """Return (backward, forward) dicts holding only the keys that changed.
+
+    A value of None in either dict means the key was absent on that side.
+    """
+    backward, forward = {}, {}
+    for key in before.keys() | after.keys():
+        old, new = before.get(key), after.get(key)
+        if old != new:
+            backward[key] = old
+            forward[key] = new
+    return backward, forward
+
+
+def apply_delta(props, delta):
+    props = dict(props)
+    for key, value in delta.items():
+        if value is None:
+            props.pop(key, None)
+        else:
+            props[key] = value
+    return props
+
+
+class HistoryEntry:
+    """One undoable action as per-element (element_id, backward, forward) deltas.
+
+    A backward state of None means the element did not exist before the
+    action (it was added); a forward state of None means it was deleted.
+    Only creations and deletions carry full property sets.
+    """
+
+    __slots__ = ("action", "changes", "size", "merge_key", "time")
+
+    def __init__(self, action, changes, merge_key=None):
+        self.action = action
+        self.changes = changes
+        self.size = estimate_size(changes)
+        self.merge_key = merge_key
+        self.time = time.monotonic()
+
+    def merge(self, other):
+        """Fold a later entry for the same elements into this one."""
+        changes = {element_id: (backward, forward) for element_id, backward, forward in self.changes}
+        order = [element_id for element_id, _, _ in self.changes]
+        for element_id, backward, forward in other.changes:
+            if element_id not in changes:
+                changes[element_id] = (backward, forward)
+                order.append(element_id)
+                continue
+            old_backward, old_forward = changes[element_id]
+            backward = dict(backward, **old_backward)
+            forward = dict(old_forward, **forward)
+            changes[element_id] = (backward, forward)
+        self.changes = [(element_id, *changes[element_id]) for element_id in order]
+        self.size = estimate_size(self.changes)
+        self.time = other.time
+
+
+class History:
+    """Bounded undo/redo stack of delta entries.
+
+    ``baseline`` holds the last committed properties of every element so a
+    new entry only has to store what differs from it. The oldest entries are
+    evicted once either ``max_steps`` or ``max_bytes`` is exceeded. Entries
+    recorded with the same ``merge_key`` less than ``merge_window`` seconds
+    apart are folded into one.
+    """
+
+    def __init__(self, max_steps=500, max_bytes=8 * 1024 * 1024, merge_window=0.5):
+        self.max_steps = max_steps
+        self.max_bytes = max_bytes
+        self.merge_window = merge_window
+        self.entries = []
+        self.index = -1  # Last applied entry
+        self.baseline = {}
+        self.bytes_used = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def can_undo(self):
+        return self.index >= 0
+
+    def can_redo(self):
+        return self.index < len(self.entries) - 1
+
+    def track(self, element_id, props):
+        self.baseline[element_id] = copy_properties(props)
+
+    def reset(self, states=()):
+        """Drop all entries and start again from the given (element_id, props) states."""
+        self.entries.clear()
+        self.index = -1
+        self.bytes_used = 0
+        self.baseline = {element_id: copy_properties(props) for element_id, props in states}
+
+    def record(self, action, states, created=False, merge_key=None):
+        """Commit the current (element_id, props or None) states as one entry.
+
+        Returns the new entry, or None if nothing actually changed.
+        """
+        changes = []
+        for element_id, after in states:
+            before = None if created else self.baseline.get(element_id)
+            if after is not None:
+                after = copy_properties(after)
+            if before is None or after is None:
+                if before is not None or after is not None:
+                    changes.append((element_id, before, after))
+            else:
+                backward, forward = diff_properties(before, after)
+                if forward:
+                    changes.append((element_id, backward, forward))
+            if after is None:
+                self.baseline.pop(element_id, None)
+            else:
+                self.baseline[element_id] = after
+        if not changes:
+            return None
+        entry = HistoryEntry(action, changes, merge_key)
+        last = self.entries[self.index] if self.index >= 0 else None
+        if (merge_key is not None and last is not None and self.index == len(self.entries) - 1
+                and last.merge_key == merge_key and entry.time - last.time < self.merge_window):
+            self.bytes_used -= last.size
+            last.merge(entry)
+            self.bytes_used += last.size
+            self.evict()
+            return last
+        for dropped in self.entries[self.index + 1:]:
+            self.bytes_used -= dropped.size
+        del self.entries[self.index + 1:]
+        self.entries.append(entry)
+        self.index += 1
+        self.bytes_used += entry.size
+        self.evict()
+        return entry
+
+    def evict(self):
+        while len(self.entries) > 1 and (len(self.entries) > self.max_steps or self.bytes_used > self.max_bytes):
+            self.bytes_used -= self.entries.pop(0).size
+            self.index -= 1
+            self.evicted += 1
+
+    def undo(self):
+        if not self.can_undo():
+            return None
+        entry = self.entries[self.index]
+        self.index -= 1
+        for element_id, backward, forward in reversed(entry.changes):
+            self.move_baseline(element_id, backward, forward)
+        return entry
+
+    def redo(self):
+        if not self.can_redo():
+            return None
+        self.index += 1
+        entry = self.entries[self.index]
+        for element_id, backward, forward in entry.changes:
+            self.move_baseline(element_id, forward, backward)
+        return entry
+
+    def move_baseline(self, element_id, target, source):
+        if target is None:
+            self.baseline.pop(element_id, None)
+        elif source is None:
+            self.baseline[element_id] = copy_properties(target)
+        else:
+            self.baseline[element_id] = apply_delta(self.baseline.get(element_id, {}), target)
+
+    def stats(self):
+        return {
+            "steps": len(self.entries),
+            "position": self.index + 1,
+            "entry_bytes": self.bytes_used,
+            "baseline_bytes": estimate_size(self.baseline),
+            "evicted": self.evicted,
+            "max_steps": self.max_steps,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,64 @@
+"""Per-subsystem loggers for the editor.
+
+Modules log through ``get_logger("selection")`` and friends, passing
+arguments instead of f-strings so nothing is formatted unless a handler
+will emit the record. Without ``configure`` only warnings and errors are
+shown, so the per-event debug and info calls cost a level check.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+
+ROOT = "gui_editor"
+FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+listener = None  # QueueListener writing records on its own thread, when configured
+
+
+def get_logger(subsystem):
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+def configure(level="WARNING", file_name=None, async_output=False):
+    """Set the editor's log level and outputs (stderr, plus ``file_name`` if given).
+
+    With ``async_output`` the handlers run on a background thread behind a
+    QueueHandler, so a slow terminal or disk never blocks the UI thread.
+    """
+    global listener
+    stop()
+    root = logging.getLogger(ROOT)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    root.propagate = False
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    handlers = [logging.StreamHandler()]
+    if file_name:
+        handlers.append(logging.FileHandler(file_name, encoding="utf-8"))
+    formatter = logging.Formatter(FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    if async_output:
+        records = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        root.addHandler(logging.handlers.QueueHandler(records))
+    else:
+        for handler in handlers:
+            root.addHandler(handler)
+    return root
+
+
+def stop():
+    """Flush and stop the background writer, if one is running."""
+    global listener
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        listener = None
+
+
+atexit.register(stop)
@@ -1,9 +1,21 @@
 from PyQt6.QtWidgets import QApplication
+import argparse
 import sys
+import logs
 from gui_editor import GUIEditor
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    editor = GUIEditor()
+    parser = argparse.ArgumentParser(description="Advanced GUI Editor")
+    parser.add_argument("--lightweight", action="store_true", help="paint idle elements from cached pixmaps")
+    parser.add_argument("--metrics", action="store_true", help="collect hot-path timings and show them on the canvas")
+    parser.add_argument("--log-level", default="WARNING", help="DEBUG, INFO, WARNING (default) or ERROR")
+    parser.add_argument("--log-file", help="also write the log to this file")
+    parser.add_argument("--log-async", action="store_true", help="write log output from a background thread")
+    args, qt_args = parser.parse_known_args()
+    logs.configure(args.log_level, args.log_file, args.log_async)
+    app = QApplication(sys.argv[:1] + qt_args)
+    editor = GUIEditor(lightweight_elements=args.lightweight)
+    if args.metrics:
+        editor.show_metrics(True)
     editor.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
@@ -0,0 +1,88 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QPen, QColor, QRegion
+from PyQt6.QtCore import Qt, QRect
+from spatial_index import GridIndex
+
+
+def outline(rect):
+    """Region covered by a rectangle's one-pixel outline, with a pixel of slack."""
+    return QRegion(rect.adjusted(-1, -1, 1, 1)) - QRegion(rect.adjusted(2, 2, -2, -2))
+
+
+class MarqueeSelection:
+    """One rubber-band drag on the empty canvas.
+
+    The elements directly on the canvas are put in a GridIndex when the
+    band starts, and every move re-queries it for the band's hit set, which
+    is only outlined on a MarqueeOverlay. Dragging right selects the
+    elements entirely inside the band; dragging left also selects the ones
+    it merely touches. Shift adds the hits to the selection and Ctrl
+    toggles them; the selection itself changes once, on ``finish``.
+    """
+
+    def __init__(self, canvas, editor, origin):
+        self.canvas = canvas
+        self.editor = editor
+        self.origin = origin
+        self.index = GridIndex.build(w for w in editor.widgets if w.parentWidget() is canvas)
+        self.overlay = MarqueeOverlay(canvas)
+        self.hits = set()
+        self.mode = "replace"
+
+    def move(self, pos, modifiers):
+        band = QRect(self.origin, pos).normalized()
+        contain = pos.x() >= self.origin.x()
+        self.hits = self.index.query(band.left(), band.top(), band.right() + 1, band.bottom() + 1, contain)
+        if modifiers & Qt.KeyboardModifier.ControlModifier:
+            self.mode = "toggle"
+        elif modifiers & Qt.KeyboardModifier.ShiftModifier:
+            self.mode = "add"
+        else:
+            self.mode = "replace"
+        self.overlay.set_state(band, self.hits)
+
+    def finish(self, pos, modifiers):
+        self.move(pos, modifiers)
+        self.overlay.hide()
+        self.overlay.deleteLater()
+        self.editor.select_widgets(self.hits, self.mode)
+
+
+class MarqueeOverlay(QWidget):
+    """The band and the outlines of the elements it hits, painted above the elements.
+
+    Only the outlines that appear or disappear are repainted, so a move
+    doesn't repaint the elements under the band.
+    """
+
+    def __init__(self, canvas):
+        super().__init__(canvas)
+        self.band = QRect()
+        self.hits = set()
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setGeometry(canvas.rect())
+        self.show()
+        self.raise_()
+
+    def set_state(self, band, hits):
+        dirty = QRegion()
+        if band != self.band:
+            dirty += outline(self.band)
+            dirty += outline(band)
+        for widget in hits ^ self.hits:
+            dirty += outline(widget.geometry())
+        self.band, self.hits = band, hits
+        if not dirty.isEmpty():
+            self.update(dirty)
+
+    def paintEvent(self, event):
+        area = event.rect()
+        painter = QPainter(self)
+        painter.setPen(QPen(QColor(0, 120, 215), 1, Qt.PenStyle.DashLine))
+        for widget in self.hits:
+            geometry = widget.geometry()
+            if geometry.intersects(area):
+                painter.drawRect(geometry.adjusted(0, 0, -1, -1))
+        painter.setPen(QPen(QColor(0, 120, 215), 1))
+        painter.drawRect(self.band)
+        painter.end()
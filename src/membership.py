@@ -0,0 +1,89 @@
+class MembershipIndex:
+    """Group and layout membership of canvas elements, indexed both ways.
+
+    Groups and layouts map their id to their members, kept in insertion
+    order in a dict so removing one is O(1); ``group_of``/``layout_of`` map
+    each element back to the ids it is indexed under. The records'
+    ``group_id``/``layout_id`` stay the source of truth: after changing
+    them, call ``update`` for the element. New ids are allocated from
+    counters that only grow, so an id freed by a deletion (and perhaps
+    restored by undo) is never handed out again.
+    """
+
+    def __init__(self):
+        self.groups = {}  # Group id -> {widget: None}
+        self.layouts = {}  # Layout id -> {widget: None}, the container excluded
+        self.containers = {}  # Layout id -> container widget
+        self.group_of = {}  # widget -> group id
+        self.layout_of = {}  # widget -> layout id
+        self.next_group_id = 1
+        self.next_layout_id = 1
+
+    def new_group_id(self):
+        group_id = self.next_group_id
+        self.next_group_id += 1
+        return group_id
+
+    def new_layout_id(self):
+        layout_id = self.next_layout_id
+        self.next_layout_id += 1
+        return layout_id
+
+    def add(self, widget):
+        record = widget.record
+        if record.group_id is not None:
+            self.groups.setdefault(record.group_id, {})[widget] = None
+            self.group_of[widget] = record.group_id
+            self.next_group_id = max(self.next_group_id, record.group_id + 1)
+        if record.layout_id is not None:
+            if record.type == "container":
+                self.containers[record.layout_id] = widget
+            else:
+                self.layouts.setdefault(record.layout_id, {})[widget] = None
+            self.layout_of[widget] = record.layout_id
+            self.next_layout_id = max(self.next_layout_id, record.layout_id + 1)
+
+    def remove(self, widget):
+        group_id = self.group_of.pop(widget, None)
+        if group_id is not None:
+            members = self.groups[group_id]
+            del members[widget]
+            if not members:
+                del self.groups[group_id]
+        layout_id = self.layout_of.pop(widget, None)
+        if layout_id is not None:
+            if self.containers.get(layout_id) is widget:
+                del self.containers[layout_id]
+            else:
+                members = self.layouts.get(layout_id)
+                if members is not None:
+                    members.pop(widget, None)
+                    if not members:
+                        del self.layouts[layout_id]
+
+    def update(self, widget):
+        """Re-index an element whose group or layout id changed."""
+        record = widget.record
+        if self.group_of.get(widget) != record.group_id or self.layout_of.get(widget) != record.layout_id:
+            self.remove(widget)
+            self.add(widget)
+
+    def group_members(self, group_id):
+        return list(self.groups.get(group_id, ()))
+
+    def dissolve_group(self, group_id):
+        """Drop a group from the index; returns its former members."""
+        members = list(self.groups.pop(group_id, ()))
+        for widget in members:
+            del self.group_of[widget]
+        return members
+
+    def rebuild(self, widgets):
+        """Index ``widgets`` from scratch, e.g. after a load; id counters never go back."""
+        self.groups.clear()
+        self.layouts.clear()
+        self.containers.clear()
+        self.group_of.clear()
+        self.layout_of.clear()
+        for widget in widgets:
+            self.add(widget)
@@ -0,0 +1,106 @@
+"""Hot-path timing and counters for the editor.
+
+Functions decorated with ``timed(name)`` record their duration into a
+rolling window of recent samples, and ``count(name)`` bumps a counter.
+While ``enabled`` is False both reduce to a global flag check, so the
+instrumentation stays compiled in. ``snapshot()`` summarizes every window
+as p50/p95/p99 and ``export_json`` writes that summary to a file.
+"""
+import functools
+import json
+import time
+from collections import deque
+
+WINDOW = 1024  # Samples kept per timer
+
+enabled = False
+timers = {}  # Name -> deque of recent durations in seconds
+totals = {}  # Name -> number of samples ever recorded
+counters = {}
+last_ticks = {}  # Name -> perf_counter() of the previous tick, for interval timers
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+def reset():
+    timers.clear()
+    totals.clear()
+    counters.clear()
+    last_ticks.clear()
+
+
+def record(name, seconds):
+    samples = timers.get(name)
+    if samples is None:
+        samples = timers[name] = deque(maxlen=WINDOW)
+    samples.append(seconds)
+    totals[name] = totals.get(name, 0) + 1
+
+
+def count(name, amount=1):
+    if enabled:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def tick(name):
+    """Record the time since the previous tick of ``name``, e.g. between drag frames."""
+    if enabled:
+        now = time.perf_counter()
+        previous = last_ticks.get(name)
+        if previous is not None:
+            record(name, now - previous)
+        last_ticks[name] = now
+
+
+def end_ticks(name):
+    """Forget the previous tick so the pause before the next run isn't recorded."""
+    last_ticks.pop(name, None)
+
+
+def timed(name):
+    """Decorator recording each call's duration under ``name`` while enabled."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summary(name):
+    """p50/p95/p99/max/mean in milliseconds over the window, plus the total call count."""
+    ordered = sorted(timers[name])
+    return {
+        "count": totals[name],
+        "window": len(ordered),
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+    }
+
+
+def snapshot():
+    return {
+        "timers": {name: summary(name) for name in sorted(timers) if timers[name]},
+        "counters": dict(sorted(counters.items())),
+    }
+
+
+def export_json(file_name):
+    with open(file_name, "w") as f:
+        json.dump(snapshot(), f, indent=4)
@@ -0,0 +1,192 @@
+import os
+import time
+from PyQt6.QtWidgets import QProgressDialog
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+from utils import open_project_stream
+from ui_import import TYPE_CLASSES
+from logs import get_logger
+
+log = get_logger("loader")
+
+
+INT_PROPERTIES = ("x", "y", "width", "height", "font_size")
+
+
+def check_item(item):
+    """Raise ValueError unless ``item`` is a widget entry the canvas can build."""
+    if not isinstance(item, dict):
+        raise ValueError(f"widget entry is a {type(item).__name__}, not an object")
+    widget_type = item.get("type")
+    if not isinstance(widget_type, str) or widget_type not in TYPE_CLASSES:
+        raise ValueError(f"widget entry has unknown type {widget_type!r}")
+    element_id = item.get("id")
+    if element_id is not None and type(element_id) is not int:
+        raise ValueError(f"widget entry has non-integer id {element_id!r}")
+    for key in INT_PROPERTIES:
+        if key in item and type(item[key]) is not int:
+            raise ValueError(f"widget {element_id} has non-integer {key} {item[key]!r}")
+
+
+def current_rss():
+    """Resident set size in bytes, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class ProjectLoader(QObject):
+    """Loads a project onto the editor canvas in batches from the event loop.
+
+    Widgets are parsed from a JsonProjectStream (or a BinaryProject for
+    .guib files) and materialized
+    ``batch_size`` at a time, yielding back to the event loop in between so
+    the window stays responsive. A progress dialog tracks bytes read and
+    offers cancellation. Parse time, build time and peak memory growth are
+    reported when the load ends.
+    """
+
+    finished = pyqtSignal(bool)  # True when the whole project was loaded
+
+    def __init__(self, editor, file_name, batch_size=250):
+        super().__init__(editor)
+        self.editor = editor
+        self.file_name = file_name
+        self.batch_size = batch_size
+        self.stream = None  # Opened in start(), so a bad file fails the load instead of raising
+        self.items = None
+        self.sections = {}
+        self.count = 0
+        self.parse_time = 0.0
+        self.build_time = 0.0
+        self.start_rss = None
+        self.peak_rss = None
+        self.progress = None
+
+    def start(self):
+        self.editor.clear_canvas()
+        self.editor.reset_history()
+        self.start_rss = self.peak_rss = current_rss()
+        try:
+            self.stream = open_project_stream(self.file_name)
+        except (OSError, ValueError) as e:
+            self.fail(e)
+            return
+        self.items = iter(self.stream)
+        self.progress = QProgressDialog(f"Loading {self.file_name}", "Cancel", 0, max(1, self.stream.size), self.editor)
+        self.progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.progress.setMinimumDuration(300)
+        self.progress.canceled.connect(self.cancel)
+        QTimer.singleShot(0, self.process_batch)
+
+    def process_batch(self):
+        if self.progress is None:
+            return  # Cancelled while this batch was queued
+        with self.editor.batch_update():
+            error = done = None
+            try:
+                done = self.load_items()
+            except ValueError as e:
+                error = e
+            except Exception as e:  # Raising out of this timer slot would abort the editor
+                log.exception("Unexpected error loading %s", self.file_name)
+                error = e
+        if error is not None:
+            self.fail(error)
+            return
+        if done:
+            self.finish()
+            return
+        rss = current_rss()
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss, rss)
+        self.progress.setValue(min(self.stream.bytes_read, self.progress.maximum() - 1))
+        QTimer.singleShot(0, self.process_batch)
+
+    def load_items(self):
+        """Parse and build up to batch_size items; returns True at the end of the file."""
+        editor = self.editor
+        for _ in range(self.batch_size):
+            start = time.perf_counter()
+            try:
+                kind, value = next(self.items)
+            except StopIteration:
+                self.parse_time += time.perf_counter() - start
+                return True
+            except ValueError:
+                self.parse_time += time.perf_counter() - start
+                raise
+            built = time.perf_counter()
+            self.parse_time += built - start
+            if kind == "widget":
+                check_item(value)
+                editor.add_widget_to_canvas(value["type"], value, value.get("id"))
+                self.count += 1
+                self.build_time += time.perf_counter() - built
+            else:
+                self.sections[kind] = value
+        return False
+
+    def finish(self):
+        start = time.perf_counter()
+        self.editor.resolve_membership(self.sections)
+        self.editor.reset_history()
+        self.build_time += time.perf_counter() - start
+        self.close_progress()
+        message = f"Loaded {self.count} widgets from {self.file_name} ({self.stats_text()})"
+        self.editor.status_bar.showMessage(message)
+        log.info(message)
+        self.release()
+        self.finished.emit(True)
+
+    def fail(self, error):
+        self.close_progress()
+        self.editor.clear_canvas()
+        self.editor.reset_history()
+        self.editor.status_bar.showMessage(f"Failed to load {self.file_name}: {error}")
+        log.error("Failed to load %s: %s", self.file_name, error)
+        self.release()
+        self.finished.emit(False)
+
+    def cancel(self):
+        if self.progress is None:
+            return
+        self.close_progress()
+        self.editor.clear_canvas()
+        self.editor.reset_history()
+        self.editor.status_bar.showMessage(f"Cancelled loading {self.file_name} after {self.count} widgets")
+        log.info("Cancelled loading %s after %d widgets", self.file_name, self.count)
+        self.release()
+        self.finished.emit(False)
+
+    def release(self):
+        """Close the project file and schedule this loader's deletion."""
+        if self.items is not None:
+            self.items.close()  # Leaves the JSON stream's open() block and drops the binary section views
+            self.items = None
+        if hasattr(self.stream, "close"):
+            self.stream.close()  # BinaryProject's memory map
+        self.deleteLater()
+
+    def close_progress(self):
+        progress, self.progress = self.progress, None
+        if progress is not None:
+            progress.canceled.disconnect(self.cancel)
+            progress.close()
+            progress.deleteLater()
+
+    def stats(self):
+        return {
+            "widgets": self.count,
+            "parse_seconds": self.parse_time,
+            "build_seconds": self.build_time,
+            "peak_rss_growth": None if self.start_rss is None else self.peak_rss - self.start_rss,
+        }
+
+    def stats_text(self):
+        stats = self.stats()
+        text = f"parse {stats['parse_seconds'] * 1000:.0f} ms, build {stats['build_seconds'] * 1000:.0f} ms"
+        if stats["peak_rss_growth"] is not None:
+            text += f", peak memory +{stats['peak_rss_growth'] / (1024 * 1024):.1f} MiB"
+        return text
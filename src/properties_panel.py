@@ -0,0 +1,199 @@
+from PyQt6.QtWidgets import QWidget, QStackedWidget, QFormLayout, QSpinBox, QLabel, QLineEdit, QCheckBox, QPushButton
+
+MULTIPLE = "multiple"  # Page key for multi-selections
+CANVAS = "canvas"  # Page key for an empty selection
+PREVIEW = "preview"
+MIXED_TEXT = "Multiple values"
+
+# (property, label, minimum, maximum)
+SPIN_ROWS = (
+    ("x", "X Position:", -1000, 1000),
+    ("y", "Y Position:", -1000, 1000),
+    ("width", "Width:", 50, 1000),
+    ("height", "Height:", 30, 1000),
+)
+FONT_SIZE_ROW = ("font_size", "Font Size:", 8, 72)
+TEXT_LABELS = {"combobox": "Items (comma separated):", "container": "Title:"}
+
+
+def common_value(values):
+    """The value shared by all entries, or None when they differ."""
+    first = values[0]
+    return first if all(value == first for value in values) else None
+
+
+class ElementPage(QWidget):
+    """Property rows for one widget type, or for a multi-selection, built once and rebound.
+
+    Inputs are connected a single time to handlers that act on
+    ``targets``, so a selection change only loads values (with signals
+    blocked) instead of creating widgets.
+    """
+
+    def __init__(self, editor, widget_type):
+        super().__init__()
+        self.editor = editor
+        self.widget_type = widget_type
+        self.targets = []
+        self.form = QFormLayout(self)
+        self.spins = {}
+        for row in SPIN_ROWS:
+            self.add_spin(*row)
+        self.text_input = self.name_input = self.custom_props_button = None
+        if widget_type != MULTIPLE:
+            self.form.addRow("Type:", QLabel(widget_type.capitalize()))
+            self.text_input = QLineEdit()
+            self.text_input.textChanged.connect(lambda text: self.changed("text", text))
+            self.form.addRow(TEXT_LABELS.get(widget_type, "Text:"), self.text_input)
+            self.name_input = QLineEdit()
+            self.name_input.textChanged.connect(lambda text: self.changed("name", text))
+            self.form.addRow("Name:", self.name_input)
+        self.add_spin(*FONT_SIZE_ROW)
+        self.color_button = QPushButton("Select Color")
+        self.color_button.clicked.connect(self.select_color)
+        self.form.addRow("Background Color:", self.color_button)
+        if widget_type != MULTIPLE:
+            self.custom_props_button = QPushButton("Edit Custom Properties")
+            self.custom_props_button.clicked.connect(lambda: self.editor.edit_custom_properties(self.targets[0]))
+            self.form.addRow("Custom Properties:", self.custom_props_button)
+        self.inputs = [*self.spins.values(), self.text_input, self.name_input]
+
+    def add_spin(self, name, label, minimum, maximum):
+        spin = QSpinBox()
+        spin.setRange(minimum, maximum)
+        spin.valueChanged.connect(lambda value: self.changed(name, value))
+        self.form.addRow(label, spin)
+        self.spins[name] = spin
+
+    def bind(self, targets):
+        self.targets = targets
+        for widget in self.inputs:
+            if widget is not None:
+                widget.blockSignals(True)
+        try:
+            self.load()
+        finally:
+            for widget in self.inputs:
+                if widget is not None:
+                    widget.blockSignals(False)
+
+    def load(self):
+        targets = self.targets
+        records = [widget.record for widget in targets]
+        values = {"x": [w.x() for w in targets], "y": [w.y() for w in targets],
+                  "width": [w.width() for w in targets], "height": [w.height() for w in targets],
+                  "font_size": [r.font_size if r.font_size is not None else 12 for r in records]}
+        ranges = dict((row[0], row[2]) for row in SPIN_ROWS + (FONT_SIZE_ROW,))
+        for name, spin in self.spins.items():
+            value = common_value(values[name])
+            if value is None:
+                # One below the real minimum shows the special text until a value is picked for all
+                spin.setMinimum(ranges[name] - 1)
+                spin.setSpecialValueText(MIXED_TEXT)
+                spin.setValue(spin.minimum())
+            else:
+                spin.setSpecialValueText("")
+                spin.setMinimum(ranges[name])
+                spin.setValue(value)
+        if self.text_input is not None:
+            record = records[0]
+            if self.text_input.text() != record.text:
+                self.text_input.setText(record.text)
+            if self.name_input.text() != (record.name or ""):
+                self.name_input.setText(record.name or "")
+        mixed_color = common_value([r.color or "" for r in records]) is None
+        self.color_button.setText("Multiple colors" if mixed_color else "Select Color")
+
+    def changed(self, name, value):
+        spin = self.spins.get(name)
+        if spin is not None and spin.specialValueText() and value == spin.minimum():
+            return  # Stepped back onto the "Multiple values" placeholder
+        if not self.targets:
+            return
+        if self.widget_type == MULTIPLE:
+            self.editor.update_multiple_widgets_property(name, value)
+        else:
+            self.editor.update_widget_property(self.targets[0], name, value)
+
+    def select_color(self):
+        if self.widget_type == MULTIPLE:
+            self.editor.select_color_for_multiple_widgets()
+        elif self.targets:
+            self.editor.select_color_for_widget(self.targets[0])
+
+
+class CanvasPage(QWidget):
+    """Grid settings, shown when nothing is selected."""
+
+    def __init__(self, editor):
+        super().__init__()
+        self.editor = editor
+        layout = QFormLayout(self)
+        self.grid_size_spin = QSpinBox()
+        self.grid_size_spin.setRange(1, 50)
+        self.grid_size_spin.valueChanged.connect(editor.update_grid_size)
+        layout.addRow("Grid Size:", self.grid_size_spin)
+        self.grid_enabled_check = QCheckBox("Grid Enabled")
+        self.grid_enabled_check.stateChanged.connect(editor.toggle_grid)
+        layout.addRow(self.grid_enabled_check)
+
+    def bind(self, targets):
+        for widget in (self.grid_size_spin, self.grid_enabled_check):
+            widget.blockSignals(True)
+        self.grid_size_spin.setValue(self.editor.grid_size)
+        self.grid_enabled_check.setChecked(self.editor.grid_enabled)
+        for widget in (self.grid_size_spin, self.grid_enabled_check):
+            widget.blockSignals(False)
+
+
+class PreviewPage(QWidget):
+    def __init__(self, editor):
+        super().__init__()
+        QFormLayout(self).addRow(QLabel("Properties disabled in Preview Mode"))
+
+    def bind(self, targets):
+        pass
+
+
+class PropertiesPanel(QStackedWidget):
+    """Contents of the properties dock.
+
+    Holds one lazily built page per widget type plus pages for
+    multi-selections, the canvas and preview mode. Showing a selection
+    switches pages and rebinds; no widgets are created after a page's
+    first use.
+    """
+
+    def __init__(self, editor):
+        super().__init__()
+        self.editor = editor
+        self.pages = {}
+
+    def page(self, key):
+        page = self.pages.get(key)
+        if page is None:
+            if key == CANVAS:
+                page = CanvasPage(self.editor)
+            elif key == PREVIEW:
+                page = PreviewPage(self.editor)
+            else:
+                page = ElementPage(self.editor, key)
+            self.pages[key] = page
+            self.addWidget(page)
+        return page
+
+    def refresh(self):
+        editor = self.editor
+        selected = list(editor.selected_widgets)
+        if editor.preview_mode:
+            key = PREVIEW
+        elif not selected:
+            key = CANVAS
+        elif len(selected) > 1:
+            key = MULTIPLE
+        else:
+            key = selected[0].widget_type
+        page = self.page(key)
+        page.bind(selected)
+        if self.currentWidget() is not page:
+            self.setCurrentWidget(page)
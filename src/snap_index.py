@@ -0,0 +1,112 @@
+from bisect import bisect_left, bisect_right, insort
+
+
+class SnapIndex:
+    """Sorted edge arrays over canvas widgets for alignment-guide queries.
+
+    Each edge kind (left, right, top, bottom, horizontal and vertical center)
+    is kept as a sorted list of (value, key) pairs, so finding every widget
+    whose edge lies within the snap threshold is two binary searches instead
+    of a scan over the whole canvas.
+    """
+
+    EDGES = ("left", "right", "top", "bottom", "center_x", "center_y")
+
+    def __init__(self, threshold=5):
+        self.threshold = threshold
+        self.edges = {edge: [] for edge in self.EDGES}
+        self.entries = {}  # widget -> (key, {edge: value})
+        self.next_key = 0
+
+    @classmethod
+    def build(cls, widgets, exclude=(), threshold=5):
+        index = cls(threshold)
+        exclude = set(exclude)
+        for widget in widgets:
+            if widget not in exclude and "layout_id" not in widget.properties:
+                index.entries[widget] = index._make_entry(widget)
+        for widget, (key, values) in index.entries.items():
+            for edge, value in values.items():
+                index.edges[edge].append((value, key))
+        for edge in cls.EDGES:
+            index.edges[edge].sort()
+        return index
+
+    @classmethod
+    def around(cls, widgets, widget, x, y, width, height, threshold=5):
+        """Index of only the widgets with an edge near the box (x, y, width, height), found in one scan.
+
+        For a one-off query outside a drag, where sorting every widget's
+        edges would cost more than the query saves.
+        """
+        xs = (x, x + width / 2, x + width)
+        ys = (y, y + height / 2, y + height)
+        x_low, x_high = x - threshold, x + width + threshold
+        y_low, y_high = y - threshold, y + height + threshold
+        near = []
+        for other in widgets:
+            record = other.record  # Plain attributes; much cheaper to read than Qt geometry
+            if other is widget or record.layout_id is not None:
+                continue
+            ox, oy = record.x, record.y
+            x_values = (ox, ox + record.width / 2, ox + record.width)
+            y_values = (oy, oy + record.height / 2, oy + record.height)
+            # Cheap range test first; most widgets are nowhere near the box
+            if ((x_low < x_values[2] and x_high > ox
+                 and any(abs(value - probe) < threshold for value in x_values for probe in xs))
+                    or (y_low < y_values[2] and y_high > oy
+                        and any(abs(value - probe) < threshold for value in y_values for probe in ys))):
+                near.append(other)
+        return cls.build(near, threshold=threshold)
+
+    def _make_entry(self, widget):
+        x, y, width, height = widget.x(), widget.y(), widget.width(), widget.height()
+        key = self.next_key
+        self.next_key += 1
+        return key, {
+            "left": x,
+            "right": x + width,
+            "top": y,
+            "bottom": y + height,
+            "center_x": x + width / 2,
+            "center_y": y + height / 2,
+        }
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, widget):
+        return widget in self.entries
+
+    def add(self, widget):
+        if widget in self.entries or "layout_id" in widget.properties:
+            return
+        key, values = self._make_entry(widget)
+        self.entries[widget] = (key, values)
+        for edge, value in values.items():
+            insort(self.edges[edge], (value, key))
+
+    def remove(self, widget):
+        entry = self.entries.pop(widget, None)
+        if entry is None:
+            return
+        key, values = entry
+        for edge, value in values.items():
+            edge_list = self.edges[edge]
+            i = bisect_left(edge_list, (value, key))
+            if i < len(edge_list) and edge_list[i] == (value, key):
+                del edge_list[i]
+
+    def update(self, widget):
+        """Re-index a widget after it was moved or resized."""
+        if widget in self.entries:
+            self.remove(widget)
+            self.add(widget)
+
+    def query(self, edge, value):
+        """Return the edge values within the threshold of value, nearest first."""
+        edge_list = self.edges[edge]
+        lo = bisect_right(edge_list, (value - self.threshold, float("inf")))
+        hi = bisect_left(edge_list, (value + self.threshold, -1))
+        matches = {v for v, _ in edge_list[lo:hi] if abs(v - value) < self.threshold}
+        return sorted(matches, key=lambda v: abs(v - value))
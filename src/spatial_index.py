@@ -0,0 +1,71 @@
+class GridIndex:
+    """Uniform grid over element bounds for rectangle queries.
+
+    Each element is filed under every cell its bounds overlap, so a query
+    only tests the elements in the cells the rectangle covers instead of
+    every element on the canvas. Bounds are (left, top, right, bottom)
+    with exclusive right and bottom edges.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> [widget]
+        self.bounds = {}  # widget -> (left, top, right, bottom)
+
+    @classmethod
+    def build(cls, widgets, cell_size=128):
+        index = cls(cell_size)
+        for widget in widgets:
+            index.add(widget)
+        return index
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def _cells(self, left, top, right, bottom):
+        size = self.cell_size
+        columns = range(left // size, max(left, right - 1) // size + 1)
+        for row in range(top // size, max(top, bottom - 1) // size + 1):
+            for column in columns:
+                yield column, row
+
+    def add(self, widget):
+        if widget in self.bounds:
+            return
+        left, top = widget.x(), widget.y()
+        bounds = (left, top, left + widget.width(), top + widget.height())
+        self.bounds[widget] = bounds
+        for cell in self._cells(*bounds):
+            self.cells.setdefault(cell, []).append(widget)
+
+    def remove(self, widget):
+        bounds = self.bounds.pop(widget, None)
+        if bounds is None:
+            return
+        for cell in self._cells(*bounds):
+            members = self.cells[cell]
+            members.remove(widget)
+            if not members:
+                del self.cells[cell]
+
+    def query(self, left, top, right, bottom, contain=False):
+        """Elements overlapping the rectangle, or lying entirely inside it when ``contain`` is set."""
+        size = self.cell_size
+        if (right - left) * (bottom - top) > len(self.cells) * size * size:
+            buckets = self.cells.values()  # The rectangle covers more cells than are occupied
+        else:
+            buckets = (self.cells.get(cell, ()) for cell in self._cells(left, top, right, bottom))
+        found, seen = set(), set()
+        for members in buckets:
+            for widget in members:
+                if widget in seen:
+                    continue
+                seen.add(widget)
+                x1, y1, x2, y2 = self.bounds[widget]
+                if contain:
+                    hit = x1 >= left and y1 >= top and x2 <= right and y2 <= bottom
+                else:
+                    hit = x1 < right and x2 > left and y1 < bottom and y2 > top
+                if hit:
+                    found.add(widget)
+        return found
@@ -0,0 +1,276 @@
+import re
+import xml.etree.ElementTree as ET
+
+# Qt class -> editor element type
+CLASS_MAP = {
+    "QPushButton": "button",
+    "QToolButton": "button",
+    "QCommandLinkButton": "button",
+    "QLineEdit": "field",
+    "QSpinBox": "field",
+    "QDoubleSpinBox": "field",
+    "QTextEdit": "textedit",
+    "QPlainTextEdit": "textedit",
+    "QTextBrowser": "textedit",
+    "QLabel": "label",
+    "QCheckBox": "checkbox",
+    "QRadioButton": "checkbox",
+    "QComboBox": "combobox",
+    "QFontComboBox": "combobox",
+    "QWidget": "container",
+    "QFrame": "container",
+    "QGroupBox": "container",
+}
+# Editor element type -> Qt class, for export
+TYPE_CLASSES = {"button": "QPushButton", "field": "QLineEdit", "textedit": "QTextEdit", "label": "QLabel",
+                "checkbox": "QCheckBox", "combobox": "QComboBox", "container": "QWidget"}
+# Window chrome that has no canvas equivalent; skipped with everything inside it
+SKIPPED_CLASSES = frozenset(("QMenuBar", "QMenu", "QStatusBar", "QToolBar", "QDockWidget"))
+LAYOUT_TYPES = {"QVBoxLayout": "vertical", "QHBoxLayout": "horizontal", "QGridLayout": "grid", "QFormLayout": "grid"}
+LAYOUT_CLASSES = {"vertical": "QVBoxLayout", "horizontal": "QHBoxLayout", "grid": "QGridLayout"}
+TEXT_PROPERTIES = ("text", "title", "plainText", "placeholderText")  # In order of preference
+GEOMETRY_TAGS = frozenset(("x", "y", "width", "height"))
+BACKGROUND = re.compile(r"background(?:-color)?\s*:\s*([^;]+)")
+
+DEFAULT_WIDTH, DEFAULT_HEIGHT = 100, 40
+LAYOUT_MARGIN, LAYOUT_SPACING = 9, 6
+
+
+class WidgetScope:
+    """A <widget> being parsed. ``record`` is None for widgets that are not imported."""
+
+    def __init__(self, elem, parent, record=None, skip=False):
+        self.elem = elem
+        self.parent = parent
+        self.record = record
+        self.skip = skip
+        self.geometry = {}
+        self.texts = {}
+        self.items = []
+        self.layout = None  # LayoutScope owned by this widget
+        self.member_of = None  # LayoutScope this widget is an item of
+        self.row = self.column = None  # Grid position within member_of
+
+    def origin(self):
+        """Absolute canvas position of this widget's top-left corner."""
+        if self.parent is None:
+            return 0, 0  # The window itself
+        if self.member_of is not None:
+            return self.member_of.container_origin()
+        px, py = self.parent.origin()
+        return px + self.geometry.get("x", 0), py + self.geometry.get("y", 0)
+
+
+class LayoutScope:
+    """A top-level <layout> and the container record that stands in for it on the canvas."""
+
+    def __init__(self, owner, layout_type, container, layout_id):
+        self.owner = owner
+        self.type = layout_type
+        self.container = container
+        self.layout_id = layout_id
+        self.members = []
+        self.cursor = LAYOUT_MARGIN
+        self.extent = (0, 0)
+
+    def container_origin(self):
+        return self.container["x"], self.container["y"]
+
+    def place(self, record, row=None, column=None):
+        """Position a member inside the container, relative to it."""
+        width, height = record["width"], record["height"]
+        if self.type == "grid":
+            x = LAYOUT_MARGIN + (column or 0) * (DEFAULT_WIDTH + LAYOUT_SPACING)
+            y = LAYOUT_MARGIN + (row or 0) * (DEFAULT_HEIGHT + LAYOUT_SPACING)
+        elif self.type == "horizontal":
+            x, y = self.cursor, LAYOUT_MARGIN
+            self.cursor += width + LAYOUT_SPACING
+        else:
+            x, y = LAYOUT_MARGIN, self.cursor
+            self.cursor += height + LAYOUT_SPACING
+        record["x"], record["y"] = x, y
+        self.extent = (max(self.extent[0], x + width), max(self.extent[1], y + height))
+
+
+class UiImporter:
+    """Single-pass importer for Qt Designer .ui files.
+
+    The file is read with ``iterparse`` and every element is cleared and
+    detached from its parent as soon as it ends, so memory stays bounded by
+    the nesting depth rather than the file size. Container widgets become
+    "container" elements, children keep their absolute position on the
+    canvas, and each top-level layout becomes a layout container with its
+    items as members. The editor's layouts don't nest, so items of a nested
+    layout join the enclosing one.
+    """
+
+    def __init__(self):
+        self.widgets = []
+        self.layouts = []
+        self.next_id = 1
+        self.next_layout_id = 1
+        self.unknown_classes = {}
+        self.scopes = []  # Open WidgetScope/LayoutScope objects, innermost last
+        self.widget_scopes = []  # Just the WidgetScopes
+
+    def parse(self, source):
+        stack = []
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if elem.tag == "widget":
+                    self.start_widget(elem, stack)
+                elif elem.tag == "layout":
+                    self.start_layout(elem)
+                continue
+            if elem.tag == "widget":
+                self.end_widget()
+            elif elem.tag == "layout":
+                self.end_layout()
+            elif len(stack) > 2 and elem.text is not None:
+                self.end_value(elem, stack)
+            stack.pop()
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)  # Earlier siblings are gone already, so this is found first
+        return self.project()
+
+    def project(self):
+        return {
+            "widgets": self.widgets,
+            "groups": [],
+            "layouts": [{"id": layout.layout_id, "type": layout.type, "widgets": layout.members}
+                        for layout in self.layouts if layout.members],
+        }
+
+    def widget_scope(self):
+        return self.widget_scopes[-1] if self.widget_scopes else None
+
+    def new_record(self, widget_type, name):
+        record = {"type": widget_type, "name": name, "x": 0, "y": 0, "width": DEFAULT_WIDTH,
+                  "height": DEFAULT_HEIGHT, "text": "", "color": "white", "font_size": 12,
+                  "custom_properties": {}, "id": self.next_id}
+        self.next_id += 1
+        self.widgets.append(record)  # Appended on start so containers stay below their children
+        return record
+
+    def start_widget(self, elem, stack):
+        parent = self.widget_scope()
+        cls = elem.get("class", "")
+        if parent is not None and parent.skip or cls in SKIPPED_CLASSES:
+            scope = WidgetScope(elem, parent, skip=True)
+        elif parent is None or (parent.parent is None and cls == "QWidget" and parent.elem.get("class") == "QMainWindow"):
+            scope = WidgetScope(elem, parent)  # The window and its central widget are the canvas itself
+        elif cls in CLASS_MAP:
+            scope = WidgetScope(elem, parent, self.new_record(CLASS_MAP[cls], elem.get("name", "")))
+        else:
+            self.unknown_classes[cls] = self.unknown_classes.get(cls, 0) + 1
+            scope = WidgetScope(elem, parent)  # Not imported, but its children are
+        if self.scopes and isinstance(self.scopes[-1], LayoutScope):
+            scope.member_of = self.scopes[-1]
+            item = stack[-2]
+            if item.get("row") is not None:
+                scope.row, scope.column = int(item.get("row")), int(item.get("column", 0))
+        self.scopes.append(scope)
+        self.widget_scopes.append(scope)
+
+    def end_widget(self):
+        scope = self.scopes.pop()
+        self.widget_scopes.pop()
+        record = scope.record
+        if record is None:
+            return
+        geometry = scope.geometry
+        record["width"] = geometry.get("width", record["width"])
+        record["height"] = geometry.get("height", record["height"])
+        for name in TEXT_PROPERTIES:
+            if name in scope.texts:
+                record["text"] = scope.texts[name]
+                break
+        if scope.items:
+            record["text"] = ",".join(scope.items)
+        layout = scope.member_of
+        if layout is not None and "layout" not in record:
+            record["layout_id"] = layout.layout_id
+            layout.place(record, scope.row, scope.column)
+            layout.members.append(record["id"])
+        elif layout is not None:
+            # A container with its own layout can't also be a member; stack it below the container instead
+            x, y = layout.container_origin()
+            record["x"], record["y"] = x + LAYOUT_MARGIN, y + layout.container["height"] + LAYOUT_SPACING
+        else:
+            record["x"], record["y"] = scope.origin()
+
+    def start_layout(self, elem):
+        owner = self.scopes[-1] if self.scopes else None
+        if isinstance(owner, LayoutScope) or owner is None:
+            self.scopes.append(owner)  # Nested layouts feed the enclosing one
+            return
+        layout_type = LAYOUT_TYPES.get(elem.get("class"), "vertical")
+        layout_id = self.next_layout_id
+        self.next_layout_id += 1
+        if owner.skip:
+            container = {}
+        elif owner.record is not None and owner.record["type"] == "container" and owner.layout is None:
+            container = owner.record
+        else:
+            container = self.new_record("container", elem.get("name", ""))
+            x, y = owner.origin()
+            container.update(x=x, y=y, width=owner.geometry.get("width", DEFAULT_WIDTH),
+                             height=owner.geometry.get("height", DEFAULT_HEIGHT))
+        if owner.record is container:
+            x, y = owner.origin()
+            container.update(x=x, y=y)  # Members are positioned relative to it from here on
+        container.update(layout=layout_type, layout_id=layout_id)
+        layout = LayoutScope(owner, layout_type, container, layout_id)
+        owner.layout = layout
+        self.layouts.append(layout)
+        self.scopes.append(layout)
+
+    def end_layout(self):
+        layout = self.scopes.pop()
+        if layout is None or (self.scopes and self.scopes[-1] is layout):
+            return
+        container = layout.container
+        if container and not {"width", "height"} <= layout.owner.geometry.keys():
+            container["width"] = max(container["width"], layout.extent[0] + LAYOUT_MARGIN)
+            container["height"] = max(container["height"], layout.extent[1] + LAYOUT_MARGIN)
+
+    def end_value(self, elem, stack):
+        """Apply a leaf value (<x>, <string>, <pointsize>, ...) to the widget that owns its property.
+
+        Geometry is kept for widgets that aren't imported too, since their
+        children are positioned relative to them.
+        """
+        scope = self.widget_scope()
+        if scope is None or scope.skip:
+            return
+        for i in range(len(stack) - 2, 0, -1):
+            if stack[i].tag == "property":
+                break
+        else:
+            return
+        name, owner = stack[i].get("name"), stack[i - 1]
+        tag, text = elem.tag, elem.text
+        if owner is not scope.elem:
+            if (owner.tag == "item" and stack[i - 2] is scope.elem and name == "text" and tag == "string"
+                    and scope.record is not None):
+                scope.items.append(text)  # QComboBox item
+            return
+        if name == "geometry" and tag in GEOMETRY_TAGS:
+            scope.geometry[tag] = int(text)
+        elif scope.record is None:
+            return
+        elif name in TEXT_PROPERTIES and tag == "string":
+            scope.texts[name] = text
+        elif name == "styleSheet" and tag == "string":
+            match = BACKGROUND.search(text)
+            if match:
+                scope.record["color"] = match.group(1).strip()
+        elif name == "font" and tag == "pointsize":
+            scope.record["font_size"] = int(text)
+
+
+def parse_ui(source):
+    """Parse a .ui file (path or file object) into a project dict like Document.to_dict()."""
+    return UiImporter().parse(source)
@@ -1,142 +1,291 @@
 import json
+import os
 import xml.etree.ElementTree as ET
 from PyQt6.QtWidgets import QFileDialog
+import codegen
+from ui_import import UiImporter, TYPE_CLASSES, LAYOUT_CLASSES
+from document import grid_cells
+from binary_format import BinaryProject, is_binary_project, read_binary, write_binary
+from logs import get_logger
 
-def save_json(widgets, groups, layouts, parent):
-    file_name, _ = QFileDialog.getSaveFileName(parent, "Save JSON", "", "JSON Files (*.json)")
-    if file_name:
-        data = {
-            "widgets": [widget.get_properties() for widget in widgets],
-            "groups": groups,
-            "layouts": layouts
-        }
-        with open(file_name, 'w') as f:
-            json.dump(data, f, indent=4)
-        print(f"Saved JSON to {file_name}")
-        parent.status_bar.showMessage(f"Saved JSON to {file_name}")
+log = get_logger("io")
+
+PROJECT_FILTERS = "JSON Files (*.json);;Binary Projects (*.guib)"
+
+def write_json(document, file_name):
+    with open(file_name, 'w') as f:
+        json.dump(document.to_dict(), f, indent=4)
 
-def load_json(parent):
-    file_name, _ = QFileDialog.getOpenFileName(parent, "Load JSON", "", "JSON Files (*.json)")
+def write_project(document, file_name):
+    """Write JSON, or the compact binary format for .guib file names."""
+    if file_name.lower().endswith(".guib"):
+        write_binary(document.to_dict(), file_name)
+    else:
+        write_json(document, file_name)
+
+def save_json(document, parent):
+    file_name, selected = QFileDialog.getSaveFileName(parent, "Save Project", "", PROJECT_FILTERS)
     if file_name:
-        with open(file_name, 'r') as f:
-            data = json.load(f)
-        print(f"Loaded JSON from {file_name}")
-        parent.status_bar.showMessage(f"Loaded JSON from {file_name}")
-        return data
-    return None
+        if "guib" in selected and not os.path.splitext(file_name)[1]:
+            file_name += ".guib"
+        write_project(document, file_name)
+        log.info("Saved project to %s", file_name)
+        parent.status_bar.showMessage(f"Saved project to {file_name}")
+
+def select_json_file(parent):
+    file_name, _ = QFileDialog.getOpenFileName(parent, "Load Project", "", "Projects (*.json *.guib);;" + PROJECT_FILTERS)
+    return file_name or None
+
+def read_json(file_name):
+    if is_binary_project(file_name):
+        return read_binary(file_name)
+    with open(file_name, 'r') as f:
+        return json.load(f)
+
+def open_project_stream(file_name):
+    """Item stream for either project format, detected from the file's magic bytes."""
+    if is_binary_project(file_name):
+        return BinaryProject(file_name)
+    return JsonProjectStream(file_name)
+
+class JsonProjectStream:
+    """Incrementally parses a JSON project file.
+
+    Iterating yields ("widget", item) for every entry of the top-level
+    "widgets" array as soon as it has been read, and (key, value) for every
+    other top-level key, so callers never need the whole document in memory.
+    ``bytes_read`` and ``size`` allow progress reporting.
+    """
+
+    def __init__(self, file_name, chunk_size=64 * 1024):
+        self.file_name = file_name
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        self.size = os.path.getsize(file_name)
+
+    def __iter__(self):
+        with open(self.file_name, 'r') as self.file:
+            self.expect("{")
+            if self.peek() == "}":
+                return
+            while True:
+                key = self.decode()
+                self.expect(":")
+                if key == "widgets" and self.peek() == "[":
+                    self.expect("[")
+                    if self.peek() == "]":
+                        self.pos += 1
+                    else:
+                        while True:
+                            yield "widget", self.decode()
+                            if self.expect(",]") == "]":
+                                break
+                else:
+                    yield key, self.decode()
+                if self.expect(",}") == "}":
+                    return
+
+    def fill(self):
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.bytes_read += len(chunk.encode())
+        # Drop consumed text so the buffer only ever holds the current item
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError(f"Unexpected end of JSON in {self.file_name}")
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.bytes_read - len(self.buffer) + self.pos} in {self.file_name}")
+        self.pos += 1
+        return char
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Only an error at the end of the buffer can be cured by reading more
+                incomplete = e.pos >= len(self.buffer) - 6 or e.msg.startswith("Unterminated string")
+                if not incomplete or not self.fill():
+                    raise ValueError(f"{e.msg} at offset {self.bytes_read - len(self.buffer) + e.pos} "
+                                     f"in {self.file_name}") from None
+                continue
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue  # A number or literal may continue in the next chunk
+            self.pos = end
+            return value
 
 def load_ui(parent):
     file_name, _ = QFileDialog.getOpenFileName(parent, "Load UI File", "", "UI Files (*.ui)")
     if file_name:
-        tree = ET.parse(file_name)
-        root = tree.getroot()
-        ui_data = []
-        for widget in root.findall(".//widget"):
-            widget_type = widget.get("class").lower().replace("q", "")
-            properties = {
-                "name": widget.get("name", ""),
-                "x": int(widget.find("geometry/x").text) if widget.find("geometry/x") is not None else 100,
-                "y": int(widget.find("geometry/y").text) if widget.find("geometry/y") is not None else 100,
-                "width": int(widget.find("geometry/width").text) if widget.find("geometry/width") is not None else 100,
-                "height": int(widget.find("geometry/height").text) if widget.find("geometry/height") is not None else 40,
-                "text": widget.find("property/text").text if widget.find("property/text") is not None else "",
-                "color": widget.find("property/stylesheet").text.split("background-color: ")[1].split(";")[0] if widget.find("property/stylesheet") is not None and "background-color" in widget.find("property/stylesheet").text else "white",
-                "font_size": int(widget.find("property/font/size").text) if widget.find("property/font/size") is not None else 12,
-                "custom_properties": {}
-            }
-            ui_data.append((widget_type, properties))
-        print(f"Loaded UI from {file_name}")
-        parent.status_bar.showMessage(f"Loaded UI from {file_name}")
-        return ui_data
+        importer = UiImporter()
+        project = importer.parse(file_name)
+        message = f"Loaded UI from {file_name} ({len(project['widgets'])} widgets)"
+        if importer.unknown_classes:
+            message += f", skipped unsupported classes: {', '.join(sorted(importer.unknown_classes))}"
+        log.info(message)
+        parent.status_bar.showMessage(message)
+        return project
     return None
 
-def generate_code(widgets, layouts, parent):
-    file_name, _ = QFileDialog.getSaveFileName(parent, "Save Generated Code", "", "Python Files (*.py)")
+def build_code(document, optimized=True):
+    """Python source for a document, one statement group per widget.
+
+    With ``optimized`` the codegen passes share styles through one window
+    stylesheet and combobox item lists through constants.
+    """
+    module = codegen.lower(document)
+    if optimized:
+        codegen.optimize(module)
+    return codegen.emit(module)
+
+def ui_property(parent, name, tag, text):
+    prop = ET.SubElement(parent, "property", name=name)
+    ET.SubElement(prop, tag).text = str(text)
+    return prop
+
+def ui_widget(parent, record, geometry=True):
+    """A Designer <widget> element for one record."""
+    props = record.to_properties()
+    cls = TYPE_CLASSES.get(record.type, "QWidget")
+    if record.type == "container" and record.text:
+        cls = "QGroupBox"
+    widget = ET.SubElement(parent, "widget", {"class": cls, "name": props.get("name") or f"{record.type}_{record.id}"})
+    if geometry:
+        rect = ET.SubElement(ET.SubElement(widget, "property", name="geometry"), "rect")
+        for key in ("x", "y", "width", "height"):
+            ET.SubElement(rect, key).text = str(props[key])
+    if record.type == "combobox":
+        for text in record.text.split(",") if record.text else []:
+            ui_property(ET.SubElement(widget, "item"), "text", "string", text)
+    elif record.type == "container":
+        if record.text:
+            ui_property(widget, "title", "string", record.text)
+    elif record.type == "textedit":
+        ui_property(widget, "plainText", "string", record.text)
+    elif record.type != "field" or record.text:
+        ui_property(widget, "text", "string", record.text)
+    if props.get("color"):
+        ui_property(widget, "styleSheet", "string", f"background-color: {props['color']};")
+    if props.get("font_size"):
+        font = ET.SubElement(ET.SubElement(widget, "property", name="font"), "font")
+        ET.SubElement(font, "pointsize").text = str(props["font_size"])
+    return widget
+
+def build_ui(document):
+    """Qt Designer .ui XML for a document; layout containers become widgets with a <layout>."""
+    root = ET.Element("ui", version="4.0")
+    ET.SubElement(root, "class").text = "MainWindow"
+    window = ET.SubElement(root, "widget", {"class": "QMainWindow", "name": "MainWindow"})
+    rect = ET.SubElement(ET.SubElement(window, "property", name="geometry"), "rect")
+    for key, value in (("x", 0), ("y", 0), ("width", 800), ("height", 600)):
+        ET.SubElement(rect, key).text = str(value)
+    central = ET.SubElement(window, "widget", {"class": "QWidget", "name": "centralwidget"})
+    members = {}
+    for layout in document.layouts():
+        members[layout["id"]] = layout["widgets"]
+    for record in document:
+        if record.layout_id is None:
+            ui_widget(central, record)
+        elif record.type == "container":
+            container = ui_widget(central, record)
+            layout_type = record.extra.get("layout", "vertical")
+            layout = ET.SubElement(container, "layout", {"class": LAYOUT_CLASSES.get(layout_type, "QVBoxLayout"),
+                                                         "name": f"layout_{record.layout_id}"})
+            records = members.get(record.layout_id, [])
+            cells = grid_cells(records) if layout_type == "grid" else {}
+            for member in records:
+                item = ET.SubElement(layout, "item")
+                if member.id in cells:
+                    row, column = cells[member.id]
+                    item.set("row", str(row))
+                    item.set("column", str(column))
+                ui_widget(item, member, geometry=False)
+    ET.indent(root)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(root, encoding="unicode") + "\n"
+
+def runtime_data(document):
+    """Compact table form of a document for the gui_runtime loader."""
+    types, styles, layouts, rows = {}, {}, [], []
+    def row(record, layout_index=None, cell=None):
+        props = record.to_properties()
+        style = f"background-color: {props.get('color', 'white')}; font-size: {props.get('font_size', 12)}px;"
+        values = [types.setdefault(record.type, len(types)), props.get("name", f"{record.type}_{record.id}"),
+                  record.x, record.y, record.width, record.height, record.text, styles.setdefault(style, len(styles))]
+        if layout_index is not None:
+            values.append(layout_index)
+        if cell is not None:
+            values.extend(cell)  # Grid row and column
+        rows.append(values)
+    for layout in document.layouts():
+        cells = grid_cells(layout["widgets"]) if layout["type"] == "grid" else {}
+        for record in layout["widgets"]:
+            row(record, len(layouts), cells.get(record.id))
+        layouts.append(layout["type"])
+    for record in document:
+        if record.layout_id is None:
+            row(record)
+    return {"types": list(types), "styles": list(styles), "layouts": layouts, "widgets": rows}
+
+def build_runtime_code(document):
+    """Generated module that embeds the layout as data plus the small gui_runtime loader."""
+    import gui_runtime
+    with open(gui_runtime.__file__) as f:
+        runtime = f.read()
+    data = json.dumps(runtime_data(document), separators=(",", ":"))
+    return "\n".join([
+        "import json",
+        "from PyQt6.QtWidgets import QApplication, QMainWindow",
+        "",
+        runtime,
+        f"UI_DATA = json.loads({data!r})",
+        "",
+        "class GeneratedUI(QMainWindow):",
+        "    def __init__(self):",
+        "        super().__init__()",
+        "        self.setWindowTitle('Generated UI')",
+        "        self.setGeometry(100, 100, 800, 600)",
+        "        central_widget = QWidget()",
+        "        self.setCentralWidget(central_widget)",
+        "        self.widgets = build_ui(central_widget, UI_DATA)",
+        "",
+        "if __name__ == '__main__':",
+        "    app = QApplication([])",
+        "    window = GeneratedUI()",
+        "    window.show()",
+        "    app.exec()",
+        "",
+    ])
+
+CODE_FILTERS = {
+    "Python Files (*.py)": build_code,
+    "Python, data-driven loader (*.py)": build_runtime_code,
+}
+
+def generate_code(document, parent, generator=None):
+    """Ask for a file and write generated code; ``generator`` is an optional IncrementalGenerator."""
+    file_name, selected = QFileDialog.getSaveFileName(parent, "Save Generated Code", "", ";;".join(CODE_FILTERS))
     if file_name:
-        code = [
-            "from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel, QCheckBox, QComboBox",
-            "from PyQt6.QtCore import Qt",
-            "",
-            "class GeneratedUI(QMainWindow):",
-            "    def __init__(self):",
-            "        super().__init__()",
-            "        self.setWindowTitle('Generated UI')",
-            "        self.setGeometry(100, 100, 800, 600)",
-            "        central_widget = QWidget()",
-            "        self.setCentralWidget(central_widget)",
-            "        layout = QVBoxLayout(central_widget)",
-            ""
-        ]
-        # Handle layouts first
-        for layout in layouts:
-            layout_id = layout["id"]
-            layout_type = layout["type"].capitalize()
-            code.append(f"        layout_{layout_id} = Q{layout_type}Layout()")
-            for widget in layout["widgets"]:
-                props = widget.get_properties()
-                name = props.get("name", f"{props['type']}_{id(widget)}")
-                if props["type"] == "button":
-                    code.append(f"        {name} = QPushButton('{props['text']}', central_widget)")
-                elif props["type"] == "field":
-                    code.append(f"        {name} = QLineEdit(central_widget)")
-                    if props["text"]:
-                        code.append(f"        {name}.setText('{props['text']}')")
-                elif props["type"] == "label":
-                    code.append(f"        {name} = QLabel('{props['text']}', central_widget)")
-                elif props["type"] == "checkbox":
-                    code.append(f"        {name} = QCheckBox('{props['text']}', central_widget)")
-                elif props["type"] == "combobox":
-                    code.append(f"        {name} = QComboBox(central_widget)")
-                    if props["text"]:
-                        items = props["text"].split(",")
-                        for item in items:
-                            code.append(f"        {name}.addItem('{item}')")
-                color = props.get("color", "white")
-                font_size = props.get("font_size", 12)
-                code.append(f"        {name}.setStyleSheet('background-color: {color}; font-size: {font_size}px;')")
-                # Add custom properties as comments
-                for key, value in props.get("custom_properties", {}).items():
-                    code.append(f"        # Custom property: {key} = {value}")
-                code.append(f"        layout_{layout_id}.addWidget({name})")
-            code.append(f"        container_{layout_id} = QWidget(central_widget)")
-            code.append(f"        container_{layout_id}.setLayout(layout_{layout_id})")
-            code.append(f"        layout.addWidget(container_{layout_id})")
-        # Handle non-layout widgets
-        for widget in widgets:
-            if "layout_id" not in widget.get_properties():
-                props = widget.get_properties()
-                name = props.get("name", f"{props['type']}_{id(widget)}")
-                x, y, width, height = props["x"], props["y"], props["width"], props["height"]
-                text = props["text"]
-                color = props.get("color", "white")
-                font_size = props.get("font_size", 12)
-                if props["type"] == "button":
-                    code.append(f"        {name} = QPushButton('{text}', central_widget)")
-                elif props["type"] == "field":
-                    code.append(f"        {name} = QLineEdit(central_widget)")
-                    if text:
-                        code.append(f"        {name}.setText('{text}')")
-                elif props["type"] == "label":
-                    code.append(f"        {name} = QLabel('{text}', central_widget)")
-                elif props["type"] == "checkbox":
-                    code.append(f"        {name} = QCheckBox('{text}', central_widget)")
-                elif props["type"] == "combobox":
-                    code.append(f"        {name} = QComboBox(central_widget)")
-                    if text:
-                        items = text.split(",")
-                        for item in items:
-                            code.append(f"        {name}.addItem('{item}')")
-                code.append(f"        {name}.setGeometry({x}, {y}, {width}, {height})")
-                code.append(f"        {name}.setStyleSheet('background-color: {color}; font-size: {font_size}px;')")
-                for key, value in props.get("custom_properties", {}).items():
-                    code.append(f"        # Custom property: {key} = {value}")
-        code.append("")
-        code.append("if __name__ == '__main__':")
-        code.append("    app = QApplication([])")
-        code.append("    window = GeneratedUI()")
-        code.append("    window.show()")
-        code.append("    app.exec()")
+        build = CODE_FILTERS.get(selected, build_code)
         with open(file_name, 'w') as f:
-            f.write("\n".join(code))
-        print(f"Generated code saved to {file_name}")
+            f.write(generator.build(document) if build is build_code and generator is not None else build(document))
+        log.info("Generated code saved to %s", file_name)
         parent.status_bar.showMessage(f"Generated code saved to {file_name}")
\ No newline at end of file
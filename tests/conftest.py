@@ -0,0 +1,23 @@
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+@pytest.fixture
+def editor(app):
+    from gui_editor import GUIEditor
+    editor = GUIEditor()
+    yield editor
+    editor.close()
+    editor.deleteLater()
+    app.processEvents()
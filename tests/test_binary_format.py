@@ -0,0 +1,49 @@
+import pytest
+
+from binary_format import BinaryProject, read_binary, write_binary
+
+
+def project(count):
+    return {
+        "widgets": [{"id": i, "type": "button", "x": i, "y": 2 * i, "width": 100, "height": 30,
+                     "text": f"Item {i}", "color": "lightblue", "font_size": 12, "group_id": 1 + i // 10}
+                    for i in range(1, count + 1)],
+        "groups": [{"id": 1 + g, "widgets": list(range(max(1, 10 * g), 10 * g + 10))} for g in range(count // 10)],
+        "layouts": [],
+    }
+
+
+def test_round_trip(tmp_path):
+    data = project(200)
+    file_name = tmp_path / "form.guib"
+    write_binary(data, file_name)
+    assert read_binary(file_name) == data
+
+
+def test_truncated_file_raises_value_error(tmp_path):
+    file_name = tmp_path / "form.guib"
+    write_binary(project(200), file_name)
+    content = file_name.read_bytes()
+    for length in (0, 4, 20, 40, len(content) // 2, len(content) - 1):
+        file_name.write_bytes(content[:length])
+        with pytest.raises(ValueError, match="form.guib"):
+            read_binary(file_name)
+
+
+def test_truncated_file_fails_the_load(tmp_path, app, editor):
+    file_name = tmp_path / "form.guib"
+    write_binary(project(200), file_name)
+    content = file_name.read_bytes()
+    file_name.write_bytes(content[:len(content) // 2])
+    editor.load_json_file(str(file_name))
+    while editor.loader is not None:
+        app.processEvents()
+    assert editor.widgets == []
+    assert "Failed to load" in editor.status_bar.currentMessage()
+
+
+def test_incomplete_directory_raises_value_error(tmp_path):
+    file_name = tmp_path / "form.guib"
+    file_name.write_bytes(b"GUIB\x01\x00\x05\x00")
+    with pytest.raises(ValueError, match="truncated"):
+        BinaryProject(file_name)
@@ -0,0 +1,14 @@
+from PyQt6.QtCore import QPoint
+
+from canvas_widget import CanvasWidget
+
+
+def test_guide_region_is_the_line_strip_plus_the_label(app):
+    canvas = CanvasWidget()
+    canvas.resize(3840, 2160)
+    region = canvas.guide_region((200, 0, 200, 2160))
+    label = canvas.fontMetrics().boundingRect("x: 200").translated(205, 20)
+    assert region.contains(QPoint(200, 1000))
+    assert region.contains(label.center())
+    assert not region.contains(QPoint(label.center().x(), 1000))  # Beside the line, below the label
+    assert region.boundingRect().height() >= 2160
@@ -0,0 +1,33 @@
+import builtins
+import json
+
+from convert import convert_file
+
+
+def test_failed_write_removes_the_temporary_file(tmp_path, monkeypatch):
+    source = tmp_path / "form.json"
+    source.write_text(json.dumps({"widgets": [{"id": 1, "type": "label", "text": "x"}], "groups": [], "layouts": []}))
+    destination = tmp_path / "out" / "form.py"
+    real_open = builtins.open
+
+    class FullDisk:
+        def __init__(self, file):
+            self.file = file
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.file.close()
+
+        def write(self, text):
+            self.file.write(text[:10])
+            raise OSError(28, "No space left on device")
+
+    def fake_open(file, mode="r", *args, **kwargs):
+        f = real_open(file, mode, *args, **kwargs)
+        return FullDisk(f) if str(file).endswith(".tmp") else f
+    monkeypatch.setattr(builtins, "open", fake_open)
+    seconds, error = convert_file(str(source), str(destination), "py")
+    assert "No space left" in error
+    assert list((tmp_path / "out").iterdir()) == []
@@ -0,0 +1,23 @@
+from PyQt6.QtGui import QColor
+
+from drag_scheduler import DragProxy
+
+
+def test_proxy_pixmap_shows_only_the_moving_elements(app, editor):
+    editor.show()
+    members = [editor.add_widget_to_canvas("container", {"x": x, "y": 40, "width": 80, "height": 60, "color": "#00ff00"})
+               for x in (40, 200)]
+    stationary = editor.add_widget_to_canvas("container", {"x": 60, "y": 60, "width": 40, "height": 20, "color": "#ff0000"})
+    stationary.raise_()
+    app.processEvents()
+    bounds = members[0].geometry().united(members[1].geometry())
+    proxy = DragProxy(editor.canvas, members, bounds)
+    image = proxy.pixmap.toImage()
+    ratio = proxy.pixmap.devicePixelRatio()
+
+    def pixel(x, y):  # Canvas coordinates
+        return QColor.fromRgba(image.pixel(round((x - bounds.x()) * ratio), round((y - bounds.y()) * ratio)))
+    assert pixel(80, 70) == QColor("#00ff00")  # Under the stationary element
+    assert pixel(160, 70).alpha() == 0  # Between the members: neither grid nor canvas
+    proxy.commit()
+    assert all(member.isVisible() for member in members)
@@ -0,0 +1,14 @@
+def test_property_edits_on_hidden_elements_reach_the_record_and_history(app, editor):
+    widget = editor.add_widget_to_canvas("label", {"x": 40, "y": 50, "width": 120, "height": 40})
+    editor.reset_history()
+    assert not widget.isVisible()  # The editor was never shown, so Qt defers move events
+    editor.update_widget_property(widget, "x", 300)
+    editor.commit_transaction()
+    editor.update_widget_property(widget, "height", 80)
+    editor.commit_transaction()
+    assert (widget.record.x, widget.record.height) == (300, 80)
+    assert len(editor.history) == 2
+    editor.undo()
+    editor.undo()
+    assert (widget.record.x, widget.record.height) == (40, 40)
+    assert (widget.x(), widget.height()) == (40, 40)
@@ -0,0 +1,48 @@
+from PyQt6.QtWidgets import QLabel, QWidget
+
+import gui_runtime
+from codegen import IncrementalGenerator
+from document import Document
+from utils import build_code, runtime_data
+
+
+def grid_document():
+    """A 2x2 grid layout, as imported from a QGridLayout."""
+    document = Document()
+    document.add_element("container", {"layout": "grid", "layout_id": 1, "width": 230, "height": 110})
+    for name, x, y in (("a", 9, 9), ("b", 115, 9), ("c", 9, 55), ("d", 115, 55)):
+        document.add_element("label", {"name": name, "text": name, "x": x, "y": y, "layout_id": 1})
+    return document
+
+
+def test_runtime_places_grid_members_in_their_cells(app):
+    window = QWidget()
+    widgets = gui_runtime.build_ui(window, runtime_data(grid_document()))
+    window.show()
+    app.processEvents()
+    layout = widgets["a"].parentWidget().layout()
+    cells = {name: layout.getItemPosition(layout.indexOf(widgets[name]))[:2] for name in "abcd"}
+    assert cells == {"a": (0, 0), "b": (0, 1), "c": (1, 0), "d": (1, 1)}
+    window.close()
+
+
+def generated_cells(source):
+    namespace = {"__name__": "generated"}
+    exec(compile(source, "generated", "exec"), namespace)
+    window = namespace["GeneratedUI"]()
+    labels = {label.text(): label for label in window.findChildren(QLabel)}
+    layout = labels["a"].parentWidget().layout()
+    cells = {name: layout.getItemPosition(layout.indexOf(labels[name]))[:2] for name in "abcd"}
+    window.deleteLater()
+    return cells
+
+
+def test_generated_code_places_grid_members_in_their_cells(app):
+    document = grid_document()
+    expected = {"a": (0, 0), "b": (0, 1), "c": (1, 0), "d": (1, 1)}
+    assert generated_cells(build_code(document, optimized=False)) == expected
+    assert generated_cells(build_code(document)) == expected
+    generator = IncrementalGenerator()
+    generator.build(document)
+    document.get(2).x, document.get(3).x = 115, 9  # Swap the columns of the first row
+    assert generator.build(document) == build_code(document)
@@ -0,0 +1,52 @@
+import json
+
+from PyQt6.QtWidgets import QFileDialog
+
+UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <widget class="QWidget" name="Form">
+  <widget class="QWidget" name="panel">
+   <property name="geometry"><rect><x>20</x><y>30</y><width>200</width><height>120</height></rect></property>
+   <layout class="QVBoxLayout" name="panel_layout">
+    <item><widget class="QLabel" name="label"><property name="text"><string>Name</string></property></widget></item>
+    <item><widget class="QCheckBox" name="check"><property name="text"><string>On</string></property></widget></item>
+   </layout>
+  </widget>
+ </widget>
+</ui>
+"""
+
+
+def members(editor):
+    return [w for w in editor.widgets if w.record.layout_id is not None and w.widget_type != "container"]
+
+
+def assert_members_visible(editor):
+    assert len(members(editor)) == 2
+    for widget in members(editor):
+        container = editor.membership.containers[widget.record.layout_id]
+        assert widget.parentWidget() is container
+        assert container.isVisible() and widget.isVisible()
+
+
+def test_layout_members_are_visible_after_load_ui(tmp_path, app, editor, monkeypatch):
+    file_name = tmp_path / "form.ui"
+    file_name.write_text(UI)
+    monkeypatch.setattr(QFileDialog, "getOpenFileName", staticmethod(lambda *args, **kwargs: (str(file_name), "")))
+    editor.show()
+    editor.load_ui()
+    assert_members_visible(editor)
+
+
+def test_layout_members_are_visible_after_load_json(tmp_path, app, editor):
+    data = {"widgets": [{"id": 1, "type": "container", "layout": "vertical", "layout_id": 1, "x": 20, "y": 30},
+                        {"id": 2, "type": "label", "text": "Name", "x": 9, "y": 9},
+                        {"id": 3, "type": "checkbox", "text": "On", "x": 9, "y": 55}],
+            "groups": [], "layouts": [{"id": 1, "type": "vertical", "widgets": [2, 3]}]}
+    file_name = tmp_path / "form.json"
+    file_name.write_text(json.dumps(data))
+    editor.show()
+    editor.load_json_file(str(file_name))
+    while editor.loader is not None:
+        app.processEvents()
+    assert_members_visible(editor)
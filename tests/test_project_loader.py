@@ -0,0 +1,91 @@
+import json
+import os
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+
+from binary_format import write_binary
+from project_loader import ProjectLoader
+
+
+def load(app, editor, file_name):
+    editor.load_json_file(str(file_name))
+    while editor.loader is not None:
+        app.processEvents()
+    flush_deletes()
+
+
+def flush_deletes():
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+def project(count):
+    return {"widgets": [{"id": i, "type": "label", "text": f"Item {i}"} for i in range(1, count + 1)],
+            "groups": [], "layouts": []}
+
+
+def open_files(file_name):
+    return sum(os.path.realpath(f"/proc/self/fd/{fd}") == str(file_name) for fd in os.listdir("/proc/self/fd"))
+
+
+def open_maps(file_name):
+    with open("/proc/self/maps") as f:
+        return sum(str(file_name) in line for line in f)
+
+
+def test_loaders_release_their_files(tmp_path, app, editor):
+    binary = tmp_path / "form.guib"
+    write_binary(project(300), binary)
+    for _ in range(3):
+        load(app, editor, binary)
+    assert len(editor.widgets) == 300
+    assert editor.findChildren(ProjectLoader) == []
+    assert open_maps(binary) == 0
+
+
+def test_cancelled_json_load_closes_its_file(tmp_path, app, editor):
+    file_name = tmp_path / "form.json"
+    file_name.write_text(json.dumps(project(1000)))
+    loader = editor.load_json_file(str(file_name))
+    while loader.count == 0:
+        app.processEvents()
+    assert open_files(file_name) == 1
+    loader.cancel()
+    flush_deletes()
+    assert open_files(file_name) == 0
+    assert editor.loader is None
+    assert editor.findChildren(ProjectLoader) == []
+
+
+def test_invalid_widget_entries_fail_the_load(tmp_path, app, editor):
+    for bad in ({"id": 1, "text": "no type"}, {"id": "one", "type": "label"}, {"id": 1, "type": "dial"},
+                {"id": 1, "type": "label", "x": "10"}, ["label"]):
+        file_name = tmp_path / "form.json"
+        file_name.write_text(json.dumps({"widgets": [{"id": 5, "type": "label"}, bad], "groups": [], "layouts": []}))
+        load(app, editor, file_name)
+        assert editor.widgets == []
+        assert "Failed to load" in editor.status_bar.currentMessage()
+
+
+def test_syntax_error_is_reported_without_reading_the_rest_of_the_file(tmp_path):
+    from utils import JsonProjectStream
+    file_name = tmp_path / "form.json"
+    widgets = ",".join(json.dumps({"id": i, "type": "label", "text": "x" * 50}) for i in range(1, 20001))
+    file_name.write_text('{"widgets": [{"id": 0, "type": "label", "x": 1 2}, ' + widgets + "]}")
+    stream = JsonProjectStream(str(file_name))
+    items = iter(stream)
+    try:
+        next(items)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("the syntax error was not reported")
+    assert stream.bytes_read <= stream.chunk_size
+
+
+def test_values_split_across_chunks_still_parse(tmp_path):
+    from utils import JsonProjectStream
+    file_name = tmp_path / "form.json"
+    data = project(200)
+    file_name.write_text(json.dumps(data))
+    items = [value for kind, value in JsonProjectStream(str(file_name), chunk_size=7) if kind == "widget"]
+    assert items == data["widgets"]
@@ -0,0 +1,11 @@
+def test_select_widgets_keeps_the_existing_selection_order(app, editor):
+    widgets = [editor.add_widget_to_canvas("label", {"x": 10 + 120 * i, "y": 10, "text": str(i)}) for i in range(6)]
+    editor.select_widget(None)
+    for widget in (widgets[3], widgets[0], widgets[2]):  # Ctrl+click order
+        editor.selected_widgets.append(widget)
+    editor.select_widgets({widgets[5], widgets[1]}, "add")
+    assert editor.selected_widgets == [widgets[3], widgets[0], widgets[2], widgets[1], widgets[5]]
+    editor.select_widgets({widgets[0], widgets[4]}, "toggle")
+    assert editor.selected_widgets == [widgets[3], widgets[2], widgets[1], widgets[5], widgets[4]]
+    editor.select_widgets({widgets[2], widgets[1]})
+    assert editor.selected_widgets == [widgets[2], widgets[1]]
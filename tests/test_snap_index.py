@@ -0,0 +1,13 @@
+def test_guides_without_a_drag_session_match_the_session_index(app, editor):
+    widgets = [editor.add_widget_to_canvas("label", {"x": 10 + 37 * (i % 20), "y": 10 + 23 * (i // 20),
+                                                     "width": 30 + i % 7, "height": 20 + i % 5}) for i in range(200)]
+    for widget in widgets[::17]:
+        for dx, dy in ((0, 0), (3, -2), (-4, 4), (11, 7)):
+            box = (widget.x() + dx, widget.y() + dy, widget.width(), widget.height())
+            for resizing in (False, True):
+                one_off = editor.calculate_alignment_guides(widget, *box, is_resizing=resizing)
+                editor.begin_snap_session([widget])
+                session = editor.calculate_alignment_guides(widget, *box, is_resizing=resizing)
+                editor.end_snap_session()
+                assert sorted(one_off[0]) == sorted(session[0])
+                assert one_off[1:] == session[1:]
@@ -0,0 +1,42 @@
+import io
+
+from ui_import import parse_ui
+
+UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="geometry"><rect><x>0</x><y>0</y><width>800</width><height>600</height></rect></property>
+  <widget class="QScrollArea" name="scroll">
+   <property name="geometry"><rect><x>300</x><y>200</y><width>250</width><height>150</height></rect></property>
+   <widget class="QPushButton" name="button">
+    <property name="geometry"><rect><x>10</x><y>20</y><width>80</width><height>30</height></rect></property>
+    <property name="text"><string>OK</string></property>
+   </widget>
+  </widget>
+  <widget class="QTabWidget" name="tabs">
+   <property name="geometry"><rect><x>40</x><y>50</y><width>320</width><height>240</height></rect></property>
+   <layout class="QVBoxLayout" name="tab_layout">
+    <item><widget class="QLabel" name="a"><property name="text"><string>A</string></property></widget></item>
+   </layout>
+  </widget>
+ </widget>
+</ui>
+"""
+
+
+def by_name(project):
+    return {widget["name"]: widget for widget in project["widgets"]}
+
+
+def test_children_of_unmapped_parents_keep_their_absolute_position():
+    project = parse_ui(io.StringIO(UI))
+    button = by_name(project)["button"]
+    assert (button["x"], button["y"], button["width"], button["height"]) == (310, 220, 80, 30)
+    assert button["text"] == "OK"
+
+
+def test_layout_container_of_unmapped_parent_takes_its_geometry():
+    container = by_name(parse_ui(io.StringIO(UI)))["tab_layout"]
+    assert (container["x"], container["y"], container["width"], container["height"]) == (40, 50, 320, 240)
+    assert container["layout"] == "vertical"